@@ -1,11 +1,14 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
-from learning_dynamics.experiments.utils import eigs, run_gd, savefig
+from experiments.utils import eigs, run_gd, savefig
+from experiments.cache import ResultCache
 
 
 def main():
     outdir = "outputs/week3"
+    cache = ResultCache()
+    cached_run_gd = cache.wrap(run_gd)
 
     # Two coordinate scalings. Same "shape" of quadratic but reparameterized.
     # Idea: If you scale coordinates, GD changes behavior because gradients are not parameterization-invariant.
@@ -31,8 +34,8 @@ def main():
     # Use the same lr in both parameterizations to show behavior changes
     lr = 0.05
 
-    traj1, loss1 = run_gd(A1, theta0, lr=lr, steps=steps)
-    traj2, loss2 = run_gd(A2, theta0, lr=lr, steps=steps)
+    traj1, loss1 = cached_run_gd(A1, theta0, lr=lr, steps=steps)
+    traj2, loss2 = cached_run_gd(A2, theta0, lr=lr, steps=steps)
 
     # Trajectory compare
     plt.figure()
@@ -2,10 +2,10 @@
 # Core gradient-flow micro-experiments (no training)
 # See week1_experiments_explained.md for interpretation.
 
-from learning_dynamics.core.populationNode import PopulationNode
-from learning_dynamics.core.ops import tanh, sum_pop
-import json
-import os
+from core.populationNode import PopulationNode
+from core.ops import sum_pop
+from models.activations import tanh
+from experiments.results import load_results, save_results
 
 def experiment_1():
     xs = [-6, -3.0, -0.5, 0, 0.5, 3.0, 6]
@@ -145,12 +145,10 @@ def main():
         "experiment_7": experiment_7(),
     }
 
-    os.makedirs("results", exist_ok=True)
-
-    with open("results/week1_results.json", "w") as f:
-        json.dump(all_results, f, indent=4)
-
-    print("\nSaved results to results/week1_results.json")
+    # Gradients go to .npy files, the rest to a small JSON manifest
+    # (experiments/results.py); read back with load_results("results/week1")
+    root = save_results("results/week1", all_results, overwrite=True)
+    print(f"\nSaved results to {root}: {len(load_results(root).arrays)} arrays")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,207 @@
+import functools
+import hashlib
+import inspect
+import os
+import sys
+import tempfile
+import types
+
+import numpy as np
+
+
+# ---------- Content-addressed result cache ----------
+#
+# key = sha256(runner name, project sources, code version, argument bytes)
+#
+# Arrays are hashed by dtype, shape and raw bytes (numbers as float64), so the same A / theta0 /
+# hyperparameters map to the same entry in every script and every rerun.
+# The source of the runner's module and of every project module it reaches
+# through imports (experiments/utils.py, experiments/trajectory.py, core/*,
+# ...) is part of the key, so editing any of them invalidates old entries.
+# A project module is one whose file is under PROJECT_ROOTS; pass version=
+# for changes the sources do not show (e.g. a numpy upgrade).
+#
+# Entries are single .npz files named by their key; LRU order is the file
+# mtime (bumped on every hit), and the cache is trimmed to max_bytes after
+# every write.
+
+DEFAULT_CACHE_DIR = os.environ.get("LEARNING_DYNAMICS_CACHE", os.path.join("outputs", ".cache"))
+
+# Repo root: covers src/ and experiments/
+PROJECT_ROOTS = [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+
+
+def _in_project(path) -> bool:
+    if not path:
+        return False
+    path = os.path.abspath(path)
+    return any(path.startswith(os.path.join(os.path.abspath(root), "")) for root in PROJECT_ROOTS)
+
+
+def project_dependencies(module_name: str):
+    """
+    Source files of module_name and of every project module reachable from
+    its namespace (imported modules, and the modules that imported functions
+    and classes come from), sorted.
+    """
+    files, seen, stack = set(), set(), [module_name]
+    while stack:
+        name = stack.pop()
+        mod = sys.modules.get(name)
+        if name in seen or mod is None:
+            continue
+        seen.add(name)
+        file = getattr(mod, "__file__", None)
+        if not _in_project(file):
+            continue        # third-party / stdlib, or a namespace package: not followed
+        files.add(os.path.abspath(file))
+        for value in vars(mod).values():
+            dep = value.__name__ if isinstance(value, types.ModuleType) else getattr(value, "__module__", None)
+            # A package's submodules show up as its attributes without being its dependencies
+            if isinstance(dep, str) and dep not in seen and not dep.startswith(name + "."):
+                stack.append(dep)
+    return sorted(files)
+
+
+def _update_hash(h, value) -> None:
+    """Feed a (possibly nested) argument into the hash in a type-tagged way."""
+    if isinstance(value, np.ndarray) or (
+        isinstance(value, (list, tuple)) and value and all(isinstance(x, (int, float)) for x in value)
+    ):
+        arr = np.asarray(value)
+        if arr.dtype.kind in "biuf":
+            arr = arr.astype(float)     # [6, 6] and [6.0, 6.0] are the same input
+        arr = np.ascontiguousarray(arr)
+        h.update(b"ndarray")
+        h.update(str(arr.dtype).encode())
+        h.update(str(arr.shape).encode())
+        h.update(arr.tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(f"seq{len(value)}".encode())
+        for v in value:
+            _update_hash(h, v)
+    elif isinstance(value, dict):
+        h.update(f"dict{len(value)}".encode())
+        for k in sorted(value):
+            h.update(str(k).encode())
+            _update_hash(h, value[k])
+    elif value is None or isinstance(value, (bool, int, float, str)):
+        h.update(repr((type(value).__name__, value)).encode())
+    else:
+        raise TypeError(f"Cannot hash argument of type {type(value).__name__} for caching")
+
+
+def cache_key(fn, args, kwargs, version: str = "") -> str:
+    """Hex digest identifying one call of fn."""
+    h = hashlib.sha256()
+    h.update(f"{fn.__module__}.{fn.__qualname__}".encode())
+    sources = project_dependencies(fn.__module__)
+    try:
+        own = os.path.abspath(inspect.getsourcefile(fn))
+        if own not in sources:
+            sources.append(own)
+    except (OSError, TypeError):
+        pass
+    for path in sources:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    h.update(version.encode())
+
+    bound = inspect.signature(fn).bind(*args, **kwargs)
+    bound.apply_defaults()
+    _update_hash(h, dict(bound.arguments))
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Disk-backed, content-addressed cache for experiment runners whose outputs
+    are arrays (or tuples of arrays), e.g. run_gd / run_momentum.
+
+        cache = ResultCache()
+        cached_gd = cache.wrap(run_gd)
+        traj, losses = cached_gd(A, theta0, lr=0.02, steps=80)   # computed once
+        traj, losses = cached_gd(A, theta0, lr=0.02, steps=80)   # read from disk
+    """
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, max_bytes: int = 512 * 2**20, version: str = ""):
+        self.root = root
+        self.max_bytes = int(max_bytes)
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key + ".npz")
+
+    def get(self, key: str):
+        """Cached result for key, or None."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as f:
+                n = int(f["__n__"])
+                arrays = [f[f"arr_{i}"] for i in range(n)]
+                single = bool(f["__single__"])
+            os.utime(path)      # mark as recently used
+        except (KeyError, ValueError, OSError):
+            return None
+        return arrays[0] if single else tuple(arrays)
+
+    def put(self, key: str, result) -> None:
+        single = not isinstance(result, tuple)
+        arrays = [result] if single else list(result)
+        payload = {f"arr_{i}": np.asarray(a) for i, a in enumerate(arrays)}
+
+        # Write to a temp file and rename, so readers never see partial entries
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, __n__=len(arrays), __single__=single, **payload)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least-recently-used entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(".npz"):
+                try:
+                    st = os.stat(os.path.join(self.root, name))
+                except FileNotFoundError:
+                    continue    # evicted by another process since listdir
+                entries.append((st.st_mtime_ns, st.st_size, name))
+
+        total = sum(e[1] for e in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.root, name))
+            except FileNotFoundError:
+                pass        # already evicted by another process
+            total -= size
+
+    def clear(self) -> None:
+        for name in os.listdir(self.root):
+            if name.endswith(".npz"):
+                try:
+                    os.remove(os.path.join(self.root, name))
+                except FileNotFoundError:
+                    continue
+
+    def wrap(self, fn):
+        """Cached version of fn; arguments must be arrays, numbers, strings or nests of them."""
+
+        @functools.wraps(fn)
+        def cached(*args, **kwargs):
+            key = cache_key(fn, args, kwargs, self.version)
+            result = self.get(key)
+            if result is not None:
+                self.hits += 1
+                return result
+            self.misses += 1
+            result = fn(*args, **kwargs)
+            self.put(key, result)
+            return result
+
+        return cached
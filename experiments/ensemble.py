@@ -0,0 +1,114 @@
+from collections import namedtuple
+
+import numpy as np
+
+from core.stopping import BatchStopMonitor
+from experiments.utils import make_quadratic_A, eigs, sweep_momentum
+
+
+# ---------- Ensembles of initial conditions ----------
+#
+# K starting points theta0[k] on the same quadratic L = 1/2 theta^T A theta are
+# stepped as one (K, n) state with heavy-ball momentum (beta = 0 is plain GD,
+# the same updates as run_gd / run_momentum) by experiments.utils.sweep_momentum,
+# which takes the starts as its per-row theta0.
+#
+# Each member has its own stopping rule, a core.stopping.BatchStopMonitor
+# (StopMonitor's rules per row): at step t (before updating) a member stops
+# when its loss or gradient is non-finite, its loss grew past
+# max_growth * (its initial loss), or ||g|| <= grad_tol / loss <= loss_tol.
+# Stopped members are dropped from the working set, so the cost of a step is
+# proportional to the members still running.
+
+EnsembleResult = namedtuple("EnsembleResult", ["theta", "stop_step", "reason", "losses"])
+EnsembleResult.__doc__ = """
+theta:     (K, n) final states (where each member stopped, or after `steps`)
+stop_step: (K,) step at which each member stopped, -1 if it ran to the end
+reason:    (K,) "converged" / "diverged" / "non-finite", "" if it never stopped
+losses:    (steps, K) loss per step, NaN after a member stopped; None unless record_losses
+"""
+
+
+def run_ensemble(A: np.ndarray, theta0s, lr: float, steps: int, beta: float = 0.0,
+                 grad_tol: float = None, loss_tol: float = None, max_growth: float = 1e8,
+                 record_losses: bool = False) -> EnsembleResult:
+    """Run GD (beta=0) or momentum from every row of theta0s (K, n) at once."""
+    monitor = BatchStopMonitor(grad_tol=grad_tol, loss_tol=loss_tol, max_growth=max_growth)
+    trajs, _, losses = sweep_momentum(A, np.array(theta0s, dtype=float, ndmin=2), lr, beta, steps,
+                                      monitor=monitor, record_trajs=False, record_losses=record_losses)
+    return EnsembleResult(trajs[:, -1], monitor.step, monitor.reason, None if losses is None else losses.T)
+
+
+def sample_box(n_points: int, low, high, rng=None) -> np.ndarray:
+    """Uniform random initial conditions in the box [low, high] (per coordinate)."""
+    low, high = np.asarray(low, dtype=float), np.asarray(high, dtype=float)
+    rng = np.random.default_rng(rng)
+    return low + (high - low) * rng.random((n_points, low.size))
+
+
+def main(n_points: int = 5000, steps: int = 2000):
+    import time
+
+    import matplotlib.pyplot as plt
+    from experiments.results import ResultsWriter
+    from experiments.results_index import ResultsIndex
+    from experiments.utils import savefig
+
+    outdir = "outputs/week3"
+    A = make_quadratic_A(l1=80.0, l2=1.0, rot_rad=np.deg2rad(35))
+    w, lmin, lmax, kappa = eigs(A)
+    theta0s = sample_box(n_points, [-8.0, -8.0], [8.0, 8.0], rng=0)
+
+    runs = [
+        ("GD", dict(lr=0.02, beta=0.0)),
+        ("Momentum", dict(lr=0.02, beta=0.8)),
+    ]
+    # Per-member outcomes are kept as arrays next to the figure
+    writer = ResultsWriter(f"{outdir}/14_ensemble", attrs={"steps": steps, "kappa": kappa}, overwrite=True)
+    writer.add("theta0s", theta0s)
+    indexed = []
+
+    fig, axes = plt.subplots(1, 3, figsize=(15, 4.2))
+    for i, (name, kw) in enumerate(runs):
+        t0 = time.perf_counter()
+        res = run_ensemble(A, theta0s, steps=steps, loss_tol=1e-6, **kw)
+        secs = time.perf_counter() - t0
+
+        converged = res.reason == "converged"
+        print(f"{name:<9} {converged.sum()}/{n_points} converged, "
+              f"steps to L<1e-6: median {np.median(res.stop_step[converged]):.0f}, "
+              f"max {res.stop_step[converged].max()}  ({secs:.2f}s for the whole ensemble)")
+        writer.add(name, {**kw, "theta": res.theta, "stop_step": res.stop_step, "reason": res.reason})
+        final_loss = 0.5 * np.einsum("ki,ij,kj->k", res.theta, A, res.theta)
+        indexed += [
+            dict(experiment="ensemble", optimizer=name, kappa=kappa, lambda_max=lmax, steps=steps,
+                 converged=int(converged[k]), stop_step=int(res.stop_step[k]) if converged[k] else None,
+                 reason=str(res.reason[k]), final_loss=final_loss[k], results=writer.root, array=f"{name}/theta", row=k,
+                 theta0=theta0s[k].tolist(), **kw)
+            for k in range(n_points)
+        ]
+
+        ax = axes[i]
+        sc = ax.scatter(theta0s[:, 0], theta0s[:, 1], c=np.where(converged, res.stop_step, np.nan),
+                        s=3, cmap="viridis")
+        fig.colorbar(sc, ax=ax, label="steps to loss < 1e-6")
+        ax.set_title(f"{name}: convergence time by initial point")
+        ax.set_xlabel("theta1(0)")
+        ax.set_ylabel("theta2(0)")
+        ax.set_aspect("equal")
+
+        axes[2].hist(res.stop_step[converged], bins=50, alpha=0.6, label=name)
+
+    axes[2].set_title(f"Experiment 14: Convergence times, {n_points} starts (kappa={kappa:.0f})")
+    axes[2].set_xlabel("steps to loss < 1e-6")
+    axes[2].set_ylabel("count")
+    axes[2].legend()
+    savefig(outdir, "14_ensemble_convergence_times.png")
+    plt.close(fig)
+    writer.close()
+    with ResultsIndex() as index:
+        index.add_many(indexed, replace=True)   # one transaction for all members
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+import numpy as np
+
+from core.parameter import Parameter
+from experiments.spectral import SpectralQuadratic
+from experiments.utils import make_quadratic_A, eigs, quadratic_loss, run_gd
+
+
+# ---------- Gradient flow  d theta / dt = -grad L(theta) ----------
+#
+# GD with step lr is forward Euler on this ODE, so theta_k ~ theta(k * lr)
+# while lr is well inside the stability region. Three integrators:
+#
+#   rk45   Dormand-Prince 5(4), adaptive, with its 4th-order continuous
+#          extension for dense output. Explicit, so on stiff problems
+#          (large kappa) the step is capped near 3.3 / lam_max however
+#          smooth the solution is.
+#   ros2   2-stage Rosenbrock method (Verwer et al. 1999), L-stable, 2nd
+#          order; one linear solve with W = I - gamma*h*J per stage, so
+#          the step size follows accuracy, not lam_max. Dense output is
+#          cubic Hermite.
+#   quadratic_flow
+#          exact solution for L = 1/2 theta^T A theta: theta(t) = expm(-tA) theta0,
+#          computed in the eigenbasis of A.
+#
+# Both adaptive solvers return an ODESolution: the accepted step times plus a
+# piecewise polynomial, so sol(t) samples the trajectory at any times
+# without integrating again.
+
+
+def autodiff_grad(build_loss):
+    """grad_fn(theta ndarray) -> ndarray for a loss built from core/ops.py: build_loss(Parameter) -> scalar node."""
+    def grad_fn(theta):
+        p = Parameter(np.asarray(theta, dtype=float).tolist())
+        loss = build_loss(p)
+        loss.zero_grad_graph()
+        loss.backprop()
+        return np.array(p.grad)
+
+    return grad_fn
+
+
+def quadratic_flow(A: np.ndarray, theta0, ts) -> np.ndarray:
+    """Exact gradient flow of 1/2 theta^T A theta at each t in ts: shape (len(ts), n)."""
+    sq = SpectralQuadratic(A)
+    ts = np.asarray(ts, dtype=float)[:, None]
+    return sq.from_modes(np.exp(-ts * sq.lam) * sq.to_modes(theta0))
+
+
+class ODESolution:
+    """
+    Piecewise-polynomial trajectory from an adaptive solver.
+
+      t, y:   accepted step times (m+1,) and states (m+1, n)
+      sol(ts) evaluates the dense output at any times in [t[0], t[-1]]
+
+    m is 0 for an empty span (t0 == t1): sol(t0) is then y[0].
+    """
+
+    def __init__(self, t, y, coeffs, n_fev: int, n_rejected: int):
+        self.t = np.asarray(t)
+        self.y = np.asarray(y)
+        # coeffs[i, k] multiplies x^k on step i, with x = (t - t[i]) / (t[i+1] - t[i])
+        self._coeffs = np.asarray(coeffs)
+        self.n_fev = n_fev
+        self.n_rejected = n_rejected
+
+    @property
+    def n_steps(self) -> int:
+        return len(self.t) - 1
+
+    def __call__(self, ts) -> np.ndarray:
+        ts = np.asarray(ts, dtype=float)
+        scalar = ts.ndim == 0
+        ts = np.atleast_1d(ts)
+        if np.any(ts < self.t[0]) or np.any(ts > self.t[-1]):
+            raise ValueError("dense output requested outside the integrated interval")
+        if self.n_steps == 0:
+            out = np.repeat(self.y[:1], len(ts), axis=0)
+            return out[0] if scalar else out
+
+        i = np.clip(np.searchsorted(self.t, ts, side="right") - 1, 0, self.n_steps - 1)
+        x = (ts - self.t[i]) / (self.t[i + 1] - self.t[i])
+        powers = x[:, None] ** np.arange(self._coeffs.shape[1])
+        out = np.einsum("bk,bkn->bn", powers, self._coeffs[i])
+        return out[0] if scalar else out
+
+
+def _error_norm(err, y, y_new, rtol, atol) -> float:
+    scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+    return float(np.sqrt(np.mean((err / scale) ** 2)))
+
+
+def _span(t_span):
+    t0, t1 = map(float, t_span)
+    if t1 < t0:
+        raise ValueError(f"t_span must have t1 >= t0, got {t_span}")
+    return t0, t1
+
+
+def _initial_step(f, y, f0, order: int, rtol, atol) -> float:
+    """Starting step from the size of y and f (Hairer, Norsett & Wanner II.4)."""
+    scale = atol + rtol * np.abs(y)
+    d0 = np.sqrt(np.mean((y / scale) ** 2))
+    d1 = np.sqrt(np.mean((f0 / scale) ** 2))
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    f1 = f(y + h0 * f0)
+    d2 = np.sqrt(np.mean(((f1 - f0) / scale) ** 2)) / h0
+    h1 = max(1e-6, h0 * 1e-3) if max(d1, d2) <= 1e-15 else (0.01 / max(d1, d2)) ** (1.0 / (order + 1))
+    return min(100 * h0, h1)
+
+
+# ----- Dormand-Prince 5(4) -----
+
+_DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+]
+_DP_B = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+# 5th minus 4th order weights, over all 7 stages (the 7th is f(y_new), reused as the next k1)
+_DP_E = np.array([-71 / 57600, 0.0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40])
+# Continuous extension: y(t0 + x h) = y0 + h * K^T P [x, x^2, x^3, x^4]
+_DP_P = np.array([
+    [1.0, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+    [0.0, 0.0, 0.0, 0.0],
+    [0.0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+    [0.0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+    [0.0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+    [0.0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+    [0.0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+])
+
+
+def rk45(f, y0, t_span, rtol: float = 1e-6, atol: float = 1e-9, max_steps: int = 100_000) -> ODESolution:
+    """
+    Integrate the autonomous ODE y' = f(y) over t_span = (t0, t1) with
+    Dormand-Prince 5(4). max_steps bounds the attempted steps, accepted or rejected.
+    """
+    t, t_end = _span(t_span)
+    y = np.asarray(y0, dtype=float)
+    K = np.empty((7, y.size))
+    K[0] = f(y)
+    n_fev, n_rejected = 1, 0
+    h = _initial_step(f, y, K[0], 5, rtol, atol)
+    n_fev += 1
+
+    ts, ys, coeffs = [t], [y], []
+    while t < t_end:
+        if len(coeffs) + n_rejected >= max_steps:
+            raise RuntimeError(f"rk45: exceeded max_steps={max_steps} (accepted + rejected) at t={t:.6g}")
+        h = min(h, t_end - t)
+
+        for s in range(1, 6):
+            K[s] = f(y + h * (np.dot(_DP_A[s], K[:s])))
+        y_new = y + h * (_DP_B @ K[:6])
+        K[6] = f(y_new)
+        n_fev += 6
+
+        err = _error_norm(h * (_DP_E @ K), y, y_new, rtol, atol)
+        if err <= 1.0:
+            Q = h * (K.T @ _DP_P)                   # (n, 4)
+            coeffs.append(np.vstack([y, Q.T]))      # x^0 .. x^4
+            t = t + h if t_end - t > h else t_end
+            y = y_new
+            K[0] = K[6]                             # first same as last
+            ts.append(t)
+            ys.append(y)
+        else:
+            n_rejected += 1
+        h *= min(10.0, max(0.2, 0.9 * (err if err > 0 else 1e-10) ** -0.2))
+
+    return ODESolution(ts, ys, coeffs, n_fev, n_rejected)
+
+
+# ----- Rosenbrock ROS2 (stiff) -----
+
+_ROS2_GAMMA = 1.0 + 1.0 / np.sqrt(2.0)
+
+
+def _fd_jacobian(f, y, fy, eps=None) -> np.ndarray:
+    """Forward-difference Jacobian of f at y, one column per coordinate."""
+    eps = np.sqrt(np.finfo(float).eps) * np.maximum(1.0, np.abs(y)) if eps is None else eps * np.ones_like(y)
+    J = np.empty((y.size, y.size))
+    for j in range(y.size):
+        e = np.zeros_like(y)
+        e[j] = eps[j]
+        J[:, j] = (f(y + e) - fy) / eps[j]
+    return J
+
+
+def ros2(f, y0, t_span, jac=None, rtol: float = 1e-6, atol: float = 1e-9, max_steps: int = 100_000) -> ODESolution:
+    """
+    Integrate y' = f(y) with the L-stable Rosenbrock method ROS2.
+
+    jac: Jacobian of f, as a constant (n, n) array (e.g. -A for a quadratic),
+    a callable jac(y), or None for forward differences of f every step. The
+    embedded Euler solution y + h k1 gives the error estimate. max_steps
+    bounds the attempted steps, accepted or rejected.
+    """
+    t, t_end = _span(t_span)
+    y = np.asarray(y0, dtype=float)
+    I = np.eye(y.size)
+    fy = f(y)
+    n_fev, n_rejected = 1, 0
+    h = _initial_step(f, y, fy, 2, rtol, atol)
+    n_fev += 1
+
+    ts, ys, coeffs = [t], [y], []
+    J = None
+    while t < t_end:
+        if len(coeffs) + n_rejected >= max_steps:
+            raise RuntimeError(f"ros2: exceeded max_steps={max_steps} (accepted + rejected) at t={t:.6g}")
+        h = min(h, t_end - t)
+
+        if J is None:
+            # Once per accepted step (a rejected step retries with the same J)
+            if callable(jac):
+                J = np.asarray(jac(y), dtype=float)
+            elif jac is None:
+                J = _fd_jacobian(f, y, fy)
+                n_fev += y.size
+            else:
+                J = np.asarray(jac, dtype=float)
+
+        W = I - _ROS2_GAMMA * h * J
+        k1 = np.linalg.solve(W, fy)
+        k2 = np.linalg.solve(W, f(y + h * k1) - 2.0 * k1)
+        y_new = y + h * (1.5 * k1 + 0.5 * k2)
+        n_fev += 1
+
+        err = _error_norm(0.5 * h * (k1 + k2), y, y_new, rtol, atol)
+        if err <= 1.0:
+            f_new = f(y_new)
+            n_fev += 1
+            dy = y_new - y
+            # Cubic Hermite through (y, f) at both ends
+            coeffs.append(np.vstack([
+                y,
+                h * fy,
+                3.0 * dy - h * (2.0 * fy + f_new),
+                -2.0 * dy + h * (fy + f_new),
+                np.zeros_like(y),
+            ]))
+            t = t + h if t_end - t > h else t_end
+            y, fy = y_new, f_new
+            ts.append(t)
+            ys.append(y)
+            if jac is None or callable(jac):
+                J = None
+        else:
+            n_rejected += 1
+        h *= min(5.0, max(0.2, 0.9 * (err if err > 0 else 1e-10) ** -0.5))
+
+    return ODESolution(ts, ys, coeffs, n_fev, n_rejected)
+
+
+def gradient_flow(grad_fn, theta0, t_span, method: str = "rk45", **kwargs) -> ODESolution:
+    """
+    Solve d theta / dt = -grad_fn(theta). grad_fn can come from autodiff_grad()
+    for any core/ops loss. For ros2, pass jac = -Hessian if it is known.
+    """
+    def f(theta):
+        return -np.asarray(grad_fn(theta), dtype=float)
+
+    if method == "rk45":
+        return rk45(f, theta0, t_span, **kwargs)
+    if method == "ros2":
+        return ros2(f, theta0, t_span, **kwargs)
+    raise ValueError(f"unknown method {method!r} (expected 'rk45' or 'ros2')")
+
+
+def main():
+    import matplotlib.pyplot as plt
+    from experiments.utils import savefig
+
+    outdir = "outputs/week3"
+    theta0 = [7.0, 2.0]
+
+    # GD iterates vs the continuous flow they discretize
+    A = make_quadratic_A(l1=10.0, l2=1.0, rot_rad=np.deg2rad(35))
+    grad_fn = autodiff_grad(lambda theta: quadratic_loss(A, theta))
+    lr, steps = 0.05, 60
+    traj, _ = run_gd(A, theta0, lr=lr, steps=steps)
+    sol = gradient_flow(grad_fn, theta0, (0.0, lr * steps), method="rk45")
+    ts = np.linspace(0.0, lr * steps, 400)
+    flow = sol(ts)
+    exact = quadratic_flow(A, theta0, ts)
+    print(f"rk45: {sol.n_steps} steps, {sol.n_fev} grad evals, "
+          f"max |dense - exact| = {np.abs(flow - exact).max():.2e}")
+
+    fig, ax = plt.subplots()
+    ax.plot(flow[:, 0], flow[:, 1], "k-", lw=1.5, label="gradient flow (rk45, dense)")
+    ax.plot(traj[:, 0], traj[:, 1], "o", markersize=3, label=f"GD lr={lr}")
+    ax.set_title("Experiment 9: GD vs continuous gradient flow")
+    ax.set_xlabel("theta1")
+    ax.set_ylabel("theta2")
+    ax.set_aspect("equal")
+    ax.legend()
+    savefig(outdir, "09_gradient_flow_vs_gd.png")
+    plt.close(fig)
+
+    # Stiff problem: explicit steps are limited by lam_max, Rosenbrock steps are not
+    A = make_quadratic_A(l1=1e4, l2=1.0, rot_rad=np.deg2rad(35))
+    w, lmin, lmax, kappa = eigs(A)
+    grad_fn = autodiff_grad(lambda theta: quadratic_loss(A, theta))
+    t_end = 10.0
+    sol_rk = gradient_flow(grad_fn, theta0, (0.0, t_end), method="rk45", rtol=1e-5, atol=1e-8)
+    sol_ros = gradient_flow(grad_fn, theta0, (0.0, t_end), method="ros2", jac=-A, rtol=1e-5, atol=1e-8)
+    print(f"kappa={kappa:.0e}: rk45 {sol_rk.n_steps} steps / {sol_rk.n_fev} evals, "
+          f"ros2 {sol_ros.n_steps} steps / {sol_ros.n_fev} evals")
+
+    fig, ax = plt.subplots()
+    for sol, name in [(sol_rk, "rk45"), (sol_ros, "ros2")]:
+        ax.plot(sol.t[1:], np.diff(sol.t), ".", markersize=3, label=f"{name} ({sol.n_steps} steps)")
+    ax.axhline(3.3 / lmax, color="gray", ls="--", lw=1, label="~explicit stability limit")
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_title(f"Experiment 9: Step sizes on a stiff flow (kappa={kappa:.0e})")
+    ax.set_xlabel("t")
+    ax.set_ylabel("accepted step size h")
+    ax.legend()
+    savefig(outdir, "09_gradient_flow_stiff_steps.png")
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    main()
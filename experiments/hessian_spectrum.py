@@ -1,7 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
-from learning_dynamics.experiments.utils import make_quadratic_A, eigs, run_gd, savefig
+from core.stopping import BatchStopMonitor
+from experiments.utils import make_quadratic_A, eigs, sweep_gd, savefig
 
 
 def main():
@@ -20,10 +21,17 @@ def main():
     # Below / near / above stability boundary
     lrs = [0.5 * eta_crit, 0.99 * eta_crit, 1.10 * eta_crit]
 
+    # One batched run for all lrs; reused by both plots below. Runs that blow
+    # up are stopped (and frozen) like run_gd under a StopMonitor
+    monitor = BatchStopMonitor()
+    trajs, losses = sweep_gd(A, theta0, lrs, steps=steps, monitor=monitor)
+    for lr, step, reason in zip(lrs, monitor.step, monitor.reason):
+        if reason:
+            print(f"lr={lr:.4f}: stopped at step {step} ({reason})")
+
     # Plot trajectories
     plt.figure()
-    for lr in lrs:
-        traj, losses = run_gd(A, theta0, lr=lr, steps=steps)
+    for lr, traj in zip(lrs, trajs):
         plt.plot(traj[:, 0], traj[:, 1], marker="o", markersize=2, label=f"lr={lr:.4f}")
 
     plt.title("Experiment 2: Stability boundary from Hessian spectrum")
@@ -36,9 +44,8 @@ def main():
 
     # Plot loss curves (divergence will blow up)
     plt.figure()
-    for lr in lrs:
-        traj, losses = run_gd(A, theta0, lr=lr, steps=steps)
-        plt.plot(losses, label=f"lr={lr:.4f}")
+    for lr, loss in zip(lrs, losses):
+        plt.plot(loss, label=f"lr={lr:.4f}")
     plt.yscale("log")
     plt.title("Experiment 2: Loss vs step near stability boundary")
     plt.xlabel("step")
@@ -1,7 +1,10 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
-from learning_dynamics.experiments.utils import make_quadratic_A, eigs, run_gd, savefig
+from core.stopping import BatchStopMonitor
+from experiments.results import save_results
+from experiments.results_index import ResultsIndex, runs_from_sweep
+from experiments.utils import make_quadratic_A, eigs, sweep_gd, savefig
 
 
 def main():
@@ -20,9 +23,19 @@ def main():
     # Show stable vs near-unstable learning rates
     lrs = [0.01, 0.03, (2.0 / lmax) * 0.99]  # last one is very close to boundary
 
+    # One batched run for all lrs; reused by both plots below
+    monitor = BatchStopMonitor()
+    trajs, losses = sweep_gd(A, theta0, lrs, steps=steps, monitor=monitor)
+
+    # Keep the arrays and index one run per lr
+    root = save_results(f"{outdir}/01_ill_conditioned", {"lrs": lrs, "trajs": trajs, "losses": losses},
+                        overwrite=True)
+    with ResultsIndex() as index:
+        index.add_many(runs_from_sweep("ill_conditioned_quadratic", losses, lrs, monitor=monitor, optimizer="gd",
+                                       kappa=kappa, lambda_max=lmax, results=root, array="trajs"), replace=True)
+
     plt.figure()
-    for lr in lrs:
-        traj, losses = run_gd(A, theta0, lr=lr, steps=steps)
+    for lr, traj in zip(lrs, trajs):
         plt.plot(traj[:, 0], traj[:, 1], marker="o", markersize=2, label=f"lr={lr:.4f}")
 
     plt.title("Experiment 1: Ill-conditioned quadratic (trajectory)")
@@ -35,9 +48,8 @@ def main():
 
     # Loss curves
     plt.figure()
-    for lr in lrs:
-        traj, losses = run_gd(A, theta0, lr=lr, steps=steps)
-        plt.plot(losses, label=f"lr={lr:.4f}")
+    for lr, loss in zip(lrs, losses):
+        plt.plot(loss, label=f"lr={lr:.4f}")
     plt.yscale("log")
     plt.title("Experiment 1: Loss decay under ill-conditioning")
     plt.xlabel("step")
@@ -0,0 +1,92 @@
+"""
+Import-time benchmark for the numerical modules.
+
+    PYTHONPATH=src python -m experiments.import_time            # table + heaviest imports
+    PYTHONPATH=src python -m experiments.import_time core.optim
+
+Each module is imported in a fresh interpreter under `python -X importtime`,
+so nothing is cached between measurements. test/test_stage_3_import_time.py enforces
+BUDGET_US and checks that no module in LIGHT_MODULES pulls in a plotting
+backend (those are imported on first use, inside the functions that draw).
+"""
+
+import os
+import subprocess
+import sys
+
+
+EXPERIMENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(EXPERIMENTS_DIR)
+
+# Modules that must import without plotting libraries
+LIGHT_MODULES = [
+    "core.ops",
+    "core.optim",
+    "core.stopping",
+    "experiments.utils",
+    "experiments.spectral",
+    "experiments.stability",
+    "experiments.trajectory",
+    "experiments.trajectory_store",
+    "experiments.streaming",
+    "experiments.ensemble",
+    "experiments.cache",
+    "experiments.results",
+    "experiments.results_index",
+    "experiments.loss_surface",
+    "experiments.gradient_flow_ode",
+    "experiments.adjoint",
+    "utils.decimation",
+    "utils.plotting",
+    "utils.vector_transformation",
+]
+
+HEAVY_PACKAGES = ("matplotlib", "pyvista")
+
+# Cumulative import time allowed per module (microseconds). numpy alone is
+# ~0.15s on a laptop; the budget leaves room for slower machines but not
+# for pyplot (~0.7s).
+BUDGET_US = 500_000
+
+
+def import_times(module: str):
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+
+    Returns a list of (name, self_us, cumulative_us), one per imported module,
+    in the order Python reports them (the requested module is last).
+    """
+    env = dict(os.environ)
+    paths = [os.path.join(REPO_ROOT, "src"), REPO_ROOT]
+    env["PYTHONPATH"] = os.pathsep.join(paths + [env["PYTHONPATH"]] if env.get("PYTHONPATH") else paths)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cum_us)))
+    return rows
+
+
+def main(argv=None):
+    modules = (argv if argv is not None else sys.argv[1:]) or LIGHT_MODULES
+    over = 0
+    for module in modules:
+        rows = import_times(module)
+        total = rows[-1][2]
+        heavy = sorted(rows[:-1], key=lambda r: -r[2])[:3]
+        flag = "OVER" if total > BUDGET_US else "ok  "
+        over += total > BUDGET_US
+        print(f"[{flag}] {module:<32} {total / 1000:8.1f} ms   heaviest: "
+              + ", ".join(f"{name} {cum / 1000:.0f}ms" for name, _, cum in heavy))
+    print(f"\nbudget {BUDGET_US / 1000:.0f} ms per module, {over} over")
+    return 0 if over == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
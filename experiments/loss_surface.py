@@ -0,0 +1,172 @@
+import numpy as np
+
+from core.parameter import Parameter
+from experiments.utils import make_quadratic_A, eigs, run_gd
+
+
+# ---------- Loss surfaces on 2-D slices (no autodiff graph) ----------
+#
+# A slice through parameter space is the plane
+#
+#   theta(a, b) = center + a * d1 + b * d2
+#
+# and its surface is L on a grid of (a, b). For n = 2 with d1, d2 the unit
+# axes this is the ordinary contour grid; for large n it is a random (or
+# chosen) 2-D cross-section.
+#
+# Losses are evaluated by a batched function loss_fn(Theta (B, n)) -> (B,)
+# on `chunk` grid points at a time, so memory is O(chunk * n) whatever the
+# grid size. With grad_fn(Theta) -> (B, n), the gradient is returned
+# projected onto the plane (G1 = grad . d1, G2 = grad . d2), which is what
+# quiver/streamline plots of the slice need.
+
+
+def quadratic_fns(A: np.ndarray):
+    """Batched (loss_fn, grad_fn) for L = 1/2 theta^T A theta."""
+    A = np.asarray(A, dtype=float)
+
+    def loss_fn(Theta):
+        return 0.5 * np.einsum("bi,bi->b", Theta, Theta @ A.T)
+
+    def grad_fn(Theta):
+        return Theta @ A.T
+
+    return loss_fn, grad_fn
+
+
+def graph_fns(build_loss):
+    """
+    (loss_fn, grad_fn) for any loss built from core/ops.py, evaluated one
+    point at a time through the autodiff graph: build_loss(theta: Parameter)
+    -> scalar node. Much slower than a batched function; use it for losses
+    that have no vectorized form, or to cross-check one.
+
+    One backward pass gives both the loss and the gradient of a point, so the
+    last batch's results are kept: surface() asking for loss_fn(Theta) then
+    grad_fn(Theta) builds each graph once.
+    """
+    last = {}
+
+    def eval_points(Theta):
+        Theta = np.asarray(Theta, dtype=float)
+        if "Theta" in last and last["Theta"].shape == Theta.shape and np.array_equal(last["Theta"], Theta):
+            return last["losses"], last["grads"]
+        losses = np.empty(len(Theta))
+        grads = np.empty(Theta.shape)
+        for i, row in enumerate(Theta):
+            theta = Parameter(row.tolist())
+            loss = build_loss(theta)
+            loss.zero_grad_graph()
+            loss.backprop()
+            losses[i], grads[i] = loss.data[0], theta.grad
+        last.update(Theta=Theta.copy(), losses=losses, grads=grads)
+        return losses, grads
+
+    def loss_fn(Theta):
+        return eval_points(Theta)[0].copy()
+
+    def grad_fn(Theta):
+        return eval_points(Theta)[1].copy()
+
+    return loss_fn, grad_fn
+
+
+def random_directions(n: int, rng=None, scale: float = 1.0):
+    """Two orthogonal random directions of norm `scale` in R^n."""
+    rng = np.random.default_rng(rng)
+    q, _ = np.linalg.qr(rng.standard_normal((n, 2)))
+    return scale * q[:, 0], scale * q[:, 1]
+
+
+def surface(loss_fn, center, d1, d2, alphas, betas, grad_fn=None, chunk: int = 2**14):
+    """
+    Evaluate L(center + a*d1 + b*d2) on the (len(betas), len(alphas)) grid.
+
+    Returns Z, or (Z, G1, G2) when grad_fn is given (projected gradients).
+    Rows index betas and columns alphas, as np.meshgrid(alphas, betas).
+    """
+    center = np.asarray(center, dtype=float)
+    d1, d2 = np.asarray(d1, dtype=float), np.asarray(d2, dtype=float)
+    alphas, betas = np.asarray(alphas, dtype=float), np.asarray(betas, dtype=float)
+
+    shape = (len(betas), len(alphas))
+    a = np.tile(alphas, len(betas))
+    b = np.repeat(betas, len(alphas))
+
+    Z = np.empty(a.size)
+    G1 = np.empty(a.size) if grad_fn is not None else None
+    G2 = np.empty(a.size) if grad_fn is not None else None
+
+    for lo in range(0, a.size, chunk):
+        hi = min(lo + chunk, a.size)
+        Theta = center + a[lo:hi, None] * d1 + b[lo:hi, None] * d2
+        Z[lo:hi] = loss_fn(Theta)
+        if grad_fn is not None:
+            g = grad_fn(Theta)
+            G1[lo:hi] = g @ d1
+            G2[lo:hi] = g @ d2
+
+    if grad_fn is None:
+        return Z.reshape(shape)
+    return Z.reshape(shape), G1.reshape(shape), G2.reshape(shape)
+
+
+def surface_2d(loss_fn, xs, ys, grad_fn=None, chunk: int = 2**14):
+    """Surface of a 2-parameter loss on the plain (theta1, theta2) grid."""
+    return surface(loss_fn, np.zeros(2), [1.0, 0.0], [0.0, 1.0], xs, ys, grad_fn=grad_fn, chunk=chunk)
+
+
+def main():
+    import matplotlib.pyplot as plt
+    from experiments.utils import savefig
+
+    outdir = "outputs/week3"
+
+    # 2-D quadratic: contours with the GD path on top
+    A = make_quadratic_A(l1=20.0, l2=1.0, rot_rad=np.deg2rad(30))
+    w, lmin, lmax, kappa = eigs(A)
+    theta0 = [6.0, 4.0]
+    traj, _ = run_gd(A, theta0, lr=0.08, steps=60)
+
+    xs = np.linspace(-8.0, 8.0, 400)
+    ys = np.linspace(-8.0, 8.0, 400)
+    loss_fn, grad_fn = quadratic_fns(A)
+    Z = surface_2d(loss_fn, xs, ys)
+
+    fig, ax = plt.subplots()
+    ax.contour(xs, ys, Z, levels=np.geomspace(Z.min() + 1e-3, Z.max(), 25), cmap="viridis")
+    ax.plot(traj[:, 0], traj[:, 1], "r.-", markersize=3, label=f"GD lr=0.08 (kappa={kappa:.0f})")
+    ax.set_title("Experiment 8: Loss surface with GD trajectory")
+    ax.set_xlabel("theta1")
+    ax.set_ylabel("theta2")
+    ax.set_aspect("equal")
+    ax.legend()
+    savefig(outdir, "08_loss_surface_contour.png")
+    plt.close(fig)
+
+    # Random 2-D slice through a 200-dim quadratic, centered at a non-optimal point
+    n = 200
+    rng = np.random.default_rng(0)
+    Q, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    A_big = Q @ np.diag(np.geomspace(1.0, 100.0, n)) @ Q.T
+    loss_fn, grad_fn = quadratic_fns(A_big)
+    center = rng.standard_normal(n)
+    d1, d2 = random_directions(n, rng)
+
+    ab = np.linspace(-3.0, 3.0, 300)
+    Z, G1, G2 = surface(loss_fn, center, d1, d2, ab, ab, grad_fn=grad_fn)
+
+    fig, ax = plt.subplots()
+    ax.contourf(ab, ab, Z, levels=30, cmap="viridis")
+    s = slice(None, None, 20)
+    ax.quiver(ab[s], ab[s], -G1[s, s], -G2[s, s], color="w")
+    ax.set_title(f"Experiment 8: Random 2-D slice of a {n}-dim quadratic")
+    ax.set_xlabel("alpha (d1)")
+    ax.set_ylabel("beta (d2)")
+    ax.set_aspect("equal")
+    savefig(outdir, "08_loss_surface_random_slice.png")
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    main()
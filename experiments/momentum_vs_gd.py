@@ -1,11 +1,46 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
-from learning_dynamics.experiments.utils import make_quadratic_A, eigs, run_gd, run_momentum, savefig
+from experiments.utils import make_quadratic_A, eigs, run_gd, run_momentum
+from experiments.cache import ResultCache
+from utils.plotting import FigureJob, plot_curve, plot_trajectory, render_many
+
+
+def draw_trajectories(fig, gd_traj, mom_traj, beta):
+    ax = fig.subplots()
+    plot_trajectory(ax, gd_traj, marker="o", markersize=2, label="GD")
+    plot_trajectory(ax, mom_traj, marker="o", markersize=2, label=f"Momentum beta={beta}")
+    ax.set_title("Experiment 4: Momentum vs GD (trajectory)")
+    ax.set_xlabel("theta1")
+    ax.set_ylabel("theta2")
+    ax.legend()
+    ax.axis("equal")
+
+
+def draw_losses(fig, gd_losses, mom_losses, beta):
+    ax = fig.subplots()
+    plot_curve(ax, gd_losses, label="GD")
+    plot_curve(ax, mom_losses, label=f"Momentum beta={beta}")
+    ax.set_yscale("log")
+    ax.set_title("Experiment 4: Momentum vs GD (loss)")
+    ax.set_xlabel("step")
+    ax.set_ylabel("loss (log scale)")
+    ax.legend()
+
+
+def draw_phase_space(fig, mom_traj, mom_v):
+    # Phase-space (theta, v) for momentum in 1D slice (just plot theta1 vs v1)
+    ax = fig.subplots()
+    plot_trajectory(ax, np.column_stack([mom_traj[:, 0], mom_v[:, 0]]), marker="o", markersize=2)
+    ax.set_title("Experiment 4: Momentum phase space (theta1 vs v1)")
+    ax.set_xlabel("theta1")
+    ax.set_ylabel("v1")
 
 
 def main():
     outdir = "outputs/week3"
+    cache = ResultCache()
+    cached_run_gd = cache.wrap(run_gd)
+    cached_run_momentum = cache.wrap(run_momentum)
 
     A = make_quadratic_A(l1=60.0, l2=1.0, rot_rad=np.deg2rad(30))
     w, lmin, lmax, kappa = eigs(A)
@@ -17,41 +52,14 @@ def main():
     lr = 0.02
     beta = 0.9
 
-    gd_traj, gd_losses = run_gd(A, theta0, lr=lr, steps=steps)
-    mom_traj, mom_v, mom_losses = run_momentum(A, theta0, lr=lr, beta=beta, steps=steps)
-
-    # Trajectories
-    plt.figure()
-    plt.plot(gd_traj[:, 0], gd_traj[:, 1], marker="o", markersize=2, label="GD")
-    plt.plot(mom_traj[:, 0], mom_traj[:, 1], marker="o", markersize=2, label=f"Momentum beta={beta}")
-    plt.title("Experiment 4: Momentum vs GD (trajectory)")
-    plt.xlabel("theta1")
-    plt.ylabel("theta2")
-    plt.legend()
-    plt.axis("equal")
-    savefig(outdir, "04_momentum_vs_gd_trajectory.png")
-    plt.close()
-
-    # Loss curves
-    plt.figure()
-    plt.plot(gd_losses, label="GD")
-    plt.plot(mom_losses, label=f"Momentum beta={beta}")
-    plt.yscale("log")
-    plt.title("Experiment 4: Momentum vs GD (loss)")
-    plt.xlabel("step")
-    plt.ylabel("loss (log scale)")
-    plt.legend()
-    savefig(outdir, "04_momentum_vs_gd_loss.png")
-    plt.close()
+    gd_traj, gd_losses = cached_run_gd(A, theta0, lr=lr, steps=steps)
+    mom_traj, mom_v, mom_losses = cached_run_momentum(A, theta0, lr=lr, beta=beta, steps=steps)
 
-    # Phase-space (theta, v) for momentum in 1D slice (just plot theta1 vs v1)
-    plt.figure()
-    plt.plot(mom_traj[:, 0], mom_v[:, 0], marker="o", markersize=2)
-    plt.title("Experiment 4: Momentum phase space (theta1 vs v1)")
-    plt.xlabel("theta1")
-    plt.ylabel("v1")
-    savefig(outdir, "04_momentum_phase_space_theta1_v1.png")
-    plt.close()
+    render_many([
+        FigureJob(draw_trajectories, outdir, "04_momentum_vs_gd_trajectory.png", (gd_traj, mom_traj, beta)),
+        FigureJob(draw_losses, outdir, "04_momentum_vs_gd_loss.png", (gd_losses, mom_losses, beta)),
+        FigureJob(draw_phase_space, outdir, "04_momentum_phase_space_theta1_v1.png", (mom_traj, mom_v)),
+    ])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+
+from core.optim import GD, Momentum, Nesterov, RMSProp, Adam, AdaGrad, LBFGS, NewtonCG, LineSearch
+from core.parameter import Parameter
+from experiments.utils import make_quadratic_A, eigs, quadratic_loss, run_optimizer, savefig
+
+
+OPTIMIZERS = {
+    "GD": lambda ps: GD(ps, lr=0.02),
+    "Momentum": lambda ps: Momentum(ps, lr=0.02, beta=0.9),
+    "Nesterov": lambda ps: Nesterov(ps, lr=0.01, beta=0.9),
+    "RMSProp": lambda ps: RMSProp(ps, lr=0.01),
+    "Adam": lambda ps: Adam(ps, lr=0.5),
+    "AdaGrad": lambda ps: AdaGrad(ps, lr=2.0),
+    "L-BFGS": lambda ps: LBFGS(ps, history_size=5),
+    "Newton-CG": lambda ps: NewtonCG(ps),
+    # Deliberately too-large base lr: the line search has to find a stable one
+    "GD+Armijo": lambda ps: LineSearch(GD(ps, lr=1.0), method="armijo"),
+    "GD+Wolfe": lambda ps: LineSearch(GD(ps, lr=1.0), method="wolfe"),
+    "Mom+Armijo": lambda ps: LineSearch(Momentum(ps, lr=1.0, beta=0.9), method="armijo"),
+}
+
+
+def time_to_tolerance(A: np.ndarray, theta0, make_opt, tol: float, max_steps: int):
+    """
+    Step until L(theta) < tol. Returns (steps, wall-clock seconds), or
+    (None, seconds) if the tolerance was not reached within max_steps.
+    """
+    theta = Parameter(theta0)
+    opt = make_opt([theta])
+
+    def closure():
+        loss = quadratic_loss(A, theta)
+        loss.zero_grad_graph()
+        loss.backprop()
+        return loss
+
+    t0 = time.perf_counter()
+    for step in range(max_steps):
+        if getattr(opt, "needs_closure", False):
+            # step() returns the loss *before* its update, like the branch below
+            if opt.step(closure) < tol:
+                return step, time.perf_counter() - t0
+            continue
+        if closure().data[0] < tol:
+            return step, time.perf_counter() - t0
+        opt.step()
+    return None, time.perf_counter() - t0
+
+
+def main():
+    outdir = "outputs/week3"
+
+    # Same problems as momentum_vs_gd.py (kappa=60) and zigzag_dynamics.py (kappa=80)
+    problems = {
+        "kappa60": (make_quadratic_A(l1=60.0, l2=1.0, rot_rad=np.deg2rad(30)), [6.0, 6.0]),
+        "kappa80": (make_quadratic_A(l1=80.0, l2=1.0, rot_rad=np.deg2rad(35)), [7.0, 2.0]),
+    }
+    tol = 1e-6
+    max_steps = 5000
+
+    for name, (A, theta0) in problems.items():
+        w, lmin, lmax, kappa = eigs(A)
+        print(f"\n[{name}] eigenvalues={w} kappa={kappa:.1f} tol={tol:g}")
+        print(f"{'optimizer':>10} | {'steps':>6} | {'time':>9}")
+        for opt_name, make_opt in OPTIMIZERS.items():
+            steps, secs = time_to_tolerance(A, theta0, make_opt, tol, max_steps)
+            shown = "-" if steps is None else str(steps)
+            print(f"{opt_name:>10} | {shown:>6} | {secs*1e3:>7.2f}ms")
+
+        plt.figure()
+        for opt_name, make_opt in OPTIMIZERS.items():
+            _, losses = run_optimizer(A, theta0, make_opt, steps=300)
+            plt.plot(losses, label=opt_name)
+        plt.yscale("log")
+        plt.title(f"Optimizer comparison ({name})")
+        plt.xlabel("step")
+        plt.ylabel("loss (log scale)")
+        plt.legend()
+        savefig(outdir, f"06_optimizer_comparison_{name}_loss.png")
+        plt.close()
+
+
+if __name__ == "__main__":
+    main()
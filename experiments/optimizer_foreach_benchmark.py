@@ -0,0 +1,53 @@
+import time
+import numpy as np
+
+from core.parameter import Parameter
+from core.optim import GD, Momentum
+
+
+def make_params(n_total: int, n_tensors: int, seed: int = 0):
+    """Split n_total scalars across n_tensors Parameters with random grads."""
+    rng = np.random.default_rng(seed)
+    sizes = np.full(n_tensors, n_total // n_tensors)
+    sizes[: n_total % n_tensors] += 1
+
+    params = []
+    for n in sizes:
+        p = Parameter(rng.normal(size=int(n)).tolist())
+        p.grad = rng.normal(size=int(n)).tolist()
+        params.append(p)
+    return params
+
+
+def time_steps(opt, repeats: int) -> float:
+    """Mean wall-clock seconds per opt.step()."""
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        opt.step()
+    return (time.perf_counter() - t0) / repeats
+
+
+def main():
+    sizes = [10**2, 10**3, 10**4, 10**5, 10**6]
+    n_tensors = 10
+    lr, beta = 1e-3, 0.9
+
+    print(f"{'n_params':>10} | {'GD loop':>10} {'GD foreach':>11} {'x':>6} | "
+          f"{'Mom loop':>10} {'Mom foreach':>11} {'x':>6}")
+    for n in sizes:
+        repeats = max(1, 10**6 // (10 * n))
+        row = [n]
+        for make_opt in (
+            lambda ps, fe: GD(ps, lr=lr, foreach=fe),
+            lambda ps, fe: Momentum(ps, lr=lr, beta=beta, foreach=fe),
+        ):
+            t_loop = time_steps(make_opt(make_params(n, n_tensors), False), repeats)
+            t_vec = time_steps(make_opt(make_params(n, n_tensors), True), repeats)
+            row += [t_loop, t_vec, t_loop / t_vec]
+
+        print(f"{row[0]:>10d} | {row[1]*1e3:>8.3f}ms {row[2]*1e3:>9.3f}ms {row[3]:>5.1f}x | "
+              f"{row[4]*1e3:>8.3f}ms {row[5]*1e3:>9.3f}ms {row[6]:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from core.ops import mul, stack, sub, sum_pop
+from core.optim import Momentum
+from core.populationNode import PopulationNode
+from experiments.utils import ArrayLoader
+from models.mlp import MLP
+
+
+# ---------- Minibatch SGD regression with MLP ----------
+#
+# Synthetic task: y = sin(2 x1) cos(x2) + noise, x ~ U[-2, 2]^2.
+# The dataset lives in one (N, 2) float array (N = 10^6 by default) and is
+# fed through ArrayLoader, which gathers shuffled contiguous batches into
+# reused buffers. Only the model graph is built per sample.
+#
+# Throughput (samples/sec) for the loader alone and for full training steps
+# is printed and appended to outputs/week3/regression_throughput.jsonl, one
+# JSON record per run, so speed can be compared across versions (the file is
+# local: it is git-ignored like the other generated outputs).
+
+
+def make_dataset(n_samples: int, noise: float = 0.05, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(-2.0, 2.0, size=(n_samples, 2))
+    y = np.sin(2.0 * X[:, 0]) * np.cos(X[:, 1]) + noise * rng.standard_normal(n_samples)
+    return X, y
+
+
+def batch_loss(model, xb: np.ndarray, yb: np.ndarray) -> PopulationNode:
+    """Mean squared error of model over one batch, as a single scalar node."""
+    preds = stack([model(PopulationNode(x, requires_grad=False)) for x in xb.tolist()])
+    r = sub(preds, yb.tolist())
+    return mul(1.0 / len(yb), sum_pop(mul(r, r)))
+
+
+def predict(model, X: np.ndarray) -> np.ndarray:
+    return np.array([model(PopulationNode(x, requires_grad=False)).data[0] for x in X.tolist()])
+
+
+def train(model, loader: ArrayLoader, opt, steps: int, log_every: int = 50):
+    """
+    Minibatch SGD for `steps` batches. Returns (losses (steps,), samples_per_sec).
+    """
+    losses = np.empty(steps)
+    n_samples = 0
+    t0 = time.perf_counter()
+    for t, (xb, yb) in enumerate(loader.batches(steps)):
+        opt.zero_grad()
+        loss = batch_loss(model, xb, yb)
+        loss.backprop()
+        opt.step()
+
+        losses[t] = loss.data[0]
+        n_samples += len(yb)
+        if log_every and (t + 1) % log_every == 0:
+            rate = n_samples / (time.perf_counter() - t0)
+            print(f"step {t + 1:5d}  loss={losses[max(0, t + 1 - log_every): t + 1].mean():.4f}  "
+                  f"{rate:,.0f} samples/s")
+    return losses, n_samples / (time.perf_counter() - t0)
+
+
+def loader_throughput(loader: ArrayLoader, max_batches: int = 2000) -> float:
+    """Samples/sec of the loader alone (no model work)."""
+    n = 0
+    t0 = time.perf_counter()
+    for i, (xb, _) in enumerate(loader):
+        n += len(xb)
+        if i + 1 == max_batches:
+            break
+    return n / (time.perf_counter() - t0)
+
+
+def main(n_samples: int = 10**6, batch_size: int = 32, steps: int = 300, hidden: int = 8, lr: float = 0.05):
+    import matplotlib.pyplot as plt
+    from experiments.utils import ensure_dir, savefig
+
+    outdir = "outputs/week3"
+
+    X, y = make_dataset(n_samples)
+    X_test, y_test = make_dataset(1000, noise=0.0, seed=1)
+    loader = ArrayLoader(X, y, batch_size=batch_size, seed=0)
+
+    model = MLP(2, [hidden, hidden, 1], seed=0)
+    opt = Momentum(model.parameters(), lr=lr, beta=0.9, foreach=True)
+
+    data_rate = loader_throughput(loader)
+    losses, train_rate = train(model, loader, opt, steps)
+    test_mse = float(np.mean((predict(model, X_test) - y_test) ** 2))
+
+    print(f"dataset: {n_samples:,} samples, batch {batch_size}, {steps} steps")
+    print(f"loader:   {data_rate:,.0f} samples/s")
+    print(f"training: {train_rate:,.0f} samples/s")
+    print(f"test MSE: {test_mse:.4f} (target variance {np.var(y_test):.4f})")
+
+    ensure_dir(outdir)
+    record = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "n_samples": n_samples,
+        "batch_size": batch_size,
+        "steps": steps,
+        "hidden": hidden,
+        "loader_samples_per_sec": data_rate,
+        "train_samples_per_sec": train_rate,
+        "test_mse": test_mse,
+    }
+    with open(os.path.join(outdir, "regression_throughput.jsonl"), "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+    fig, ax = plt.subplots()
+    ax.plot(losses, lw=0.8)
+    ax.set_yscale("log")
+    ax.set_title(f"Experiment 11: MLP regression, minibatch SGD ({train_rate:,.0f} samples/s)")
+    ax.set_xlabel("step")
+    ax.set_ylabel("batch MSE (log scale)")
+    savefig(outdir, "11_regression_loss.png")
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import json
+import os
+import re
+
+import numpy as np
+
+
+# ---------- Binary results format ----------
+#
+# A results set is a directory:
+#
+#   manifest.json       {"format": 1, "attrs": {...}, "tree": {...},
+#                        "arrays": {path: {"file", "dtype", "shape"}}}
+#   0000_<path>.npy     one plain .npy file per array
+#
+# "tree" is the nested dict that was saved, with every array replaced by
+# {"$array": path}; path is the "/"-joined key path, e.g.
+# "experiment_1/gradients". Numbers, strings and small non-numeric lists stay
+# in the manifest as JSON. Numeric lists (e.g. PopulationNode.grad) and
+# ndarrays are written as raw .npy, so saving costs a memcpy rather than float
+# formatting, and loading maps each file only when it is first accessed:
+#
+#   save_results("results/week1", all_results)
+#   res = load_results("results/week1")
+#   res["experiment_1/gradients"]      # np.memmap, read-only, nothing parsed
+#   res.tree()                         # the whole dict back, arrays as memmaps
+#
+# manifest.json is written last (atomically), so a directory without one is
+# an interrupted save.
+
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+
+def _as_array(value):
+    """value as an ndarray if it should be stored as one, else None."""
+    if isinstance(value, np.ndarray):
+        return value if value.dtype != object else None
+    if isinstance(value, (list, tuple)) and value:
+        try:
+            arr = np.asarray(value)
+        except ValueError:          # ragged
+            return None
+        if arr.dtype.kind in "biuf":
+            return arr
+    return None
+
+
+def _key(k) -> str:
+    """A dict key as stored in the tree; "/" would make it unreachable by path."""
+    k = str(k)
+    if "/" in k:
+        raise ValueError(f"result keys cannot contain '/': {k!r}")
+    return k
+
+
+class ResultsWriter:
+    """
+    Write a results directory array by array.
+
+        with ResultsWriter("outputs/week3/14_ensemble", attrs={"lr": 0.02}) as w:
+            w.add("theta0s", theta0s)
+            w.add("gd", {"stop_step": res.stop_step, "reason": res.reason})
+
+    add(path, value) takes arrays, scalars or nested dicts/lists of them.
+    overwrite=True replaces the results already in root (their manifest goes
+    first, so readers never see a mix); otherwise they raise FileExistsError.
+    """
+
+    def __init__(self, root: str, attrs: dict = None, overwrite: bool = False):
+        os.makedirs(root, exist_ok=True)
+        manifest = os.path.join(root, MANIFEST_FILE)
+        if os.path.exists(manifest):
+            if not overwrite:
+                raise FileExistsError(f"results already exist: {root}")
+            old = Results(root)
+            os.remove(manifest)
+            for info in old.arrays.values():
+                os.remove(os.path.join(root, info["file"]))
+        self.root = root
+        self.attrs = dict(attrs or {})
+        self._tree = {}
+        self._arrays = {}
+        self._closed = False
+
+    def _write_array(self, path: str, arr: np.ndarray) -> dict:
+        if path in self._arrays:
+            raise KeyError(f"array already written: {path}")
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", path.replace("/", "."))
+        fname = f"{len(self._arrays):04d}_{safe}.npy"
+        arr = np.ascontiguousarray(arr)
+        np.save(os.path.join(self.root, fname), arr, allow_pickle=False)
+        self._arrays[path] = {"file": fname, "dtype": arr.dtype.str, "shape": list(arr.shape)}
+        return {"$array": path}
+
+    def _encode(self, path: str, value):
+        arr = _as_array(value)
+        if arr is not None:
+            return self._write_array(path, arr)
+        if isinstance(value, dict):
+            return {_key(k): self._encode(f"{path}/{k}", v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._encode(f"{path}/{i}", v) for i, v in enumerate(value)]
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    def add(self, path: str, value) -> None:
+        if self._closed:
+            raise ValueError("ResultsWriter is closed")
+        keys = path.split("/")
+        node = self._tree
+        for k in keys[:-1]:
+            node = node.setdefault(k, {})
+        node[keys[-1]] = self._encode(path, value)
+
+    def close(self) -> None:
+        """Write manifest.json (atomically); the results are readable from here on."""
+        if self._closed:
+            return
+        manifest = {"format": FORMAT_VERSION, "attrs": self.attrs, "tree": self._tree, "arrays": self._arrays}
+        path = os.path.join(self.root, MANIFEST_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(path + ".tmp", path)
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # No manifest if the block raised: the directory stays an interrupted save
+        if exc_type is None:
+            self.close()
+
+
+def save_results(root: str, results: dict, attrs: dict = None, overwrite: bool = False) -> str:
+    """Write a nested dict of results to root in one go. Returns root."""
+    with ResultsWriter(root, attrs=attrs, overwrite=overwrite) as w:
+        for k, v in results.items():
+            w.add(_key(k), v)
+    return root
+
+
+class Results:
+    """Read side of a results directory; arrays are memory-mapped on first access."""
+
+    def __init__(self, root: str, mmap: bool = True):
+        with open(os.path.join(root, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"unsupported results format {manifest.get('format')!r} in {root}")
+        self.root = root
+        self.attrs = manifest["attrs"]
+        self.arrays = manifest["arrays"]    # path -> {"file", "dtype", "shape"}, no data loaded
+        self._tree = manifest["tree"]
+        self._mmap = "r" if mmap else None
+        self._loaded = {}
+
+    def array(self, path: str) -> np.ndarray:
+        if path not in self._loaded:
+            info = self.arrays[path]
+            self._loaded[path] = np.load(os.path.join(self.root, info["file"]), mmap_mode=self._mmap,
+                                         allow_pickle=False)
+        return self._loaded[path]
+
+    def _decode(self, node):
+        if isinstance(node, dict):
+            if set(node) == {"$array"}:
+                return self.array(node["$array"])
+            return {k: self._decode(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [self._decode(v) for v in node]
+        return node
+
+    def _node(self, path: str):
+        node = self._tree
+        for k in path.split("/"):
+            node = node[int(k)] if isinstance(node, list) else node[k]
+        return node
+
+    def __getitem__(self, path: str):
+        """Value at a "/"-joined key path: an array, a scalar, or a dict/list of them."""
+        return self._decode(self._node(path))
+
+    def __contains__(self, path: str) -> bool:
+        try:
+            self._node(path)
+        except (KeyError, IndexError, ValueError, TypeError):
+            return False
+        return True
+
+    def keys(self):
+        return self._tree.keys()
+
+    def tree(self) -> dict:
+        """The whole saved dict, arrays as (memory-mapped) ndarrays."""
+        return self._decode(self._tree)
+
+
+def load_results(root: str, mmap: bool = True) -> Results:
+    return Results(root, mmap=mmap)
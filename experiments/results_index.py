@@ -0,0 +1,258 @@
+"""
+SQLite index of experiment runs.
+
+    PYTHONPATH=src python -m experiments.results_index "kappa > 50 AND converged AND stop_step < 100"
+    PYTHONPATH=src python -m experiments.results_index --experiment ensemble --limit 5
+
+One row per run (one learning rate of a sweep, one member of an ensemble,
+...): the hyperparameters and summary metrics most queries filter on are
+real, indexed columns; anything else goes to the JSON `params` column. Runs
+point at their arrays in a results directory (experiments/results.py) by
+(results, array, row), so a query never opens an array file and load() opens
+only the ones asked for. results is stored relative to the index file, so
+the index works from any working directory and moves with outputs/.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+from experiments.results import load_results
+
+
+DEFAULT_INDEX_PATH = os.environ.get("LEARNING_DYNAMICS_INDEX", os.path.join("outputs", "results.sqlite"))
+
+COLUMNS = {
+    "experiment": "TEXT NOT NULL",
+    "optimizer": "TEXT",
+    "lr": "REAL",
+    "beta": "REAL",
+    "kappa": "REAL",
+    "lambda_max": "REAL",
+    "steps": "INTEGER",
+    "seed": "INTEGER",
+    "converged": "INTEGER",     # 0/1
+    "stop_step": "INTEGER",     # first step meeting the convergence criterion, NULL if never
+    "reason": "TEXT",           # why the run stopped: "converged", "diverged", "non-finite", "" (ran out of steps)
+    "final_loss": "REAL",
+    "results": "TEXT",          # results directory holding the run's arrays, relative to the index file
+    "array": "TEXT",            # key path of the array in it
+    "row": "INTEGER",           # row of that array belonging to this run (NULL: the whole array)
+}
+
+INDEXES = {
+    "runs_experiment": ("experiment", "created"),
+    "runs_kappa": ("kappa",),
+    "runs_lr_beta": ("lr", "beta"),
+    "runs_converged": ("converged", "stop_step"),
+    "runs_results": ("results",),
+}
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, "
+    + ", ".join(f'"{c}" {t}' for c, t in COLUMNS.items())
+    + ", params TEXT, created REAL NOT NULL)"
+)
+
+
+def _sql_value(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None                 # SQLite has no inf/nan; diverged losses are NULL
+    return value
+
+
+class ResultsIndex:
+    """
+    A runs table in one SQLite file (WAL mode, so parallel experiment workers
+    can insert while others read).
+
+        index = ResultsIndex()
+        index.add_many(runs_from_sweep("ill_conditioned", losses, lrs, kappa=kappa, loss_tol=1e-6))
+        index.query("kappa > ? AND converged AND stop_step < ?", (50, 100))
+        index.query(experiment="ensemble", optimizer="Momentum", limit=10)
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30.0)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # Results paths are stored relative to this directory
+        self._base = os.getcwd() if path == ":memory:" else os.path.dirname(os.path.abspath(path))
+        with self.conn:
+            self.conn.execute(_SCHEMA)
+            # Columns added after an index file was created
+            have = {r["name"] for r in self.conn.execute("PRAGMA table_info(runs)")}
+            for col, typ in COLUMNS.items():
+                if col not in have:
+                    self.conn.execute(f'ALTER TABLE runs ADD COLUMN "{col}" {typ.replace(" NOT NULL", "")}')
+            for name, cols in INDEXES.items():
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON runs ({', '.join(cols)})")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def _relpath(self, results):
+        """A results directory (relative to the cwd, or absolute) as stored in the index."""
+        if results is None:
+            return None
+        return os.path.relpath(os.path.abspath(results), self._base)
+
+    def resolve(self, run: dict) -> str:
+        """Path of a run's results directory, usable from the current working directory."""
+        return os.path.normpath(os.path.join(self._base, run["results"]))
+
+    def add_many(self, runs, replace: bool = False) -> int:
+        """
+        Insert run dicts in one transaction (all or none). Keys other than
+        COLUMNS are stored in params. Returns the number of rows inserted.
+
+        replace=True first deletes the runs already indexed for the same
+        results directories, so rerunning an experiment that overwrites its
+        results does not leave stale rows behind.
+        """
+        runs = list(runs)
+        now = time.time()
+        rows = []
+        runs = [dict(run, results=self._relpath(run.get("results"))) for run in runs]
+        for run in runs:
+            extra = {k: _sql_value(v) for k, v in run.items() if k not in COLUMNS}
+            rows.append([_sql_value(run.get(c)) for c in COLUMNS]
+                        + [json.dumps(extra) if extra else None, now])
+        cols = ", ".join(f'"{c}"' for c in COLUMNS)
+        marks = ", ".join("?" * (len(COLUMNS) + 2))
+        with self.conn:
+            if replace:
+                dirs = {run.get("results") for run in runs} - {None}
+                self.conn.executemany("DELETE FROM runs WHERE results = ?", [(d,) for d in dirs])
+            self.conn.executemany(f"INSERT INTO runs ({cols}, params, created) VALUES ({marks})", rows)
+        return len(rows)
+
+    def add(self, **run) -> None:
+        self.add_many([run])
+
+    def query(self, where: str = None, args=(), order_by: str = None, limit: int = None, **equals):
+        """
+        Runs matching an SQL condition on the columns (with ? placeholders
+        bound from args) and/or column=value equalities. Returns dicts, with
+        params merged in.
+        """
+        clauses, values = [], []
+        if where:
+            clauses.append(f"({where})")
+            values.extend(args)
+        for col, value in equals.items():
+            if col not in COLUMNS:
+                raise KeyError(f"unknown column {col!r}")
+            clauses.append(f'"{col}" = ?')
+            values.append(self._relpath(value) if col == "results" else _sql_value(value))
+
+        sql = "SELECT * FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        out = []
+        for r in self.conn.execute(sql, values):
+            run = dict(r)
+            run.update(json.loads(run.pop("params") or "{}"))
+            out.append(run)
+        return out
+
+    def explain(self, where: str, args=()) -> str:
+        """SQLite's query plan for a where clause (to check an index is used)."""
+        rows = self.conn.execute(f"EXPLAIN QUERY PLAN SELECT * FROM runs WHERE {where}", args)
+        return "\n".join(r["detail"] for r in rows)
+
+    def load(self, run: dict) -> np.ndarray:
+        """The array a run points at (its row, if it has one), memory-mapped."""
+        arr = load_results(self.resolve(run)).array(run["array"])
+        return arr if run["row"] is None else arr[run["row"]]
+
+
+def runs_from_sweep(experiment: str, losses, lrs, betas=None, loss_tol: float = 1e-6, monitor=None, **common):
+    """
+    One run dict per row of a batched sweep's losses (K, steps) (sweep_gd,
+    sweep_momentum, ...): lr/beta per row, converged / stop_step from the
+    first step with loss <= loss_tol, final_loss the last loss recorded
+    (losses are NaN after a row was stopped). reason is "converged", else the
+    sweep's BatchStopMonitor reason if monitor is given, else "non-finite"
+    (last loss overflowed) / "". common is added to every run (e.g. kappa=,
+    results=, array=).
+    """
+    losses = np.asarray(losses, dtype=float)
+    K, steps = losses.shape
+    lrs = np.broadcast_to(np.asarray(lrs, dtype=float), (K,))
+    betas = None if betas is None else np.broadcast_to(np.asarray(betas, dtype=float), (K,))
+
+    with np.errstate(invalid="ignore"):
+        below = losses <= loss_tol
+    converged = below.any(axis=1)
+    stop_step = np.where(converged, below.argmax(axis=1), -1)
+    recorded = ~np.isnan(losses)
+    final_loss = losses[np.arange(K), np.where(recorded.any(axis=1), steps - 1 - recorded[:, ::-1].argmax(axis=1), -1)]
+
+    runs = []
+    for k in range(K):
+        if converged[k]:
+            reason = "converged"
+        elif monitor is not None:
+            reason = str(monitor.reason[k])
+        else:
+            reason = "" if np.isfinite(final_loss[k]) else "non-finite"
+        run = dict(common, experiment=experiment, lr=lrs[k], steps=steps, converged=int(converged[k]),
+                   stop_step=int(stop_step[k]) if converged[k] else None, final_loss=final_loss[k],
+                   reason=reason, loss_tol=loss_tol)
+        if betas is not None:
+            run["beta"] = betas[k]
+        if "array" in common:
+            run["row"] = k
+        runs.append(run)
+    return runs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("where", nargs="?", help="SQL condition on the run columns")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH)
+    parser.add_argument("--experiment")
+    parser.add_argument("--order-by", default="id")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    equals = {"experiment": args.experiment} if args.experiment else {}
+    with ResultsIndex(args.index) as index:
+        runs = index.query(args.where, order_by=args.order_by, limit=args.limit, **equals)
+        shown = ["id", "experiment", "optimizer", "lr", "beta", "kappa", "converged", "stop_step", "final_loss"]
+        print("  ".join(f"{c:>10}" for c in shown))
+        for run in runs:
+            print("  ".join(f"{v:>10.4g}" if isinstance(v, float) else f"{str(v):>10}"
+                            for v in (run[c] for c in shown)))
+        print(f"{len(runs)} shown, {len(index)} runs in {args.index}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
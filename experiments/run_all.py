@@ -0,0 +1,176 @@
+"""
+Run every experiment in experiments/ as a suite, in parallel.
+
+    PYTHONPATH=src python -m experiments.run_all                 # all, one process per core
+    PYTHONPATH=src python -m experiments.run_all -j 4 --only hessian_spectrum zigzag_dynamics
+    PYTHONPATH=src python -m experiments.run_all --list
+
+An experiment is any module in experiments/ that defines a top-level main().
+Each one runs in its own worker process with:
+  - the repo root as working directory (scripts save to outputs/...),
+  - a deterministic seed derived from (--seed, experiment name),
+  - the non-interactive Agg matplotlib backend,
+  - stdout/stderr captured to <logdir>/<name>.log.
+
+A failing experiment is recorded (with its traceback) and does not stop the
+others. A JSON summary with per-experiment timing and status is written to
+--summary.
+"""
+
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import random
+import sys
+import time
+import traceback
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+
+EXPERIMENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(EXPERIMENTS_DIR)
+
+# Modules in experiments/ with a main() that are not experiments
+NOT_EXPERIMENTS = {"run_all", "import_time", "results_index"}
+
+
+def discover(directory: str = EXPERIMENTS_DIR):
+    """Names of modules in directory that define a top-level main(), sorted."""
+    names = []
+    for fname in sorted(os.listdir(directory)):
+        name, ext = os.path.splitext(fname)
+        if ext != ".py" or name.startswith("_") or name in NOT_EXPERIMENTS:
+            continue
+        with open(os.path.join(directory, fname), encoding="utf-8") as f:
+            if any(line.startswith("def main(") for line in f):
+                names.append(name)
+    return names
+
+
+def experiment_seed(base_seed: int, name: str) -> int:
+    """Stable per-experiment seed (independent of scheduling order)."""
+    return (base_seed * 1_000_003 + zlib.crc32(name.encode())) % 2**32
+
+
+def run_one(name: str, base_seed: int, logdir: str) -> dict:
+    """
+    Worker: import experiments.<name>, seed, run main(), never raise.
+
+    The working directory, sys.path, MPLBACKEND and the global random /
+    np.random states are restored afterwards, so calling it in-process
+    (e.g. from tests) leaves the caller's state as it was.
+    """
+    saved_cwd, saved_path = os.getcwd(), list(sys.path)
+    saved_backend = os.environ.get("MPLBACKEND")
+    saved_random, saved_np_random = random.getstate(), np.random.get_state()
+    try:
+        return _run_one(name, base_seed, logdir)
+    finally:
+        os.chdir(saved_cwd)
+        sys.path[:] = saved_path
+        if saved_backend is None:
+            os.environ.pop("MPLBACKEND", None)
+        else:
+            os.environ["MPLBACKEND"] = saved_backend
+        random.setstate(saved_random)
+        np.random.set_state(saved_np_random)
+
+
+def _run_one(name: str, base_seed: int, logdir: str) -> dict:
+    os.chdir(REPO_ROOT)
+    for path in (os.path.join(REPO_ROOT, "src"), REPO_ROOT):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    seed = experiment_seed(base_seed, name)
+    random.seed(seed)
+    np.random.seed(seed)
+
+    os.makedirs(logdir, exist_ok=True)
+    log_path = os.path.abspath(os.path.join(logdir, f"{name}.log"))   # still valid once cwd is restored
+    record = {"name": name, "seed": seed, "log": log_path, "ok": False, "error": None}
+
+    t0 = time.perf_counter()
+    with open(log_path, "w") as log, contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            module = importlib.import_module(f"experiments.{name}")
+            module.main()
+            record["ok"] = True
+        except BaseException as e:     # SystemExit from a script is a failure too
+            traceback.print_exc()
+            record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = time.perf_counter() - t0
+    return record
+
+
+def run_all(names, jobs: int = None, base_seed: int = 0, logdir: str = os.path.join("outputs", "logs")):
+    """Run experiments in a process pool; returns one record per experiment (in names order)."""
+    logdir = os.path.join(REPO_ROOT, logdir)
+    records = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(run_one, name, base_seed, logdir): name for name in names}
+        for fut in as_completed(futures):
+            name = futures[fut]
+            try:
+                rec = fut.result()
+            except Exception as e:       # worker process died (e.g. segfault, OOM)
+                rec = {"name": name, "ok": False, "error": f"{type(e).__name__}: {e}", "seconds": None}
+            records[name] = rec
+            status = "ok  " if rec["ok"] else "FAIL"
+            secs = "-" if rec["seconds"] is None else f"{rec['seconds']:.2f}s"
+            print(f"[{status}] {name:<32} {secs:>8}" + ("" if rec["ok"] else f"  {rec['error']}"))
+    return [records[n] for n in names]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--only", nargs="+", help="run only these experiments")
+    parser.add_argument("--exclude", nargs="+", default=[], help="skip these experiments")
+    parser.add_argument("--seed", type=int, default=0, help="base seed")
+    parser.add_argument("--logdir", default=os.path.join("outputs", "logs"))
+    parser.add_argument("--summary", default=os.path.join("outputs", "run_summary.json"))
+    parser.add_argument("--list", action="store_true", help="list experiments and exit")
+    args = parser.parse_args(argv)
+
+    names = discover()
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if args.only:
+        unknown = sorted(set(args.only) - set(names))
+        if unknown:
+            parser.error(f"unknown experiments: {', '.join(unknown)}")
+        names = [n for n in names if n in args.only]
+    names = [n for n in names if n not in args.exclude]
+
+    t0 = time.perf_counter()
+    records = run_all(names, jobs=args.jobs, base_seed=args.seed, logdir=args.logdir)
+    wall = time.perf_counter() - t0
+
+    summary = {
+        "jobs": args.jobs,
+        "seed": args.seed,
+        "wall_seconds": wall,
+        "cpu_seconds": sum(r["seconds"] or 0.0 for r in records),
+        "n_ok": sum(r["ok"] for r in records),
+        "n_failed": sum(not r["ok"] for r in records),
+        "experiments": records,
+    }
+    summary_path = os.path.join(REPO_ROOT, args.summary)
+    os.makedirs(os.path.dirname(summary_path), exist_ok=True)
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"\n{summary['n_ok']}/{len(records)} ok in {wall:.2f}s wall "
+          f"({summary['cpu_seconds']:.2f}s summed) -> {summary_path}")
+    return 0 if summary["n_failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import numpy as np
+
+
+# ---------- Closed-form GD / Momentum on L = 1/2 theta^T A theta ----------
+#
+# With A = V diag(lam) V^T and modal coordinates c = V^T theta, both optimizers
+# are linear recurrences that act on each eigenmode independently:
+#
+#   GD:        c_{t+1} = (1 - lr*lam) c_t          =>  c_t = (1 - lr*lam)^t c_0
+#
+#   Momentum:  [c_{t+1}]   [1 - lr*lam   beta] [c_t]
+#              [u_{t+1}] = [  -lr*lam    beta] [u_t]      (u = V^T v)
+#
+# The 2x2 companion matrix M has trace T = 1 + beta - lr*lam and det = beta,
+# so by Cayley-Hamilton M^t = a_t M + b_t I with
+#
+#   a_t = (r1^t - r2^t) / (r1 - r2)     (a_t = t r^(t-1) for a repeated root)
+#   b_t = -beta * a_{t-1}
+#
+# where r1, r2 are the (possibly complex) roots of r^2 - T r + beta = 0.
+# Any step t therefore costs O(n) in modal coordinates, whatever t is.
+
+
+class SpectralQuadratic:
+    """
+    Eigendecompose A once, then produce GD / Momentum trajectories, losses and
+    velocities for any step count, or at any single step t, without stepping.
+
+    Conventions match experiments.utils.run_gd / run_momentum:
+      traj[k] = theta_k (k = 0..steps), losses[k] = L(theta_k) (k = 0..steps-1),
+      velocities start at v_0 = 0.
+    """
+
+    def __init__(self, A: np.ndarray):
+        self.A = np.asarray(A, dtype=float)
+        self.lam, self.V = np.linalg.eigh(self.A)
+
+    # ----- coordinates -----
+
+    def to_modes(self, theta) -> np.ndarray:
+        return np.asarray(theta, dtype=float) @ self.V
+
+    def from_modes(self, c: np.ndarray) -> np.ndarray:
+        return c @ self.V.T
+
+    def modal_loss(self, c: np.ndarray) -> np.ndarray:
+        """L = 1/2 sum_i lam_i c_i^2 (works on (..., n) arrays)."""
+        return 0.5 * np.sum(self.lam * c * c, axis=-1)
+
+    # ----- GD -----
+
+    def gd_modes(self, theta0, lr: float, ts) -> np.ndarray:
+        """Modal coordinates c_t for each t in ts: shape (len(ts), n)."""
+        ts = np.asarray(ts, dtype=float)[:, None]
+        r = 1.0 - lr * self.lam
+        return r ** ts * self.to_modes(theta0)
+
+    def gd_at(self, theta0, lr: float, t: int):
+        """(theta_t, L(theta_t)) at a single step t."""
+        c = self.gd_modes(theta0, lr, [t])[0]
+        return self.from_modes(c), float(self.modal_loss(c))
+
+    def gd(self, theta0, lr: float, steps: int):
+        """Same outputs as run_gd: (traj (steps+1, n), losses (steps,))."""
+        c = self.gd_modes(theta0, lr, np.arange(steps + 1))
+        return self.from_modes(c), self.modal_loss(c[:-1])
+
+    # ----- Momentum -----
+
+    def _power_coeffs(self, lr: float, beta: float, ts: np.ndarray):
+        """Cayley-Hamilton coefficients (a_t, b_t) with M^t = a_t M + b_t I, shape (len(ts), n)."""
+        T = (1.0 + beta - lr * self.lam).astype(complex)
+        disc = np.sqrt(T * T - 4.0 * beta)
+        r1, r2 = 0.5 * (T + disc), 0.5 * (T - disc)
+
+        ts = np.asarray(ts, dtype=float)[:, None]
+
+        def a(t):
+            gap = r1 - r2
+            repeated = np.abs(gap) <= 1e-7 * np.maximum(1.0, np.abs(r1))
+            safe_gap = np.where(repeated, 1.0, gap)
+            distinct = (r1 ** t - r2 ** t) / safe_gap
+            # Repeated root: a_t = t r^(t-1)  (t = 0 gives 0)
+            double = np.where(t > 0, t * r1 ** np.maximum(t - 1.0, 0.0), 0.0)
+            return np.where(repeated, double, distinct)
+
+        a_t = a(ts)
+        b_t = np.where(ts == 0, 1.0 + 0j, -beta * a(np.maximum(ts - 1.0, 0.0)))
+        return a_t.real, b_t.real
+
+    def momentum_modes(self, theta0, lr: float, beta: float, ts):
+        """Modal (c_t, u_t) for each t in ts, starting from v_0 = 0."""
+        a_t, b_t = self._power_coeffs(lr, beta, ts)
+        c0 = self.to_modes(theta0)
+        # M^t [c0, 0]^T = (a_t M + b_t I) [c0, 0]^T
+        c = (a_t * (1.0 - lr * self.lam) + b_t) * c0
+        u = a_t * (-lr * self.lam) * c0
+        return c, u
+
+    def momentum_at(self, theta0, lr: float, beta: float, t: int):
+        """(theta_t, v_t, L(theta_t)) at a single step t."""
+        c, u = self.momentum_modes(theta0, lr, beta, [t])
+        return self.from_modes(c[0]), self.from_modes(u[0]), float(self.modal_loss(c[0]))
+
+    def momentum(self, theta0, lr: float, beta: float, steps: int):
+        """Same outputs as run_momentum: (traj, v_traj, losses)."""
+        c, u = self.momentum_modes(theta0, lr, beta, np.arange(steps + 1))
+        return self.from_modes(c), self.from_modes(u), self.modal_loss(c[:-1])
@@ -0,0 +1,152 @@
+import numpy as np
+
+from experiments.utils import make_quadratic_A, eigs
+
+
+# ---------- Stability regions of GD / Momentum on L = 1/2 theta^T A theta ----------
+#
+# Both methods are linear iterations, so each run converges iff the spectral
+# radius rho of its iteration matrix is < 1, and the error then shrinks like
+# rho^t: the asymptotic rate is -log(rho) per step. Per eigenvalue lam of A:
+#
+#   GD:        rho = |1 - lr*lam|
+#   Momentum:  roots of r^2 - T r + beta = 0, T = 1 + beta - lr*lam
+#              rho = (|T| + sqrt(T^2 - 4 beta)) / 2   if T^2 >= 4 beta (real roots)
+#                    sqrt(beta)                         otherwise (complex pair)
+#
+# and the radius of the whole iteration is the max over eigenvalues, attained
+# at lam_min or lam_max. A scan is one pass of array arithmetic over the grid
+# for those two, whatever n: a 1000 x 1000 (beta, lr) grid takes well under a
+# second.
+#
+# simulate_rates() estimates the same radius by iterating the whole grid as
+# one batch, for cross-checking or when only A (not its spectrum) is trusted.
+
+
+def _spectrum(A_or_lam) -> np.ndarray:
+    """Distinct eigenvalues, from a symmetric matrix or a 1-D spectrum."""
+    arr = np.asarray(A_or_lam, dtype=float)
+    lam = np.linalg.eigvalsh(arr) if arr.ndim == 2 else arr
+    return np.unique(lam)
+
+
+def gd_spectral_radius(A_or_lam, lrs) -> np.ndarray:
+    """rho(lr) = max_i |1 - lr*lam_i|, same shape as lrs."""
+    lam = _spectrum(A_or_lam)
+    lrs = np.asarray(lrs, dtype=float)
+    # |1 - lr*lam| is convex in lam, so only the extreme eigenvalues matter
+    return np.maximum(np.abs(1.0 - lrs * lam[0]), np.abs(1.0 - lrs * lam[-1]))
+
+
+def momentum_spectral_radius(A_or_lam, lrs, betas) -> np.ndarray:
+    """rho(lr, beta) of heavy-ball momentum; lrs and betas broadcast (e.g. a meshgrid)."""
+    lam = _spectrum(A_or_lam)
+    lrs, betas = np.broadcast_arrays(np.asarray(lrs, dtype=float), np.asarray(betas, dtype=float))
+
+    # rho depends on lam only through |T| and is non-decreasing in it; |T| is
+    # convex in lam, so only the extreme eigenvalues matter (as for GD)
+    ends = lam[[0, -1]].reshape((2,) + (1,) * lrs.ndim)
+    T = 1.0 + betas - lrs * ends
+    disc = T * T - 4.0 * betas
+    real_rho = 0.5 * (np.abs(T) + np.sqrt(np.maximum(disc, 0.0)))
+    return np.where(disc >= 0.0, real_rho, np.sqrt(np.abs(betas))).max(axis=0)
+
+
+def rate(rho: np.ndarray) -> np.ndarray:
+    """Asymptotic convergence rate -log(rho) per step (negative = divergence)."""
+    with np.errstate(divide="ignore"):
+        return -np.log(rho)
+
+
+def scan(A_or_lam, lrs, betas=(0.0,)):
+    """
+    Stability map over a (beta, lr) grid.
+
+    Returns (rho, stable), both of shape (len(betas), len(lrs)); beta = 0 rows
+    are plain GD.
+    """
+    lr_grid, beta_grid = np.meshgrid(np.asarray(lrs, dtype=float), np.asarray(betas, dtype=float))
+    rho = momentum_spectral_radius(A_or_lam, lr_grid, beta_grid)
+    return rho, rho < 1.0
+
+
+def momentum_lr_max(A_or_lam, beta: float) -> float:
+    """Largest stable lr for momentum with 0 <= beta < 1: 2 (1 + beta) / lam_max."""
+    return 2.0 * (1.0 + beta) / _spectrum(A_or_lam)[-1]
+
+
+def simulate_rates(A: np.ndarray, lrs, betas, steps: int = 200, theta0=None, chunk: int = 2**16):
+    """
+    Estimate rho for every (lr, beta) pair (broadcast together) by running
+    momentum on all of them as one batch, chunk pairs at a time.
+
+    The joint state (theta, v) is renormalized each step and the log-scale
+    accumulated, so divergent runs give a finite rho > 1 instead of inf.
+    The estimate is the mean growth factor over the second half of the run.
+    """
+    A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    lrs, betas = np.broadcast_arrays(np.asarray(lrs, dtype=float), np.asarray(betas, dtype=float))
+    shape = lrs.shape
+    lrs, betas = lrs.reshape(-1, 1), betas.reshape(-1, 1)
+
+    if theta0 is None:
+        # Generic start: excites every eigenmode
+        theta0 = np.random.default_rng(0).standard_normal(n)
+    theta0 = np.asarray(theta0, dtype=float)
+
+    burn_in = steps // 2
+    rho = np.empty(len(lrs))
+    for lo in range(0, len(lrs), chunk):
+        lr, beta = lrs[lo: lo + chunk], betas[lo: lo + chunk]
+        theta = np.tile(theta0, (len(lr), 1))
+        v = np.zeros_like(theta)
+        log_scale = np.zeros(len(lr))
+
+        for t in range(steps):
+            v = beta * v - lr * (theta @ A.T)
+            theta = theta + v
+
+            norm = np.sqrt(np.sum(theta * theta, axis=1) + np.sum(v * v, axis=1))
+            norm = np.where(norm > 0.0, norm, 1.0)
+            theta /= norm[:, None]
+            v /= norm[:, None]
+            if t >= burn_in:
+                log_scale += np.log(norm)
+
+        rho[lo: lo + chunk] = np.exp(log_scale / (steps - burn_in))
+    return rho.reshape(shape)
+
+
+def main():
+    import matplotlib.pyplot as plt
+    from experiments.utils import savefig
+
+    outdir = "outputs/week3"
+    A = make_quadratic_A(l1=10.0, l2=2.0, rot_rad=np.deg2rad(15))
+    w, lmin, lmax, kappa = eigs(A)
+
+    lrs = np.linspace(1e-4, 4.0 / lmax, 1000)
+    betas = np.linspace(0.0, 0.999, 1000)
+    rho, stable = scan(A, lrs, betas)
+    print(f"Eigenvalues: {w}, stable cells: {stable.mean():.1%} of {stable.size}")
+
+    fig, ax = plt.subplots()
+    im = ax.imshow(
+        np.where(stable, rate(rho), np.nan),
+        origin="lower", aspect="auto", cmap="viridis",
+        extent=[lrs[0], lrs[-1], betas[0], betas[-1]],
+    )
+    ax.plot(momentum_lr_max(w, betas), betas, "r--", lw=1, label="lr = 2(1+beta)/lam_max")
+    ax.set_xlim(lrs[0], lrs[-1])
+    fig.colorbar(im, ax=ax, label="rate -log(rho) per step")
+    ax.set_title("Experiment 7: Momentum stability region")
+    ax.set_xlabel("learning rate")
+    ax.set_ylabel("beta")
+    ax.legend(loc="upper right")
+    savefig(outdir, "07_stability_region.png")
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    main()
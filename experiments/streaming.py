@@ -0,0 +1,92 @@
+import itertools
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from core.optim import GD, Momentum
+from core.parameter import Parameter
+from experiments.utils import quadratic_loss
+from utils.decimation import LogSpacedSampler
+
+
+# ---------- Streaming trajectories ----------
+#
+# A stream is a lazy iterator of StepRecord(step, theta, loss, grad_norm), one
+# per optimizer step, where loss and grad_norm are evaluated at theta (i.e.
+# before the update that step makes). Nothing is kept between steps, so memory
+# is constant however long the run is; steps=None streams forever.
+#
+# Filters take a stream and return a stream, so they compose. Order matters:
+# here the monitor sees every step and only every 100th is printed.
+#
+#   for rec in every(until(stream_gd(A, theta0, lr=0.02), StopMonitor(grad_tol=1e-8)), 100):
+#       print(rec.step, rec.loss)
+
+StepRecord = namedtuple("StepRecord", ["step", "theta", "loss", "grad_norm"])
+
+
+def stream_optimizer(A: np.ndarray, theta0, make_opt, steps: int = None):
+    """
+    Yield one StepRecord per step of make_opt([theta]) on L = 1/2 theta^T A theta.
+
+    make_opt must build a first-order optimizer (step() without a closure).
+    Record k holds theta_k and L(theta_k); the stream matches run_gd's
+    traj[:-1] / losses.
+    """
+    theta = Parameter(theta0)
+    opt = make_opt([theta])
+    if getattr(opt, "needs_closure", False):
+        raise ValueError("stream_optimizer needs a first-order optimizer (no closure)")
+
+    for t in itertools.count() if steps is None else range(steps):
+        loss = quadratic_loss(A, theta)
+        loss.zero_grad_graph()
+        loss.backprop()
+        grad_norm = math.sqrt(sum(g * g for g in theta.grad))
+
+        yield StepRecord(t, np.array(theta.data), loss.data[0], grad_norm)
+        opt.step()
+
+
+def stream_gd(A: np.ndarray, theta0, lr: float, steps: int = None):
+    return stream_optimizer(A, theta0, lambda ps: GD(ps, lr=lr), steps)
+
+
+def stream_momentum(A: np.ndarray, theta0, lr: float, beta: float, steps: int = None):
+    return stream_optimizer(A, theta0, lambda ps: Momentum(ps, lr=lr, beta=beta), steps)
+
+
+# ---------- Filters ----------
+
+def every(stream, k: int):
+    """Decimate: keep records whose step is a multiple of k."""
+    if k < 1:
+        raise ValueError("k must be >= 1")
+    return (rec for rec in stream if rec.step % k == 0)
+
+
+def log_spaced(stream, per_decade: int = 50):
+    """Decimate for log-scale plots: about per_decade records per factor of 10 in step."""
+    sampler = LogSpacedSampler(per_decade)
+    return (rec for rec in stream if sampler.keep(rec.step))
+
+
+def until(stream, monitor):
+    """
+    Pass records through until monitor (a core.stopping.StopMonitor) fires;
+    the record that fired it is yielded last, and monitor.reason says why.
+    """
+    for rec in stream:
+        yield rec
+        if monitor.check_norm(rec.loss, rec.grad_norm):
+            return
+
+
+def collect(stream):
+    """Materialize a (finite) stream into (steps, thetas, losses, grad_norms) arrays."""
+    records = list(stream)
+    if not records:
+        return np.empty(0, dtype=int), np.empty((0, 0)), np.empty(0), np.empty(0)
+    steps, thetas, losses, grad_norms = zip(*records)
+    return np.array(steps), np.array(thetas), np.array(losses), np.array(grad_norms)
@@ -0,0 +1,62 @@
+import numpy as np
+
+
+# ---------- Preallocated trajectory recording ----------
+
+class TrajectoryRecorder:
+    """
+    Fixed-size (rows, n) buffer that training loops write states into directly,
+    instead of appending list copies and calling np.array at the end.
+
+      stride: keep every stride-th state (steps 0, stride, 2*stride, ...)
+      path:   back the buffer with a memory-mapped .npy file (np.load-able),
+              for runs too long to hold in RAM
+
+    Rows are allocated once for steps+1 states (theta_0 .. theta_steps);
+    .array is a view of the rows written so far, .steps their step numbers.
+    """
+
+    def __init__(self, steps: int, n: int, stride: int = 1, path: str = None, dtype=float):
+        if stride < 1:
+            raise ValueError("stride must be >= 1")
+        self.stride = int(stride)
+        self.capacity = int(steps) // self.stride + 1
+        self.path = path
+
+        shape = (self.capacity, int(n))
+        if path is None:
+            self._buf = np.empty(shape, dtype=dtype)
+        else:
+            self._buf = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+        self._steps = np.empty(self.capacity, dtype=np.int64)
+
+        self._t = 0         # step number of the next state offered to record()
+        self._len = 0       # rows written
+
+    def record(self, state) -> None:
+        """Offer the state at the next step; stored only on stride boundaries."""
+        if self._t % self.stride == 0:
+            if self._len == self.capacity:
+                raise IndexError("TrajectoryRecorder is full")
+            self._buf[self._len] = state
+            self._steps[self._len] = self._t
+            self._len += 1
+        self._t += 1
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def array(self) -> np.ndarray:
+        """Recorded states, shape (len, n). A view, not a copy."""
+        return self._buf[: self._len]
+
+    @property
+    def steps(self) -> np.ndarray:
+        """Step number of each recorded row."""
+        return self._steps[: self._len]
+
+    def flush(self) -> None:
+        """Push memory-mapped rows to disk (no-op for in-memory buffers)."""
+        if isinstance(self._buf, np.memmap):
+            self._buf.flush()
@@ -0,0 +1,222 @@
+import json
+import os
+
+import numpy as np
+
+
+# ---------- Chunked on-disk trajectory store ----------
+#
+# A store is a directory:
+#
+#   meta.json           {"n", "dtype", "chunk_rows", "stride", "length", "attrs"}
+#   chunk_000000.npy    (chunk_rows, n) rows 0 .. chunk_rows-1
+#   chunk_000001.npy    (chunk_rows, n) rows chunk_rows .. 2*chunk_rows-1
+#   ...
+#
+# Row k holds the state at step k*stride. Chunks are plain .npy files written
+# through memory maps, so a run never holds more than one chunk of pages
+# in RAM, and readers map them back with np.load(mmap_mode="r") without
+# copying. meta.json is rewritten atomically on flush(); "length" is the
+# number of rows readers may trust (while writing, the last chunk is usually
+# only partly filled; close() truncates it to the rows actually written).
+#
+# By default chunk_rows is chosen so a chunk is about CHUNK_BYTES, whatever n is.
+
+META_FILE = "meta.json"
+CHUNK_BYTES = 2**24
+
+
+def _chunk_path(root: str, i: int) -> str:
+    return os.path.join(root, f"chunk_{i:06d}.npy")
+
+
+class TrajectoryWriter:
+    """
+    Append states to a store directory, one row at a time or in blocks.
+
+    Has the same record(state) / flush() / .array interface as
+    TrajectoryRecorder, so it can be passed as recorder= to run_gd,
+    run_momentum or run_optimizer; .array then returns a TrajectoryStore.
+
+        with TrajectoryWriter("outputs/runs/gd_eos", n=2, stride=10) as w:
+            run_gd(A, theta0, lr, steps=10**6, recorder=w)
+        traj = TrajectoryStore("outputs/runs/gd_eos")
+        window = traj.read(500_000, 510_000)     # (1000, 2) view, steps 500000..509990
+    """
+
+    def __init__(self, root: str, n: int, chunk_rows: int = None, stride: int = 1,
+                 dtype=float, attrs: dict = None):
+        if chunk_rows is None:
+            chunk_rows = max(1, CHUNK_BYTES // (max(int(n), 1) * np.dtype(dtype).itemsize))
+        if stride < 1 or chunk_rows < 1:
+            raise ValueError("stride and chunk_rows must be >= 1")
+        os.makedirs(root, exist_ok=True)
+        if os.path.exists(os.path.join(root, META_FILE)):
+            raise FileExistsError(f"trajectory store already exists: {root}")
+
+        self.root = root
+        self.n = int(n)
+        self.chunk_rows = int(chunk_rows)
+        self.stride = int(stride)
+        self.dtype = np.dtype(dtype)
+        self.attrs = dict(attrs or {})
+
+        self._length = 0        # rows written
+        self._t = 0             # step number of the next state offered to record()
+        self._chunk = None      # memmap of the chunk being filled
+        self._chunk_idx = -1
+        self.flush()
+
+    def _open_chunk(self, i: int) -> None:
+        if self._chunk is not None:
+            self._chunk.flush()
+        self._chunk = np.lib.format.open_memmap(
+            _chunk_path(self.root, i), mode="w+", dtype=self.dtype, shape=(self.chunk_rows, self.n)
+        )
+        self._chunk_idx = i
+
+    def append(self, rows) -> None:
+        """Append a (k, n) block of rows (bypasses stride: each row is one stored step)."""
+        rows = np.asarray(rows, dtype=self.dtype).reshape(-1, self.n)
+        done = 0
+        while done < len(rows):
+            i, offset = divmod(self._length, self.chunk_rows)
+            if i != self._chunk_idx:
+                self._open_chunk(i)
+            k = min(self.chunk_rows - offset, len(rows) - done)
+            self._chunk[offset: offset + k] = rows[done: done + k]
+            done += k
+            self._length += k
+
+    def record(self, state) -> None:
+        """Offer the state at the next step; stored only on stride boundaries."""
+        if self._t % self.stride == 0:
+            self.append(state)
+        self._t += 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    def flush(self) -> None:
+        """Push written rows to disk and publish the new length in meta.json."""
+        if self._chunk is not None:
+            self._chunk.flush()
+        meta = {
+            "n": self.n,
+            "dtype": self.dtype.str,
+            "chunk_rows": self.chunk_rows,
+            "stride": self.stride,
+            "length": self._length,
+            "attrs": self.attrs,
+        }
+        tmp = os.path.join(self.root, META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, os.path.join(self.root, META_FILE))
+
+    def close(self) -> None:
+        """Flush, and rewrite the last chunk with only the rows written to it."""
+        self.flush()
+        if self._chunk is not None:
+            rows = self._length - self._chunk_idx * self.chunk_rows
+            if rows < self.chunk_rows:
+                tail = np.array(self._chunk[:rows])
+                self._chunk = None          # release the map before replacing the file
+                path = _chunk_path(self.root, self._chunk_idx)
+                tmp = path[:-len(".npy")] + ".tmp.npy"
+                np.save(tmp, tail)
+                os.replace(tmp, path)
+        self._chunk = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def array(self) -> "TrajectoryStore":
+        """Flush and open the store for reading (what the runners return as traj)."""
+        self.flush()
+        return TrajectoryStore(self.root)
+
+
+class TrajectoryStore:
+    """
+    Read-only view of a store directory. Indexing is by row (store[a:b],
+    store[k]); read(start_step, stop_step) selects by step number.
+
+    A range inside one chunk comes back as a memory-mapped view (no copy);
+    a range spanning chunks is concatenated. iter_chunks() walks any range
+    as a sequence of zero-copy views.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        with open(os.path.join(root, META_FILE)) as f:
+            meta = json.load(f)
+        self.n = int(meta["n"])
+        self.dtype = np.dtype(meta["dtype"])
+        self.chunk_rows = int(meta["chunk_rows"])
+        self.stride = int(meta["stride"])
+        self.attrs = meta.get("attrs", {})
+        self._length = int(meta["length"])
+        self._chunks = {}
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def shape(self):
+        return (self._length, self.n)
+
+    @property
+    def steps(self) -> np.ndarray:
+        """Step number of each row."""
+        return np.arange(self._length) * self.stride
+
+    def _chunk(self, i: int) -> np.ndarray:
+        if i not in self._chunks:
+            self._chunks[i] = np.load(_chunk_path(self.root, i), mmap_mode="r")
+        return self._chunks[i]
+
+    def iter_chunks(self, start: int = 0, stop: int = None):
+        """Yield (row, view) pieces covering rows start..stop-1, one per chunk touched."""
+        start, stop, _ = slice(start, stop).indices(self._length)
+        row = start
+        while row < stop:
+            i, offset = divmod(row, self.chunk_rows)
+            k = min(self.chunk_rows - offset, stop - row)
+            yield row, self._chunk(i)[offset: offset + k]
+            row += k
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += self._length
+            if not 0 <= key < self._length:
+                raise IndexError("row out of range")
+            i, offset = divmod(int(key), self.chunk_rows)
+            return self._chunk(i)[offset]
+        if not isinstance(key, slice):
+            raise TypeError("TrajectoryStore supports integer and slice indexing")
+
+        start, stop, step = key.indices(self._length)
+        if step < 0:
+            return self[:][key]
+        pieces = [view for _, view in self.iter_chunks(start, stop)]
+        if not pieces:
+            return np.empty((0, self.n), dtype=self.dtype)
+        if len(pieces) == 1:
+            return pieces[0][::step]
+        return np.concatenate(pieces)[::step]
+
+    def read(self, start_step: int = 0, stop_step: int = None) -> np.ndarray:
+        """Rows for steps in [start_step, stop_step) (rounded to the stride)."""
+        start = -(-int(start_step) // self.stride)
+        stop = None if stop_step is None else -(-int(stop_step) // self.stride)
+        return self[start:stop]
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self[:]
+        return arr if dtype is None else arr.astype(dtype)
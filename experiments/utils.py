@@ -1,9 +1,10 @@
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 
 from core.parameter import Parameter
 from core.ops import matvec, mul, sum_pop
+from core.stopping import BatchStopMonitor
+from experiments.trajectory import TrajectoryRecorder
 
 
 # ---------- Paths / saving ----------
@@ -13,6 +14,10 @@ def ensure_dir(path: str):
 
 
 def savefig(outdir: str, name: str):
+    # pyplot is imported here, not at module level: the runners and sweeps in
+    # this module are used by code that never plots, and pyplot costs ~0.7s
+    import matplotlib.pyplot as plt
+
     ensure_dir(outdir)
     path = os.path.join(outdir, name)
     plt.savefig(path, dpi=160, bbox_inches="tight")
@@ -62,38 +67,61 @@ def quadratic_loss(A: np.ndarray, theta: Parameter):
     return loss
 
 
-def run_gd(A: np.ndarray, theta0, lr: float, steps: int):
+def run_gd(A: np.ndarray, theta0, lr: float, steps: int, monitor=None, recorder=None):
+    """
+    monitor: optional core.stopping.StopMonitor. If it fires at step k, the loop
+    stops before updating: traj and losses both end at theta_k, and
+    monitor.reason / monitor.step say why and when.
+
+    recorder: optional TrajectoryRecorder (e.g. with stride or a memory-mapped
+    path); by default a preallocated (steps+1, n) one. traj is its .array.
+    """
     theta = Parameter(theta0)
-    traj = [theta.data.copy()]
-    losses = []
+    if recorder is None:
+        recorder = TrajectoryRecorder(steps, len(theta.data))
+    recorder.record(theta.data)
+    losses = np.empty(steps)
 
-    for _ in range(steps):
+    for t in range(steps):
         loss = quadratic_loss(A, theta)
         loss.zero_grad_graph()
         loss.backprop()
+        losses[t] = loss.data[0]
+
+        if monitor is not None and monitor.check(loss.data[0], theta.grad):
+            return recorder.array, losses[: t + 1]
 
         # gradient descent update
         for i in range(len(theta.data)):
             theta.data[i] -= lr * theta.grad[i]
 
-        losses.append(loss.data[0])
-        traj.append(theta.data.copy())
+        recorder.record(theta.data)
 
-    return np.array(traj), np.array(losses)
+    return recorder.array, losses
 
 
-def run_momentum(A: np.ndarray, theta0, lr: float, beta: float, steps: int):
+def run_momentum(A: np.ndarray, theta0, lr: float, beta: float, steps: int, monitor=None,
+                 recorder=None, v_recorder=None):
+    """monitor / recorder: as in run_gd; v_recorder does the same for the velocity."""
     theta = Parameter(theta0)
     v = [0.0 for _ in theta.data]
 
-    traj = [theta.data.copy()]
-    v_traj = [v.copy()]
-    losses = []
+    if recorder is None:
+        recorder = TrajectoryRecorder(steps, len(theta.data))
+    if v_recorder is None:
+        v_recorder = TrajectoryRecorder(steps, len(theta.data), stride=recorder.stride)
+    recorder.record(theta.data)
+    v_recorder.record(v)
+    losses = np.empty(steps)
 
-    for _ in range(steps):
+    for t in range(steps):
         loss = quadratic_loss(A, theta)
         loss.zero_grad_graph()
         loss.backprop()
+        losses[t] = loss.data[0]
+
+        if monitor is not None and monitor.check(loss.data[0], theta.grad):
+            return recorder.array, v_recorder.array, losses[: t + 1]
 
         # v <- beta*v - lr*grad
         for j in range(len(theta.data)):
@@ -103,8 +131,240 @@ def run_momentum(A: np.ndarray, theta0, lr: float, beta: float, steps: int):
         for j in range(len(theta.data)):
             theta.data[j] += v[j]
 
-        losses.append(loss.data[0])
-        traj.append(theta.data.copy())
-        v_traj.append(v.copy())
+        recorder.record(theta.data)
+        v_recorder.record(v)
+
+    return recorder.array, v_recorder.array, losses
+
+
+def run_optimizer(A: np.ndarray, theta0, make_opt, steps: int, monitor=None, recorder=None):
+    """
+    Same loop as run_gd, but the update is delegated to any optimizer exposing
+    step()/zero_grad(), e.g. make_opt = lambda ps: Adam(ps, lr=0.1).
+
+    Optimizers with needs_closure=True (e.g. LBFGS) get a closure that
+    re-evaluates the loss and gradient at the current theta.
+
+    monitor: optional StopMonitor, checked on the loss the optimizer reports
+    for each step and the gradient norm at the same theta. As in run_gd, traj
+    and losses both end at the theta the monitor fired on.
+    recorder: as in run_gd.
+    """
+    theta = Parameter(theta0)
+    opt = make_opt([theta])
+    if recorder is None:
+        recorder = TrajectoryRecorder(steps, len(theta.data))
+    recorder.record(theta.data)
+    losses = np.empty(steps)
+
+    # ||grad|| at every theta the closure was evaluated at since the last
+    # step, so the monitor gets the gradient at the pre-step theta without an
+    # extra evaluation (L-BFGS reuses the one from its previous line search)
+    grad_norms = {}
+
+    def closure():
+        loss = quadratic_loss(A, theta)
+        loss.zero_grad_graph()
+        loss.backprop()
+        grad_norms[tuple(theta.data)] = float(np.linalg.norm(theta.grad))
+        return loss
+
+    for t in range(steps):
+        if getattr(opt, "needs_closure", False):
+            # The step moves theta; the reported loss is from before it
+            before = tuple(theta.data)
+            losses[t] = opt.step(closure)
+            if monitor is not None and monitor.check_norm(losses[t], grad_norms.get(before)):
+                return recorder.array, losses[: t + 1]
+            after = tuple(theta.data)
+            kept = grad_norms.get(after)
+            grad_norms.clear()
+            if kept is not None:
+                grad_norms[after] = kept
+            recorder.record(theta.data)
+            continue
+
+        losses[t] = closure().data[0]
+        if monitor is not None and monitor.check(losses[t], theta.grad):
+            return recorder.array, losses[: t + 1]
+        opt.step()
+        recorder.record(theta.data)
+
+    return recorder.array, losses
+
+
+# ---------- Batched sweeps (no autodiff graph) ----------
+#
+# K runs are stepped together as one (K, n) state. Each row has its own
+# stopping rule (a core.stopping.BatchStopMonitor, by default only non-finite
+# values and blow-ups past max_growth): a row that stops is frozen where it
+# was checked -- its trajectory repeats that state and its losses after the
+# stop step are NaN -- and drops out of the working set, so it stops costing
+# compute and never iterates on inf/NaN. monitor.step / monitor.reason report
+# when and why, per row.
+
+def _heavy_ball(A, theta, lrs, betas, steps, monitor, trajs=None, v_trajs=None, losses=None):
+    """
+    Step the rows of theta (K, n) in place with v <- beta v - lr g,
+    theta <- theta + v (lrs, betas: (K, 1)), filling whichever of trajs,
+    v_trajs (K, steps+1, n) and losses (K, steps) are given. Returns v.
+    """
+    K = len(theta)
+    v = np.zeros_like(theta)
+    monitor.reset(K)
+    if trajs is not None:
+        trajs[:, 0] = theta
+    if v_trajs is not None:
+        v_trajs[:, 0] = v
+    if losses is not None:
+        losses.fill(np.nan)
+
+    idx = np.arange(K)          # rows still running
+    # Overflow happens at most once per row: the step after, the row is stopped
+    with np.errstate(over="ignore", invalid="ignore"):
+        for t in range(steps):
+            if idx.size == 0:
+                if trajs is not None:
+                    trajs[:, t + 1:] = theta[:, None]
+                if v_trajs is not None:
+                    v_trajs[:, t + 1:] = v[:, None]
+                break
+            rows = slice(None) if idx.size == K else idx
+            th = theta[rows]
+            g = th @ A.T
+            loss = 0.5 * np.einsum("ki,ki->k", th, g)
+            if losses is not None:
+                losses[rows, t] = loss
+
+            stopped = monitor.check_norm(loss, np.sqrt(np.einsum("ki,ki->k", g, g)), idx)
+            if stopped.any():
+                keep = ~stopped
+                idx, g = idx[keep], g[keep]
+                rows = idx
+
+            v[rows] = betas[rows] * v[rows] - lrs[rows] * g
+            theta[rows] += v[rows]
+            if trajs is not None:
+                trajs[:, t + 1] = theta
+            if v_trajs is not None:
+                v_trajs[:, t + 1] = v
+    return v
+
+
+def _rows(theta0, *per_row):
+    """theta (K, n) and (K, 1) columns of per-row values, broadcast to a common K."""
+    theta0 = np.asarray(theta0, dtype=float)
+    cols = [np.asarray(x, dtype=float).reshape(-1) for x in per_row]
+    K, = np.broadcast_shapes(theta0.shape[:-1], *(c.shape for c in cols))
+    theta = np.broadcast_to(theta0, (K, theta0.shape[-1])).copy()
+    return theta, [np.broadcast_to(c, (K,)).reshape(-1, 1) for c in cols]
+
+
+def sweep_gd(A: np.ndarray, theta0, lrs, steps: int, monitor=None):
+    """
+    Run GD for K learning rates at once as one batched array computation.
+
+    All K states are stepped together: Theta (K, n) <- Theta - lr[:, None] * Theta A^T.
+    theta0 is one (n,) start for every row or (K, n) starts, broadcast
+    against lrs. Returns (trajs (K, steps+1, n), losses (K, steps)) with the
+    same per-run conventions as run_gd; rows stopped by monitor (default
+    BatchStopMonitor()) are frozen as described above.
+    """
+    A = np.asarray(A, dtype=float)
+    theta, (lrs,) = _rows(theta0, lrs)
+    monitor = BatchStopMonitor() if monitor is None else monitor
+
+    trajs = np.empty((len(theta), steps + 1, theta.shape[1]))
+    losses = np.empty((len(theta), steps))
+    # beta = 0: v = -lr g exactly, so the update is bit-identical to theta - lr g
+    _heavy_ball(A, theta, lrs, np.zeros_like(lrs), steps, monitor, trajs=trajs, losses=losses)
+    return trajs, losses
+
+
+def sweep_momentum(A: np.ndarray, theta0, lrs, betas, steps: int, monitor=None,
+                   record_trajs: bool = True, record_losses: bool = True):
+    """
+    Batched heavy-ball momentum over K runs; theta0 ((n,) or (K, n)), lrs and
+    betas are per-row and broadcast against each other (e.g. one beta for
+    many lrs, or one (lr, beta) for many starts). monitor: as in sweep_gd.
+
+    Returns (trajs (K, steps+1, n), v_trajs (K, steps+1, n), losses (K, steps)).
+    record_trajs=False keeps only the final states, trajs and v_trajs of
+    shape (K, 1, n); record_losses=False returns losses None.
+    """
+    A = np.asarray(A, dtype=float)
+    theta, (lrs, betas) = _rows(theta0, lrs, betas)
+    monitor = BatchStopMonitor() if monitor is None else monitor
+
+    K, n = theta.shape
+    trajs = np.empty((K, steps + 1, n)) if record_trajs else None
+    v_trajs = np.empty_like(trajs) if record_trajs else None
+    losses = np.empty((K, steps)) if record_losses else None
+    v = _heavy_ball(A, theta, lrs, betas, steps, monitor, trajs=trajs, v_trajs=v_trajs, losses=losses)
+    if not record_trajs:
+        trajs, v_trajs = theta[:, None], v[:, None]
+    return trajs, v_trajs, losses
+
+
+# ---------- Minibatch data loading ----------
+
+class ArrayLoader:
+    """
+    Shuffling minibatch iterator over arrays X (N, d) and y (N, ...).
+
+    Each epoch draws one permutation of the N indices and gathers every batch
+    with np.take into preallocated buffers, so each batch is a contiguous
+    (batch_size, d) array and no per-sample Python objects are made. X and y
+    may be np.memmap arrays larger than RAM.
+
+    The yielded buffers are reused by the next batch: copy them if you keep
+    them. With drop_last=False the final batch of an epoch may be shorter.
+    """
 
-    return np.array(traj), np.array(v_traj), np.array(losses)
+    def __init__(self, X, y, batch_size: int, shuffle: bool = True, drop_last: bool = False, seed=None):
+        if len(X) != len(y):
+            raise ValueError(f"X and y have different lengths: {len(X)} vs {len(y)}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        self.X = X
+        self.y = y
+        self.batch_size = int(batch_size)
+        self.shuffle = bool(shuffle)
+        self.drop_last = bool(drop_last)
+        self.rng = np.random.default_rng(seed)
+
+        self._xb = np.empty((self.batch_size,) + X.shape[1:], dtype=X.dtype)
+        self._yb = np.empty((self.batch_size,) + y.shape[1:], dtype=y.dtype)
+
+    def __len__(self) -> int:
+        n = len(self.X)
+        return n // self.batch_size if self.drop_last else -(-n // self.batch_size)
+
+    def __iter__(self):
+        n = len(self.X)
+        if not self.shuffle:
+            # Contiguous slices are already views: nothing to gather
+            for lo in range(0, len(self) * self.batch_size, self.batch_size):
+                yield self.X[lo: lo + self.batch_size], self.y[lo: lo + self.batch_size]
+            return
+
+        order = self.rng.permutation(n)
+        for lo in range(0, len(self) * self.batch_size, self.batch_size):
+            idx = order[lo: lo + self.batch_size]
+            k = len(idx)
+            np.take(self.X, idx, axis=0, out=self._xb[:k])
+            np.take(self.y, idx, axis=0, out=self._yb[:k])
+            yield self._xb[:k], self._yb[:k]
+
+    def batches(self, steps: int):
+        """Stream exactly `steps` batches, starting new epochs as needed."""
+        if steps > 0 and len(self) == 0:
+            raise ValueError(f"no batches: {len(self.X)} samples, batch_size={self.batch_size}, "
+                             f"drop_last={self.drop_last}")
+        taken = 0
+        while taken < steps:
+            for batch in self:
+                yield batch
+                taken += 1
+                if taken == steps:
+                    return
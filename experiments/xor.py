@@ -0,0 +1,145 @@
+import time
+
+import numpy as np
+
+from core.ops import mul, stack, sub, sum_pop
+from core.optim import GD
+from core.populationNode import PopulationNode
+from models.mlp import MLP
+
+
+# ---------- XOR ensembles ----------
+#
+# Every member of an ensemble is an independent MLP (its own seed) trained on
+# the same four XOR points. All members and all four points go into ONE graph
+# per step:
+#
+#   total = sum_s MSE_s,   MSE_s = 1/4 sum_i (mlp_s(x_i) - y_i)^2
+#
+# Members share no parameters, so d total / d params_s = d MSE_s / d params_s
+# and one backprop + one optimizer step trains all of them at once.
+#
+# A linear model cannot do better than MSE = 0.25 on XOR (it predicts 0.5
+# everywhere), so "escaping the linear-failure regime" is measured as the
+# first step a member's MSE drops below escape_tol (default 0.05).
+
+XOR_X = np.array([[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0]])
+XOR_Y = np.array([0.0, 1.0, 1.0, 0.0])
+LINEAR_MSE = 0.25
+
+# Member s is built with seed SEED_STRIDE * s: MLP derives per-neuron seeds by
+# small offsets, so consecutive seeds would share weights between members.
+SEED_STRIDE = 10_000
+
+
+def ensemble_loss(models, X: np.ndarray = XOR_X, y: np.ndarray = XOR_Y):
+    """(total, per_member) nodes: per_member is the vector of member MSEs, total their sum."""
+    inputs = [PopulationNode(x, requires_grad=False) for x in X.tolist()]
+    targets = y.tolist()
+    member_losses = []
+    for model in models:
+        preds = stack([model(x) for x in inputs])
+        r = sub(preds, targets)
+        member_losses.append(mul(1.0 / len(targets), sum_pop(mul(r, r))))
+    per_member = stack(member_losses)
+    return sum_pop(per_member), per_member
+
+
+def train_ensemble(hidden, activation: str = "tanh", n_seeds: int = 100, steps: int = 500,
+                   lr: float = 0.2, escape_tol: float = 0.05, seed0: int = 0, stop_tol: float = None):
+    """
+    Train n_seeds MLP(2, [*hidden, 1]) on XOR as one ensemble.
+
+    stop_tol: per-member early stopping. A member whose MSE is <= stop_tol is
+    frozen (requires_grad=False) and left out of later graphs, so each step
+    only pays for members still training; its loss stays at the frozen value.
+
+    Returns (losses (steps, n_seeds), escape_step (n_seeds,), seconds); escape_step
+    is -1 for members that never got below escape_tol.
+    """
+    models = [
+        MLP(2, list(hidden) + [1], activation=activation, seed=SEED_STRIDE * (seed0 + s))
+        for s in range(n_seeds)
+    ]
+    params = [p for m in models for p in m.parameters()]
+    opt = GD(params, lr=lr)
+
+    losses = np.empty((steps, n_seeds))
+    running = np.arange(n_seeds)
+    t0 = time.perf_counter()
+    for t in range(steps):
+        if t > 0:
+            losses[t] = losses[t - 1]
+        if running.size == 0:
+            continue
+        opt.zero_grad()
+        total, per_member = ensemble_loss([models[s] for s in running])
+        losses[t, running] = per_member.data
+
+        if stop_tol is not None:
+            done = losses[t, running] <= stop_tol
+            for s in running[done]:
+                for p in models[s].parameters():
+                    p.requires_grad = False
+            running = running[~done]
+
+        total.backprop()
+        opt.step()
+    seconds = time.perf_counter() - t0
+
+    below = losses < escape_tol
+    escape_step = np.where(below.any(axis=0), below.argmax(axis=0), -1)
+    return losses, escape_step, seconds
+
+
+def summarize(name: str, losses, escape_step, seconds) -> None:
+    steps, n_seeds = losses.shape
+    escaped = escape_step >= 0
+    median = f"{np.median(escape_step[escaped]):6.0f}" if escaped.any() else "     -"
+    print(f"{name:<22} escaped {escaped.sum():4d}/{n_seeds}  median step {median}  "
+          f"final MSE med {np.median(losses[-1]):.3f}  "
+          f"{seconds:6.2f}s ({steps * n_seeds / seconds:,.0f} member-steps/s)")
+
+
+def main(n_seeds: int = 32, steps: int = 250):
+    import matplotlib.pyplot as plt
+    from experiments.utils import savefig
+
+    outdir = "outputs/week3"
+    configs = [
+        ((2,), "tanh"),
+        ((4,), "tanh"),
+        ((8,), "tanh"),
+        ((4,), "sigmoid"),
+        ((4,), "relu"),
+    ]
+
+    fig, (ax_cdf, ax_loss) = plt.subplots(1, 2, figsize=(11, 4))
+    for hidden, activation in configs:
+        name = f"{activation} {'x'.join(map(str, hidden))}"
+        # Seeds that have fit XOR (MSE <= 1e-3, past escape_tol) stop training
+        losses, escape_step, seconds = train_ensemble(hidden, activation, n_seeds=n_seeds, steps=steps,
+                                                      stop_tol=1e-3)
+        summarize(name, losses, escape_step, seconds)
+
+        # Fraction of seeds escaped by each step
+        escaped_by = (escape_step[None, :] >= 0) & (escape_step[None, :] <= np.arange(steps)[:, None])
+        ax_cdf.plot(escaped_by.mean(axis=1), label=name)
+        ax_loss.plot(np.median(losses, axis=1), label=name)
+
+    ax_cdf.set_title(f"Experiment 12: XOR escape from linear regime ({n_seeds} seeds)")
+    ax_cdf.set_xlabel("step")
+    ax_cdf.set_ylabel("fraction of seeds with MSE < 0.05")
+    ax_cdf.legend()
+    ax_loss.axhline(LINEAR_MSE, color="gray", ls="--", lw=1, label="best linear")
+    ax_loss.set_yscale("log")
+    ax_loss.set_title("Median MSE over seeds")
+    ax_loss.set_xlabel("step")
+    ax_loss.set_ylabel("MSE (log scale)")
+    ax_loss.legend()
+    savefig(outdir, "12_xor_escape.png")
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    main()
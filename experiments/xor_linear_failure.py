@@ -0,0 +1,50 @@
+import numpy as np
+
+from experiments.xor import LINEAR_MSE, summarize, train_ensemble
+
+
+# ---------- Why XOR needs a nonlinearity ----------
+#
+# Same ensemble harness as experiments/xor.py, three model families:
+#   linear       MLP(2, [1])                        y = w.x + b
+#   deep linear  MLP(2, [4, 1], activation=linear)  still a linear map of x
+#   tanh         MLP(2, [4, 1])
+#
+# Every seed of both linear families ends at MSE = 0.25 (predict 0.5
+# everywhere); depth alone changes the path there, not the endpoint.
+# The deep linear net multiplies N(0, 1) weights, so it needs a smaller lr
+# than the others to avoid diverging.
+
+
+def main(n_seeds: int = 32, steps: int = 250):
+    import matplotlib.pyplot as plt
+    from experiments.utils import savefig
+
+    outdir = "outputs/week3"
+    families = [
+        ("linear", (), "linear", 0.2),
+        ("deep linear 4", (4,), "linear", 0.05),
+        ("tanh 4", (4,), "tanh", 0.2),
+    ]
+
+    fig, axes = plt.subplots(1, len(families), figsize=(13, 4), sharey=True)
+    for ax, (name, hidden, activation, lr) in zip(axes, families):
+        losses, escape_step, seconds = train_ensemble(hidden, activation, n_seeds=n_seeds, steps=steps, lr=lr)
+        summarize(name, losses, escape_step, seconds)
+        print(f"{'':<22} final MSE min over seeds {losses[-1].min():.4f}")
+
+        ax.plot(losses, color="C0", lw=0.5, alpha=0.4)
+        ax.plot(np.median(losses, axis=1), color="k", lw=1.5, label="median")
+        ax.axhline(LINEAR_MSE, color="r", ls="--", lw=1, label="best linear (0.25)")
+        ax.set_yscale("log")
+        ax.set_title(f"{name}, lr={lr} ({n_seeds} seeds)")
+        ax.set_xlabel("step")
+    axes[0].set_ylabel("MSE (log scale)")
+    axes[0].legend()
+    fig.suptitle("Experiment 13: Linear models cannot fit XOR")
+    savefig(outdir, "13_xor_linear_failure.png")
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
-from learning_dynamics.experiments.utils import make_quadratic_A, eigs, run_gd, savefig
+from experiments.utils import make_quadratic_A, eigs, run_gd
+from experiments.cache import ResultCache
+from utils.plotting import new_figure, plot_curve, plot_trajectory, save
 
 
 def main():
     outdir = "outputs/week3"
+    cache = ResultCache()
+    cached_run_gd = cache.wrap(run_gd)
 
     # Very anisotropic valley produces zig-zag
     A = make_quadratic_A(l1=80.0, l2=1.0, rot_rad=np.deg2rad(35))
@@ -19,25 +22,23 @@ def main():
     lr = 0.02
     print(f"eta_crit=2/lmax≈{2/lmax:.4f}, using lr={lr:.4f}")
 
-    traj, losses = run_gd(A, theta0, lr=lr, steps=steps)
-
-    plt.figure()
-    plt.plot(traj[:, 0], traj[:, 1], marker="o", markersize=2)
-    plt.title("Experiment 3: Zig-zag dynamics in a narrow valley (GD)")
-    plt.xlabel("theta1")
-    plt.ylabel("theta2")
-    plt.axis("equal")
-    savefig(outdir, "03_zigzag_dynamics_trajectory.png")
-    plt.close()
-
-    plt.figure()
-    plt.plot(losses)
-    plt.yscale("log")
-    plt.title("Experiment 3: Loss over time (GD)")
-    plt.xlabel("step")
-    plt.ylabel("loss (log scale)")
-    savefig(outdir, "03_zigzag_dynamics_loss.png")
-    plt.close()
+    traj, losses = cached_run_gd(A, theta0, lr=lr, steps=steps)
+
+    fig, ax = new_figure()
+    plot_trajectory(ax, traj, marker="o", markersize=2)
+    ax.set_title("Experiment 3: Zig-zag dynamics in a narrow valley (GD)")
+    ax.set_xlabel("theta1")
+    ax.set_ylabel("theta2")
+    ax.axis("equal")
+    save(fig, outdir, "03_zigzag_dynamics_trajectory.png")
+
+    fig, ax = new_figure()
+    plot_curve(ax, losses)
+    ax.set_yscale("log")
+    ax.set_title("Experiment 3: Loss over time (GD)")
+    ax.set_xlabel("step")
+    ax.set_ylabel("loss (log scale)")
+    save(fig, outdir, "03_zigzag_dynamics_loss.png")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+# learning_dynamics/core/line_search.py
+
+"""
+One-dimensional step-size searches along a direction d.
+
+Each search works on the restriction of the loss to a line:
+
+  phi(t) = L(theta + t d),   phi'(t) = grad L(theta + t d) . d
+
+and is handed a callable phi(t) -> (value, slope). Every call of phi is one
+forward (+ backward) evaluation, so each search takes a hard cap max_evals.
+
+This file contains *step-size rules*, not optimizers; core/optim.py wires
+them into GD/Momentum (LineSearch) and the quasi-Newton methods.
+"""
+
+import math
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+
+Phi = Callable[[float], Tuple[float, float]]
+
+
+def armijo(
+    phi: Phi,
+    f0: float,
+    slope0: float,
+    t0: float,
+    c1: float = 1e-4,
+    shrink: float = 0.5,
+    max_evals: int = 20,
+) -> Tuple[Optional[float], float, int]:
+    """
+    Backtracking line search: shrink t until the sufficient-decrease condition
+
+      phi(t) <= phi(0) + c1 * t * phi'(0)
+
+    holds. Returns (t, phi(t), n_evals).
+
+    If the condition is never met within max_evals, the best trial that still
+    lowered the loss is returned; if none did, t is None.
+    """
+    t = float(t0)
+    best_t, best_f = None, f0
+    for k in range(max_evals):
+        f, _ = phi(t)
+        if math.isfinite(f):
+            if f <= f0 + c1 * t * slope0:
+                return t, f, k + 1
+            if f < best_f:
+                best_t, best_f = t, f
+        t *= shrink
+    return best_t, best_f, max_evals
+
+
+def wolfe(
+    phi: Phi,
+    f0: float,
+    slope0: float,
+    t0: float,
+    c1: float = 1e-4,
+    c2: float = 0.9,
+    grow: float = 2.0,
+    max_evals: int = 20,
+) -> Tuple[Optional[float], float, int]:
+    """
+    Strong Wolfe line search (bracketing + bisection zoom):
+
+      sufficient decrease:  phi(t) <= phi(0) + c1 * t * phi'(0)
+      curvature:            |phi'(t)| <= c2 * |phi'(0)|
+
+    The curvature condition rejects steps that are too short, which Armijo
+    alone cannot do. Returns (t, phi(t), n_evals); falls back like armijo when
+    the budget runs out.
+    """
+    n = 0
+    best_t, best_f = None, f0
+
+    def evaluate(t):
+        nonlocal n, best_t, best_f
+        n += 1
+        f, s = phi(t)
+        if math.isfinite(f) and f < best_f:
+            best_t, best_f = t, f
+        return f, s
+
+    def zoom(lo, f_lo, hi):
+        # Invariant: lo satisfies sufficient decrease, the minimizer lies between lo and hi
+        while n < max_evals:
+            t = 0.5 * (lo + hi)
+            f, s = evaluate(t)
+            if not math.isfinite(f) or f > f0 + c1 * t * slope0 or f >= f_lo:
+                hi = t
+                continue
+            if abs(s) <= -c2 * slope0:
+                return t, f
+            if s * (hi - lo) >= 0.0:
+                hi = lo
+            lo, f_lo = t, f
+        return None
+
+    t_prev, f_prev = 0.0, f0
+    t = float(t0)
+    while n < max_evals:
+        f, s = evaluate(t)
+        if not math.isfinite(f) or f > f0 + c1 * t * slope0 or (n > 1 and f >= f_prev):
+            found = zoom(t_prev, f_prev, t)
+            break
+        if abs(s) <= -c2 * slope0:
+            return t, f, n
+        if s >= 0.0:
+            found = zoom(t, f, t_prev)
+            break
+        t_prev, f_prev = t, f
+        t *= grow
+    else:
+        found = None
+
+    if found is not None:
+        return found[0], found[1], n
+    return best_t, best_f, n
+
+
+def exact_quadratic(A: np.ndarray, x: np.ndarray, d: np.ndarray, b: np.ndarray = None) -> float:
+    """
+    Exact minimizer along d of the quadratic L(x) = 1/2 x^T A x - b^T x:
+
+      t* = -(A x - b) . d / (d^T A d)
+
+    No extra loss evaluations. For d = -grad this is steepest descent with
+    exact line search. Returns 0.0 when d has no positive curvature.
+    """
+    A = np.asarray(A, dtype=float)
+    g = A @ x if b is None else A @ x - np.asarray(b, dtype=float)
+    dAd = float(d @ (A @ d))
+    if dAd <= 0.0:
+        return 0.0
+    return -float(g @ d) / dAd
@@ -1,6 +1,75 @@
 # learning_dynamics/core/optim.py
 
-from typing import List
+from itertools import chain
+from typing import List, Sequence
+
+import numpy as np
+
+from core import line_search
+
+
+# -------------------------
+# Helpers (multi-tensor / "foreach" kernels)
+# -------------------------
+
+def _active(params: Sequence) -> List:
+    """Parameters that should be updated this step."""
+    return [p for p in params if getattr(p, "requires_grad", True)]
+
+
+def _gather(params: Sequence, attr: str) -> np.ndarray:
+    """
+    Concatenate .data or .grad of several parameters into one flat float64 array.
+
+    Filled straight from the lists at C level (no per-parameter temporaries).
+    """
+    n = sum(len(p.data) for p in params)
+    return np.fromiter(chain.from_iterable(getattr(p, attr) for p in params), dtype=float, count=n)
+
+
+def _check_grads(params: Sequence) -> None:
+    for p in params:
+        if len(p.grad) != len(p.data):
+            raise ValueError("Param.grad and Param.data must match in length.")
+
+
+def _offsets(params: Sequence) -> np.ndarray:
+    """Start/end offsets of each parameter inside a flat state buffer."""
+    return np.concatenate([[0], np.cumsum([len(p.data) for p in params])]).astype(int)
+
+
+def _selection(params: Sequence, offsets: np.ndarray):
+    """
+    Index of the trainable entries in a flat state buffer.
+
+    A plain slice (a view) when every parameter trains, otherwise an index array,
+    so frozen parameters keep their optimizer state untouched.
+    """
+    active = [getattr(p, "requires_grad", True) for p in params]
+    if all(active):
+        return slice(None)
+    return np.concatenate(
+        [np.arange(offsets[i], offsets[i + 1]) for i, a in enumerate(active) if a]
+        + [np.zeros(0, dtype=int)]
+    )
+
+
+def _views(buf: np.ndarray, offsets: np.ndarray) -> List[np.ndarray]:
+    """Per-parameter views into a flat buffer."""
+    return [buf[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+
+
+def _scatter(params: Sequence, flat: np.ndarray) -> None:
+    """
+    Write a flat array back into each parameter's .data list (in place, so the
+    list objects referenced elsewhere stay the same).
+    """
+    offset = 0
+    for p in params:
+        n = len(p.data)
+        p.data[:] = flat[offset:offset + n].tolist()
+        offset += n
+
 
 
 class GD:
@@ -12,18 +81,43 @@ class GD:
       - .grad (list[float])
       - .step(lr)
       - .zero_grad()
+
+    foreach=True updates all parameters with a handful of array operations
+    (gather -> update -> scatter) instead of a Python loop per element. For GD
+    this is SLOWER than the loop (0.5-0.8x in
+    experiments/optimizer_foreach_benchmark.py): .data and .grad are lists, so
+    gathering both and scattering the result back each cost about as much as
+    the loop's single multiply-add per element. It is kept for parity with
+    Momentum (where the velocity lives in the flat buffer and foreach is ~2x
+    faster), but is off by default and should stay off.
     """
 
-    def __init__(self, params: List, lr: float):
+    def __init__(self, params: List, lr: float, foreach: bool = False):
         self.params = list(params)
         self.lr = float(lr)
+        self.foreach = bool(foreach)
 
     def step(self) -> None:
+        if self.foreach:
+            self._step_foreach()
+            return
+
         for p in self.params:
             # Let Parameter.step handle requires_grad, but it's fine to guard here too.
             if getattr(p, "requires_grad", True):
                 p.step(self.lr)
 
+    def _step_foreach(self) -> None:
+        params = _active(self.params)
+        if not params:
+            return
+        _check_grads(params)
+
+        # theta <- theta - lr * grad, over one flat buffer
+        theta = _gather(params, "data")
+        theta -= self.lr * _gather(params, "grad")
+        _scatter(params, theta)
+
     def zero_grad(self) -> None:
         for p in self.params:
             p.zero_grad()
@@ -37,17 +131,31 @@ class Momentum:
       theta <- theta + v
 
     Stored velocity has same shape as each parameter's .data.
+
+    foreach=True keeps all velocities in one flat array (self.v[i] are views
+    into it) and updates every parameter with a few array operations.
     """
 
-    def __init__(self, params: List, lr: float, beta: float = 0.9):
+    def __init__(self, params: List, lr: float, beta: float = 0.9, foreach: bool = False):
         self.params = list(params)
         self.lr = float(lr)
         self.beta = float(beta)
+        self.foreach = bool(foreach)
 
-        # Velocity buffers: one list per parameter
-        self.v = [[0.0 for _ in p.data] for p in self.params]
+        if self.foreach:
+            # One flat velocity buffer; self.v[i] is a view of parameter i's slice
+            self._offsets = _offsets(self.params)
+            self._v = np.zeros(int(self._offsets[-1]), dtype=float)
+            self.v = _views(self._v, self._offsets)
+        else:
+            # Velocity buffers: one list per parameter
+            self.v = [[0.0 for _ in p.data] for p in self.params]
 
     def step(self) -> None:
+        if self.foreach:
+            self._step_foreach()
+            return
+
         for i, p in enumerate(self.params):
             if not getattr(p, "requires_grad", True):
                 continue
@@ -61,6 +169,644 @@ class Momentum:
                 self.v[i][j] = self.beta * self.v[i][j] - self.lr * p.grad[j]
                 p.data[j] += self.v[i][j]
 
+    def _step_foreach(self) -> None:
+        params = _active(self.params)
+        if not params:
+            return
+        _check_grads(params)
+        sel = _selection(self.params, self._offsets)
+
+        # v = beta*v - lr*grad
+        # p = p + v
+        v = self.beta * self._v[sel] - self.lr * _gather(params, "grad")
+        self._v[sel] = v
+        _scatter(params, _gather(params, "data") + v)
+
+    def zero_grad(self) -> None:
+        for p in self.params:
+            p.zero_grad()
+
+
+class Nesterov:
+    """
+    Nesterov accelerated gradient (look-ahead momentum), in the form that only
+    needs the gradient at the current iterate:
+
+      v <- beta*v - lr*grad
+      theta <- theta + beta*v - lr*grad
+
+    Equivalent to evaluating the gradient at the look-ahead point theta + beta*v
+    after a change of variables. Velocities live in one flat buffer.
+    """
+
+    def __init__(self, params: List, lr: float, beta: float = 0.9):
+        self.params = list(params)
+        self.lr = float(lr)
+        self.beta = float(beta)
+
+        self._offsets = _offsets(self.params)
+        self._v = np.zeros(int(self._offsets[-1]), dtype=float)
+        self.v = _views(self._v, self._offsets)
+
+    def step(self) -> None:
+        params = _active(self.params)
+        if not params:
+            return
+        _check_grads(params)
+        sel = _selection(self.params, self._offsets)
+
+        g = _gather(params, "grad")
+        v = self.beta * self._v[sel] - self.lr * g
+        self._v[sel] = v
+        _scatter(params, _gather(params, "data") + self.beta * v - self.lr * g)
+
+    def zero_grad(self) -> None:
+        for p in self.params:
+            p.zero_grad()
+
+
+class RMSProp:
+    """
+    RMSProp: per-coordinate step sizes from a running mean of squared gradients.
+
+      s <- rho*s + (1 - rho)*grad^2
+      theta <- theta - lr * grad / (sqrt(s) + eps)
+
+    Rescaling each coordinate by its gradient magnitude partially undoes
+    ill-conditioning that is aligned with the parameter axes.
+    """
+
+    def __init__(self, params: List, lr: float = 1e-2, rho: float = 0.9, eps: float = 1e-8):
+        self.params = list(params)
+        self.lr = float(lr)
+        self.rho = float(rho)
+        self.eps = float(eps)
+
+        self._offsets = _offsets(self.params)
+        self._sq_avg = np.zeros(int(self._offsets[-1]), dtype=float)
+        self.sq_avg = _views(self._sq_avg, self._offsets)
+
+    def step(self) -> None:
+        params = _active(self.params)
+        if not params:
+            return
+        _check_grads(params)
+        sel = _selection(self.params, self._offsets)
+
+        g = _gather(params, "grad")
+        s = self.rho * self._sq_avg[sel] + (1.0 - self.rho) * g * g
+        self._sq_avg[sel] = s
+        _scatter(params, _gather(params, "data") - self.lr * g / (np.sqrt(s) + self.eps))
+
+    def zero_grad(self) -> None:
+        for p in self.params:
+            p.zero_grad()
+
+
+class Adam:
+    """
+    Adam: momentum on the gradient plus RMSProp-style scaling, with bias correction.
+
+      m <- beta1*m + (1 - beta1)*grad
+      v <- beta2*v + (1 - beta2)*grad^2
+      m_hat = m / (1 - beta1^t),  v_hat = v / (1 - beta2^t)
+      theta <- theta - lr * m_hat / (sqrt(v_hat) + eps)
+    """
+
+    def __init__(
+        self,
+        params: List,
+        lr: float = 1e-3,
+        beta1: float = 0.9,
+        beta2: float = 0.999,
+        eps: float = 1e-8,
+    ):
+        self.params = list(params)
+        self.lr = float(lr)
+        self.beta1 = float(beta1)
+        self.beta2 = float(beta2)
+        self.eps = float(eps)
+        self.t = 0
+
+        self._offsets = _offsets(self.params)
+        self._m = np.zeros(int(self._offsets[-1]), dtype=float)
+        self._v = np.zeros(int(self._offsets[-1]), dtype=float)
+        self.m = _views(self._m, self._offsets)
+        self.v = _views(self._v, self._offsets)
+
+    def step(self) -> None:
+        params = _active(self.params)
+        if not params:
+            return
+        _check_grads(params)
+        sel = _selection(self.params, self._offsets)
+
+        self.t += 1
+        g = _gather(params, "grad")
+        m = self.beta1 * self._m[sel] + (1.0 - self.beta1) * g
+        v = self.beta2 * self._v[sel] + (1.0 - self.beta2) * g * g
+        self._m[sel] = m
+        self._v[sel] = v
+
+        m_hat = m / (1.0 - self.beta1 ** self.t)
+        v_hat = v / (1.0 - self.beta2 ** self.t)
+        _scatter(params, _gather(params, "data") - self.lr * m_hat / (np.sqrt(v_hat) + self.eps))
+
+    def zero_grad(self) -> None:
+        for p in self.params:
+            p.zero_grad()
+
+
+class AdaGrad:
+    """
+    AdaGrad: per-coordinate step sizes from the accumulated sum of squared gradients.
+
+      G <- G + grad^2
+      theta <- theta - lr * grad / (sqrt(G) + eps)
+
+    Effective step sizes only shrink, so no schedule is needed on convex problems.
+    """
+
+    def __init__(self, params: List, lr: float = 1e-2, eps: float = 1e-10):
+        self.params = list(params)
+        self.lr = float(lr)
+        self.eps = float(eps)
+
+        self._offsets = _offsets(self.params)
+        self._sum_sq = np.zeros(int(self._offsets[-1]), dtype=float)
+        self.sum_sq = _views(self._sum_sq, self._offsets)
+
+    def step(self) -> None:
+        params = _active(self.params)
+        if not params:
+            return
+        _check_grads(params)
+        sel = _selection(self.params, self._offsets)
+
+        g = _gather(params, "grad")
+        G = self._sum_sq[sel] + g * g
+        self._sum_sq[sel] = G
+        _scatter(params, _gather(params, "data") - self.lr * g / (np.sqrt(G) + self.eps))
+
     def zero_grad(self) -> None:
         for p in self.params:
             p.zero_grad()
+
+
+def _loss_value(loss) -> float:
+    """Closures may return the loss node or a plain float."""
+    return float(loss.data[0]) if hasattr(loss, "data") else float(loss)
+
+
+def _evaluate(params: Sequence, closure):
+    """Zero grads, run the closure, return (loss, flat grad) at the current .data."""
+    for p in params:
+        p.zero_grad()
+    f = _loss_value(closure())
+    _check_grads(params)
+    return f, _gather(params, "grad")
+
+
+def _line_phi(params: Sequence, closure, x: np.ndarray, d: np.ndarray):
+    """
+    phi(t) = (L(x + t d), grad(x + t d) . d) for core.line_search, plus a dict
+    remembering the flat gradient at every trial t.
+    """
+    grads = {}
+
+    def phi(t):
+        _scatter(params, x + t * d)
+        f, g = _evaluate(params, closure)
+        grads[t] = g
+        return f, float(g @ d)
+
+    return phi, grads
+
+
+def _line_step(params: Sequence, closure, x, f, g, d, t: float, c1: float, max_ls: int,
+               method: str = "armijo", c2: float = 0.9):
+    """
+    Search a step length along d from x ("armijo" or "wolfe") and move params there.
+
+    Returns (t, f_new, g_new, n_evals). If no trial decreased the loss, params
+    are restored to x and t is None.
+    """
+    phi, grads = _line_phi(params, closure, x, d)
+    if method == "armijo":
+        t, f_new, n = line_search.armijo(phi, f, float(g @ d), t, c1=c1, max_evals=max_ls)
+    elif method == "wolfe":
+        t, f_new, n = line_search.wolfe(phi, f, float(g @ d), t, c1=c1, c2=c2, max_evals=max_ls)
+    else:
+        raise ValueError(f"Unknown line search method: {method!r}")
+
+    if t is None:
+        _scatter(params, x)
+        return None, f, g, n
+    _scatter(params, x + t * d)
+    return t, f_new, grads[t], n
+
+
+class LBFGS:
+    """
+    Limited-memory BFGS (quasi-Newton) for deterministic, full-batch losses.
+
+    Keeps the last `history_size` curvature pairs
+      s_k = theta_{k+1} - theta_k,   y_k = grad_{k+1} - grad_k
+    in a fixed-size ring buffer (two (m, n) arrays), and builds the search
+    direction d = -H_k grad with the two-loop recursion over flat parameter
+    vectors. The step length along d comes from a line search ("armijo"
+    backtracking, or "wolfe" which also guarantees s.y > 0).
+
+    step(closure) needs to re-evaluate the loss at trial points:
+      closure() -> builds the graph at the current .data, calls .backprop(),
+                   returns the loss node (or float).
+    Grads are zeroed by the optimizer before every closure call.
+    """
+
+    needs_closure = True
+
+    def __init__(
+        self,
+        params: List,
+        lr: float = 1.0,
+        history_size: int = 10,
+        ls_method: str = "armijo",
+        max_ls: int = 20,
+        c1: float = 1e-4,
+        c2: float = 0.9,
+    ):
+        if history_size < 1:
+            raise ValueError("history_size must be >= 1")
+        if ls_method not in ("armijo", "wolfe"):
+            raise ValueError(f"Unknown line search method: {ls_method!r}")
+        self.params = list(params)
+        self.lr = float(lr)
+        self.history_size = int(history_size)
+        self.ls_method = ls_method
+        self.max_ls = int(max_ls)
+        self.c1 = float(c1)
+        self.c2 = float(c2)
+
+        # Sized for the params trainable now; step() resizes (and drops the
+        # history) if requires_grad is toggled later
+        self._resize(_active(self.params))
+        self._rho = np.zeros(self.history_size, dtype=float)
+        self._head = 0      # next slot to overwrite
+        self._len = 0       # number of valid pairs
+
+        # (theta, loss, grad) at the last accepted point, reused by the next step
+        self._state = None
+        self.n_evals = 0
+
+    def _direction(self, g: np.ndarray) -> np.ndarray:
+        """Two-loop recursion: returns -H g using the stored pairs (newest first)."""
+        q = g.copy()
+        order = [(self._head - 1 - k) % self.history_size for k in range(self._len)]
+        alpha = np.zeros(self._len, dtype=float)
+
+        for k, i in enumerate(order):
+            alpha[k] = self._rho[i] * (self._S[i] @ q)
+            q -= alpha[k] * self._Y[i]
+
+        if self._len:
+            # Initial Hessian guess H0 = gamma * I from the newest pair
+            i = order[0]
+            q *= (self._S[i] @ self._Y[i]) / (self._Y[i] @ self._Y[i])
+
+        for k, i in reversed(list(enumerate(order))):
+            beta = self._rho[i] * (self._Y[i] @ q)
+            q += (alpha[k] - beta) * self._S[i]
+
+        return -q
+
+    def _push(self, s: np.ndarray, y: np.ndarray) -> None:
+        sy = float(s @ y)
+        if sy <= 1e-10:
+            return      # curvature condition violated: skip to keep H positive definite
+        self._S[self._head] = s
+        self._Y[self._head] = y
+        self._rho[self._head] = 1.0 / sy
+        self._head = (self._head + 1) % self.history_size
+        self._len = min(self._len + 1, self.history_size)
+
+    def reset(self) -> None:
+        """Drop all curvature pairs (e.g. after the loss function changed)."""
+        self._head = 0
+        self._len = 0
+        self._state = None
+
+    def _resize(self, params) -> None:
+        """(Re)allocate the history for these trainable params; old pairs no longer apply."""
+        self._layout = [(id(p), len(p.data)) for p in params]
+        n = sum(size for _, size in self._layout)
+        self._S = np.zeros((self.history_size, n), dtype=float)
+        self._Y = np.zeros((self.history_size, n), dtype=float)
+        self.reset()
+
+    def step(self, closure) -> float:
+        params = _active(self.params)
+        if not params:
+            return _loss_value(closure())
+
+        if [(id(p), len(p.data)) for p in params] != self._layout:
+            self._resize(params)
+        x = _gather(params, "data")
+        if self._state is not None and np.array_equal(self._state[0], x):
+            _, f, g = self._state
+        else:
+            f, g = _evaluate(params, closure)
+            self.n_evals += 1
+
+        d = self._direction(g)
+        gd = float(g @ d)
+        if gd >= 0.0:
+            # Not a descent direction (stale curvature): restart from steepest descent
+            self.reset()
+            d = -g
+            gd = float(g @ d)
+        if gd == 0.0:
+            self._state = (x, f, g)
+            return f
+
+        # First iteration has no curvature info: keep the step length O(1)
+        t = self.lr if self._len else self.lr * min(1.0, 1.0 / float(np.abs(g).sum()))
+
+        t, f_new, g_new, n = _line_step(
+            params, closure, x, f, g, d, t, self.c1, self.max_ls, self.ls_method, self.c2
+        )
+        self.n_evals += n
+        if t is None:
+            # No progress: forget the curvature history
+            self.reset()
+            self._state = (x, f, g)
+            return f
+
+        self._push(t * d, g_new - g)
+        self._state = (x + t * d, f_new, g_new)
+        return f
+
+    def zero_grad(self) -> None:
+        for p in self.params:
+            p.zero_grad()
+
+
+def hvp(params: Sequence, closure, v: np.ndarray, eps: float = None) -> np.ndarray:
+    """
+    Hessian-vector product H v from gradients of the autodiff engine:
+
+      H v ~= (grad(theta + eps v) - grad(theta - eps v)) / (2 eps)
+
+    The engine's backward rules are first-order (they do not build a graph of
+    the gradient), so the product is taken as a directional derivative of the
+    gradient: two backward passes, no Hessian is ever formed. Central
+    differences are exact for quadratic losses up to rounding.
+
+    Leaves params (and their .grad) as they were.
+    """
+    x = _gather(params, "data")
+    vnorm = float(np.linalg.norm(v))
+    if vnorm == 0.0:
+        return np.zeros_like(v)
+    if eps is None:
+        # cbrt(machine eps) balances truncation O(eps^2) against rounding O(1/eps)
+        eps = np.cbrt(np.finfo(float).eps) * (1.0 + float(np.linalg.norm(x))) / vnorm
+
+    grads_before = [list(p.grad) for p in params]
+    _scatter(params, x + eps * v)
+    _, g_plus = _evaluate(params, closure)
+    _scatter(params, x - eps * v)
+    _, g_minus = _evaluate(params, closure)
+
+    _scatter(params, x)
+    for p, gb in zip(params, grads_before):
+        p.grad = gb
+    return (g_plus - g_minus) / (2.0 * eps)
+
+
+class NewtonCG:
+    """
+    Truncated Newton (Hessian-free) optimizer.
+
+    Each step approximately solves the Newton system
+      H p = -grad
+    with conjugate gradient, touching H only through Hessian-vector products
+    (see hvp). CG stops early when the residual falls below the forcing term
+      ||r|| <= eta * ||grad||,   eta = min(0.5, sqrt(||grad|| / ||grad_0||))
+    (loose solves far from the minimum, superlinear convergence near it;
+    pass cg_tol to fix eta instead), or when it meets non-positive curvature. The step length along p comes
+    from Armijo backtracking starting at lr (1.0 = full Newton step).
+
+    On a quadratic, CG converges in at most n iterations regardless of the
+    condition number, which is where GD zig-zags.
+    """
+
+    needs_closure = True
+
+    def __init__(
+        self,
+        params: List,
+        lr: float = 1.0,
+        max_cg_iter: int = 50,
+        cg_tol: float = None,
+        max_ls: int = 20,
+        c1: float = 1e-4,
+    ):
+        self.params = list(params)
+        self.lr = float(lr)
+        self.max_cg_iter = int(max_cg_iter)
+        self.cg_tol = None if cg_tol is None else float(cg_tol)
+        self.max_ls = int(max_ls)
+        self.c1 = float(c1)
+
+        self._g0_norm = None    # gradient norm at the first step (scale for eta)
+        self.n_evals = 0
+        self.n_hvp = 0
+
+    def _cg(self, params, closure, g: np.ndarray) -> np.ndarray:
+        """Approximately solve H p = -g."""
+        gnorm = float(np.linalg.norm(g))
+        if self._g0_norm is None:
+            self._g0_norm = gnorm
+        eta = self.cg_tol if self.cg_tol is not None else min(0.5, np.sqrt(gnorm / self._g0_norm))
+        tol = eta * gnorm
+
+        p = np.zeros_like(g)
+        r = -g.copy()           # residual of H p = -g at p = 0
+        d = r.copy()
+        rr = float(r @ r)
+
+        for i in range(self.max_cg_iter):
+            Hd = hvp(params, closure, d)
+            self.n_hvp += 1
+            self.n_evals += 2
+
+            dHd = float(d @ Hd)
+            if dHd <= 0.0:
+                # Negative curvature: fall back to steepest descent on the first iteration
+                return -g if i == 0 else p
+
+            alpha = rr / dHd
+            p += alpha * d
+            r -= alpha * Hd
+            rr_new = float(r @ r)
+            if np.sqrt(rr_new) <= tol:
+                break
+            d = r + (rr_new / rr) * d
+            rr = rr_new
+
+        return p
+
+    def step(self, closure) -> float:
+        params = _active(self.params)
+        if not params:
+            return _loss_value(closure())
+
+        x = _gather(params, "data")
+        f, g = _evaluate(params, closure)
+        self.n_evals += 1
+        if not np.any(g):
+            return f
+
+        d = self._cg(params, closure, g)
+        if float(g @ d) >= 0.0:
+            d = -g
+
+        _, _, _, n = _line_step(params, closure, x, f, g, d, self.lr, self.c1, self.max_ls)
+        self.n_evals += n
+        return f
+
+    def zero_grad(self) -> None:
+        for p in self.params:
+            p.zero_grad()
+
+
+class LineSearch:
+    """
+    Step-size control for GD / Momentum: each step searches a step length t
+    along the wrapped optimizer's own update direction and applies it.
+
+      GD:        d = -grad                      theta <- theta + t d
+      Momentum:  d = (beta/lr) v - grad         v <- t d,  theta <- theta + v
+
+    For Momentum, d is the heavy-ball update beta*v - lr*grad divided by the
+    current lr, so t = lr reproduces the plain update. If d is not a descent
+    direction (the velocity points uphill), the velocity is reset and
+    d = -grad. After a step, the optimizer's lr is the accepted t.
+
+    method:
+      - "armijo": backtracking from the previous accepted lr * grow
+      - "wolfe":  strong Wolfe conditions (can also lengthen the step)
+      - "exact":  t* = -g.d / d^T A d for L = 1/2 theta^T A theta; needs A,
+                  costs no extra evaluations
+
+    At most max_evals extra forward/backward evaluations per step. If no
+    trial decreases the loss, the step is skipped and the next search starts
+    below the smallest step this one tried.
+
+    Other optimizers keep state (second moments, ...) that a search along
+    one direction cannot account for, so they are rejected.
+    """
+
+    needs_closure = True
+
+    def __init__(
+        self,
+        optimizer,
+        method: str = "armijo",
+        A=None,
+        max_evals: int = 10,
+        c1: float = 1e-4,
+        c2: float = 0.9,
+        grow: float = 2.0,
+    ):
+        if method not in ("armijo", "wolfe", "exact"):
+            raise ValueError(f"Unknown line search method: {method!r}")
+        if method == "exact" and A is None:
+            raise ValueError("method='exact' needs the quadratic form A")
+        if type(optimizer) not in (GD, Momentum):
+            raise TypeError(f"LineSearch supports GD and Momentum, not {type(optimizer).__name__}")
+
+        self.optimizer = optimizer
+        self.params = optimizer.params
+        self.method = method
+        self.A = None if A is None else np.asarray(A, dtype=float)
+        self.max_evals = int(max_evals)
+        self.c1 = float(c1)
+        self.c2 = float(c2)
+        self.grow = float(grow)
+
+        self.lr = float(optimizer.lr)   # last accepted step size
+        self.n_evals = 0
+
+    def _velocity(self) -> np.ndarray:
+        """Momentum's velocity for the trainable params, flat (None for GD)."""
+        opt = self.optimizer
+        if not isinstance(opt, Momentum):
+            return None
+        if opt.foreach:
+            return opt._v[_selection(opt.params, opt._offsets)].copy()
+        return np.array([x for p, v in zip(opt.params, opt.v) if getattr(p, "requires_grad", True) for x in v],
+                        dtype=float)
+
+    def _set_velocity(self, v: np.ndarray) -> None:
+        opt = self.optimizer
+        if opt.foreach:
+            opt._v[_selection(opt.params, opt._offsets)] = v
+            return
+        offset = 0
+        for i, p in enumerate(opt.params):
+            if getattr(p, "requires_grad", True):
+                n_p = len(opt.v[i])
+                opt.v[i][:] = v[offset:offset + n_p].tolist()
+                offset += n_p
+
+    def step(self, closure) -> float:
+        params = _active(self.params)
+        if not params:
+            return _loss_value(closure())
+
+        x = _gather(params, "data")
+        f, g = _evaluate(params, closure)
+        self.n_evals += 1
+
+        v = self._velocity()
+        d = -g
+        if v is not None:
+            d = (self.optimizer.beta / self.optimizer.lr) * v - g
+            if float(g @ d) >= 0.0:
+                d = -g          # velocity points uphill: restart from rest
+
+        t0, n = self.lr * self.grow, 0
+        if self.method == "exact":
+            t = line_search.exact_quadratic(self.A, x, d)
+        else:
+            t, _, _, n = _line_step(
+                params, closure, x, f, g, d, t0,
+                self.c1, self.max_evals, self.method, self.c2,
+            )
+            self.n_evals += n
+
+        # Leave each parameter with its gradient at theta, as after a plain step
+        offset = 0
+        for p in params:
+            n_p = len(p.data)
+            p.grad = g[offset:offset + n_p].tolist()
+            offset += n_p
+
+        if t is None or t <= 0.0:
+            # No decrease found: skip the update. x and d are unchanged next
+            # step, so the next search starts below the smallest trial
+            # (t0 halved per evaluation) instead of repeating this one
+            _scatter(params, x)
+            self.lr = t0 * 0.5 ** max(n, 1) / self.grow
+            return f
+
+        self.lr = t
+        self.optimizer.lr = t
+        _scatter(params, x + t * d)
+        if v is not None:
+            self._set_velocity(t * d)
+        return f
+
+    def zero_grad(self) -> None:
+        self.optimizer.zero_grad()
@@ -0,0 +1,159 @@
+# learning_dynamics/core/stopping.py
+
+"""
+Per-step stopping rules for training loops.
+
+A StopMonitor is fed (loss, grad) once per step -- or (loss, ||grad||) via
+check_norm when the loop already has the norm -- and answers "stop now?".
+It records *why* it fired, so sweeps can spend compute only on informative
+runs and still report what happened to the others:
+
+  - "non-finite":  loss or gradient overflowed to inf / NaN
+  - "diverged":    loss grew past max_growth * (initial loss)
+  - "converged":   ||grad|| <= grad_tol, or loss <= loss_tol
+
+All checks are O(n) in the parameter count and need no extra evaluations.
+
+BatchStopMonitor applies the same rules to K runs stepped together as one
+batch (experiments.utils.sweep_gd / sweep_momentum), one stop step and reason
+per run.
+"""
+
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+class StopMonitor:
+    def __init__(
+        self,
+        grad_tol: Optional[float] = None,
+        loss_tol: Optional[float] = None,
+        max_growth: Optional[float] = 1e8,
+    ):
+        self.grad_tol = grad_tol
+        self.loss_tol = loss_tol
+        self.max_growth = max_growth
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the previous run (initial loss, reason, step)."""
+        self.loss0: Optional[float] = None
+        self.reason: Optional[str] = None
+        self.step: Optional[int] = None
+        self.grad_norm: Optional[float] = None
+        self._t = 0
+
+    @property
+    def stopped(self) -> bool:
+        return self.reason is not None
+
+    def check(self, loss: float, grad: Optional[Iterable[float]] = None) -> bool:
+        """
+        Record one step. Returns True (and sets .reason / .step) if the loop should stop.
+        """
+        grad_norm = None if grad is None else math.sqrt(sum(g * g for g in grad))
+        return self.check_norm(loss, grad_norm)
+
+    def check_norm(self, loss: float, grad_norm: Optional[float] = None) -> bool:
+        """check() for a loop that already has the gradient norm (not the gradient)."""
+        t = self._t
+        self._t += 1
+        loss = float(loss)
+
+        if grad_norm is not None:
+            grad_norm = float(grad_norm)
+            self.grad_norm = grad_norm
+
+        if not math.isfinite(loss) or (grad_norm is not None and not math.isfinite(grad_norm)):
+            return self._stop("non-finite", t)
+
+        if self.loss0 is None:
+            self.loss0 = loss
+        elif self.max_growth is not None and abs(loss) > self.max_growth * max(abs(self.loss0), 1e-300):
+            return self._stop("diverged", t)
+
+        if self.grad_tol is not None and grad_norm is not None and grad_norm <= self.grad_tol:
+            return self._stop("converged", t)
+        if self.loss_tol is not None and loss <= self.loss_tol:
+            return self._stop("converged", t)
+        return False
+
+    def _stop(self, reason: str, t: int) -> bool:
+        self.reason = reason
+        self.step = t
+        return True
+
+    def __repr__(self) -> str:
+        return f"StopMonitor(reason={self.reason!r}, step={self.step})"
+
+
+class BatchStopMonitor:
+    """
+    StopMonitor's rules for K runs stepped as one batch. Once per step,
+    check_norm(loss, grad_norm, rows) is fed the losses and gradient norms of
+    the rows still running and returns which of them stop; the caller drops
+    those from the working set.
+
+      step:    (K,) step at which each run stopped, -1 if it never did
+      reason:  (K,) "non-finite" / "diverged" / "converged", "" if it never stopped
+    """
+
+    def __init__(
+        self,
+        grad_tol: Optional[float] = None,
+        loss_tol: Optional[float] = None,
+        max_growth: Optional[float] = 1e8,
+    ):
+        self.grad_tol = grad_tol
+        self.loss_tol = loss_tol
+        self.max_growth = max_growth
+        self.reset(0)
+
+    def reset(self, n_runs: int) -> None:
+        """Forget the previous batch and start one of n_runs runs."""
+        self.loss0 = np.full(n_runs, np.nan)
+        self.reason = np.full(n_runs, "", dtype="<U10")
+        self.step = np.full(n_runs, -1)
+        self.grad_norm = np.full(n_runs, np.nan)
+        self._t = 0
+
+    @property
+    def stopped(self) -> np.ndarray:
+        return self.reason != ""
+
+    def check_norm(self, loss: np.ndarray, grad_norm: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        Record one step of runs `rows`. Returns a boolean mask over rows: True
+        where that run should stop (its .reason / .step are then set).
+        """
+        t = self._t
+        self._t += 1
+        loss = np.asarray(loss, dtype=float)
+        grad_norm = np.asarray(grad_norm, dtype=float)
+        self.grad_norm[rows] = grad_norm
+
+        # Same order of precedence as StopMonitor.check
+        stop = np.full(len(rows), "", dtype="<U10")
+        stop[~(np.isfinite(loss) & np.isfinite(grad_norm))] = "non-finite"
+        first = np.isnan(self.loss0[rows])
+        self.loss0[rows[first]] = loss[first]
+        if self.max_growth is not None:
+            with np.errstate(invalid="ignore"):
+                diverged = np.abs(loss) > self.max_growth * np.maximum(np.abs(self.loss0[rows]), 1e-300)
+            stop[(stop == "") & diverged & ~first] = "diverged"
+        converged = np.zeros(len(rows), dtype=bool)
+        if self.grad_tol is not None:
+            converged |= grad_norm <= self.grad_tol
+        if self.loss_tol is not None:
+            converged |= loss <= self.loss_tol
+        stop[(stop == "") & converged] = "converged"
+
+        stopped = stop != ""
+        self.step[rows[stopped]] = t
+        self.reason[rows[stopped]] = stop[stopped]
+        return stopped
+
+    def __repr__(self) -> str:
+        return f"BatchStopMonitor(stopped={int(self.stopped.sum())}/{len(self.reason)})"
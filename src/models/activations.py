@@ -30,7 +30,8 @@ def tanh(x: Any) -> PopulationNode:
 def sigmoid(x: Any) -> PopulationNode:
     x = _as_node(x)
 
-    out_data = [ 1.0 / (1.0 + (math.exp(-z) for z in x.data))]
+    # Split by sign so exp never overflows
+    out_data = [1.0 / (1.0 + math.exp(-z)) if z >= 0 else math.exp(z) / (1.0 + math.exp(z)) for z in x.data]
     out = PopulationNode(
         out_data,
         (x,),
@@ -64,8 +65,8 @@ def relu(x: Any) -> PopulationNode:
         if not x.requires_grad:
             return
         for i in range(len(out.grad)):
-            out_data = (1.0 if x.data[i] > 0 else 0.0)* out.grad[i]
-            x.grad[i] += (1.0 - out_data[i] ** 2) * out.grad[i]
+            # d/dx relu(x) = 1 if x > 0 else 0
+            x.grad[i] += (1.0 if x.data[i] > 0 else 0.0) * out.grad[i]
 
     out._backward = _backward
     return out
@@ -7,9 +7,12 @@ from core.ops import mul, sum_pop, add
 from models.activations import tanh, sigmoid, relu, softmax
 
 
+ACTIVATIONS = {"tanh": tanh, "sigmoid": sigmoid, "relu": relu}
+
+
 class Neuron:
     """
-    One neuron: y = tanh(w·x + b)
+    One neuron: y = act(w·x + b), act in ACTIVATIONS or "linear" (identity)
 
     - x is a PopulationNode vector
     - w is a Parameter vector
@@ -21,6 +24,8 @@ class Neuron:
         if not isinstance(n_inputs, int) or n_inputs <= 0:
             raise ValueError("n_inputs must be a positive int")
 
+        if activation != "linear" and activation not in ACTIVATIONS:
+            raise ValueError(f"Unknown activation {activation!r}; expected 'linear' or one of {sorted(ACTIVATIONS)}")
         self.activation = activation
 
         rng = np.random.default_rng(seed)
@@ -42,7 +47,7 @@ class Neuron:
 
         if self.activation == "linear":
             return z
-        return tanh(z)
+        return ACTIVATIONS[self.activation](z)
 
     def parameters(self):
         return [self.w, self.b]
@@ -0,0 +1,270 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+# ---------- Shape-preserving decimation ----------
+#
+# All functions return sorted row INDICES into the input (so steps, losses
+# and states stay aligned), always including the first and last row.
+#
+#   lttb(points, n_out)     largest-triangle-three-buckets: one row per bucket,
+#                           the one spanning the largest triangle with the row
+#                           kept in the previous bucket and the mean of the
+#                           next. Keeps turning points of curves/trajectories.
+#   minmax(values, n_out)   per bucket, the rows holding each column's min and
+#                           max. Keeps spikes and the envelope of noisy curves.
+#   log_steps(n, n_out)     log-spaced steps, for loss curves on a log x-axis.
+#
+# points may be (n,) values, plotted against their index, or (n, d) rows;
+# triangle areas are computed in d dimensions, so a 2-D trajectory keeps its
+# corners whatever the step timing.
+#
+# The Streaming* classes give the same kind of decimation for rows arriving in
+# chunks (TrajectoryStore.iter_chunks, streaming.py generators, training loops)
+# with fixed-size buckets and O(bucket_size) memory:
+#
+#   dec = StreamingLTTB(bucket_size=256)
+#   for _, rows in store.iter_chunks():
+#       dec.update(rows)
+#   idx, rows = dec.result()
+
+
+def _as_points(points) -> np.ndarray:
+    """(n, d) float rows; 1-D values become (index, value) pairs."""
+    points = np.asarray(points, dtype=float)
+    if points.ndim == 1:
+        return np.column_stack([np.arange(len(points), dtype=float), points])
+    if points.ndim != 2:
+        raise ValueError("points must be 1-D values or (n, d) rows")
+    return points
+
+
+def _triangle_areas(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Twice the area of triangles (a, b_i, c) in d dimensions (Lagrange identity)."""
+    u = b - a
+    v = c - a
+    uu = np.einsum("ij,ij->i", u, u)
+    vv = v @ v
+    uv = u @ v
+    return np.sqrt(np.maximum(uu * vv - uv * uv, 0.0))
+
+
+def lttb(points, n_out: int) -> np.ndarray:
+    """Indices of n_out rows chosen by largest-triangle-three-buckets."""
+    pts = _as_points(points)
+    n = len(pts)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("n_out must be >= 3")
+
+    # Rows 1..n-2 split into n_out-2 buckets; rows 0 and n-1 are always kept
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        nxt = pts[edges[b + 1]: edges[b + 2]].mean(axis=0) if b < n_out - 3 else pts[-1]
+        areas = _triangle_areas(pts[idx[b]], pts[lo:hi], nxt)
+        idx[b + 1] = lo + int(np.argmax(areas))
+    return idx
+
+
+def _bucket_extremes(values: np.ndarray, size: int) -> np.ndarray:
+    """Rows of argmin/argmax per column in consecutive buckets of `size` rows."""
+    n, d = values.shape
+    n_buckets = -(-n // size)
+    # Pad the last bucket with copies of the last row: extremes found in the
+    # padding are clipped back onto that (real) row
+    padded = np.concatenate([values, np.repeat(values[-1:], n_buckets * size - n, axis=0)])
+    buckets = padded.reshape(n_buckets, size, d)
+    base = (np.arange(n_buckets) * size)[:, None]
+    found = np.concatenate([base + buckets.argmin(axis=1), base + buckets.argmax(axis=1)], axis=1)
+    return np.minimum(found.ravel(), n - 1)
+
+
+def minmax(values, n_out: int) -> np.ndarray:
+    """
+    Indices of the min and max row of each column in about n_out / (2 d)
+    equal buckets, plus the endpoints. At most n_out + 2 rows.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[:, None] if values.ndim == 1 else values
+    n, d = values.shape
+    if n_out >= n:
+        return np.arange(n)
+    n_buckets = max(1, n_out // (2 * d))
+    found = _bucket_extremes(values, -(-n // n_buckets))
+    return np.unique(np.concatenate([[0, n - 1], found]))
+
+
+def log_steps(n: int, n_out: int) -> np.ndarray:
+    """About n_out log-spaced step indices in [0, n-1] (fewer where steps collide)."""
+    if n_out >= n:
+        return np.arange(n)
+    return np.unique(np.concatenate([[0], np.geomspace(1, n - 1, n_out - 1).round().astype(np.int64)]))
+
+
+# ---------- Streaming forms ----------
+
+class _StreamingDecimator(ABC):
+    """Rows arrive through update(); result() returns (indices, rows) kept so far."""
+
+    def __init__(self):
+        self._n = 0                         # rows seen
+        self._kept_idx = []
+        self._kept_rows = []
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _keep(self, idx, rows) -> None:
+        self._kept_idx.append(np.asarray(idx, dtype=np.int64).reshape(-1))
+        self._kept_rows.append(np.asarray(rows, dtype=float).reshape(len(self._kept_idx[-1]), -1))
+
+    @abstractmethod
+    def update(self, rows) -> None:
+        """Add a chunk of rows."""
+
+    @abstractmethod
+    def _pending(self):
+        """(idx, rows) that result() would add for the rows not yet decided."""
+
+    def result(self):
+        pieces = list(zip(self._kept_idx, self._kept_rows))
+        pending = self._pending()
+        if pending is not None:
+            pieces.append(pending)
+        if not pieces:
+            return np.empty(0, dtype=np.int64), np.empty((0, 0))
+        idx = np.concatenate([i for i, _ in pieces])
+        rows = np.concatenate([r for _, r in pieces])
+        idx, first = np.unique(idx, return_index=True)
+        return idx, rows[first]
+
+
+class StreamingMinMax(_StreamingDecimator):
+    """minmax over consecutive buckets of bucket_size rows, plus the first and last row."""
+
+    def __init__(self, bucket_size: int):
+        super().__init__()
+        if bucket_size < 1:
+            raise ValueError("bucket_size must be >= 1")
+        self.bucket_size = int(bucket_size)
+        self._buf = None
+        self._buf_start = 0
+
+    def update(self, rows) -> None:
+        """Add a chunk of rows, shape (k, d) (or (k,) scalars)."""
+        rows = np.asarray(rows, dtype=float)
+        rows = rows[:, None] if rows.ndim == 1 else rows
+        if self._n == 0 and len(rows):
+            self._keep([0], rows[:1])
+        buf = rows if self._buf is None else np.concatenate([self._buf, rows])
+        self._n += len(rows)
+
+        full = len(buf) // self.bucket_size * self.bucket_size
+        if full:
+            found = _bucket_extremes(buf[:full], self.bucket_size)
+            self._keep(self._buf_start + found, buf[found])
+        self._buf = buf[full:].copy()
+        self._buf_start += full
+        if len(rows):
+            self._last = rows[-1:].copy()
+
+    def _pending(self):
+        # The partial last bucket, and the last row seen
+        if self._n == 0:
+            return None
+        found = _bucket_extremes(self._buf, len(self._buf)) if len(self._buf) else np.empty(0, dtype=np.int64)
+        return (np.append(self._buf_start + found, self._n - 1),
+                np.concatenate([self._buf[found], self._last]))
+
+
+class StreamingLTTB(_StreamingDecimator):
+    """
+    LTTB with fixed buckets of bucket_size rows after the first. A bucket is
+    decided once the next one is complete (its mean is the third vertex), so
+    at most two buckets are held in memory.
+    """
+
+    def __init__(self, bucket_size: int):
+        super().__init__()
+        if bucket_size < 1:
+            raise ValueError("bucket_size must be >= 1")
+        self.bucket_size = int(bucket_size)
+        self._buf = None            # rows not yet decided
+        self._buf_start = 1         # global index of self._buf[0]
+        self._prev = None           # last kept row
+
+    def update(self, rows) -> None:
+        """
+        Add a chunk of rows, shape (k, d). 1-D input is k scalar values, kept
+        as (step, value) rows like lttb does.
+        """
+        rows = np.asarray(rows, dtype=float)
+        if rows.ndim == 1:
+            rows = np.column_stack([self._n + np.arange(len(rows), dtype=float), rows])
+        if len(rows) == 0:
+            return
+        if self._n == 0:
+            self._keep([0], rows[:1])
+            self._prev = rows[0]
+            rows = rows[1:]
+            self._n = 1
+        buf = rows if self._buf is None else np.concatenate([self._buf, rows])
+        self._n += len(rows)
+
+        size = self.bucket_size
+        done = 0
+        while len(buf) - done >= 2 * size:
+            bucket = buf[done: done + size]
+            nxt = buf[done + size: done + 2 * size].mean(axis=0)
+            j = int(np.argmax(_triangle_areas(self._prev, bucket, nxt)))
+            self._prev = bucket[j]
+            self._keep([self._buf_start + done + j], bucket[j: j + 1])
+            done += size
+        self._buf = buf[done:].copy()
+        self._buf_start += done
+
+    def _pending(self):
+        if self._buf is None or len(self._buf) == 0:
+            return None
+        # Remaining one or two buckets: the last row is always kept, and the
+        # first bucket (if there are two) is decided against it
+        buf, size = self._buf, self.bucket_size
+        last = len(buf) - 1
+        idx, prev = [], self._prev
+        if last >= 1:
+            bucket = buf[: min(size, last)]
+            nxt = buf[min(size, last):].mean(axis=0)
+            j = int(np.argmax(_triangle_areas(prev, bucket, nxt)))
+            idx.append(j)
+            prev = bucket[j]
+            if last > size:
+                bucket = buf[size: last]
+                idx.append(size + int(np.argmax(_triangle_areas(prev, bucket, buf[last]))))
+        idx.append(last)
+        idx = np.asarray(idx)
+        return self._buf_start + idx, buf[idx]
+
+
+class LogSpacedSampler:
+    """
+    Streaming log_steps: keep(step) is True for steps 0, 1, ... up to about
+    `per_decade` steps per factor of 10 after that. Steps must be offered in
+    increasing order.
+    """
+
+    def __init__(self, per_decade: int = 50):
+        if per_decade < 1:
+            raise ValueError("per_decade must be >= 1")
+        self.ratio = 10.0 ** (1.0 / per_decade)
+        self._next = 0.0
+
+    def keep(self, step: int) -> bool:
+        if step < self._next:
+            return False
+        self._next = max(step + 1, step * self.ratio)
+        return True
@@ -0,0 +1,124 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.decimation import log_steps, lttb, minmax
+
+
+# ---------- Headless figure rendering ----------
+#
+# Figures are built with the object-oriented API on an Agg canvas:
+#
+#   fig, ax = new_figure()
+#   plot_trajectory(ax, traj)
+#   save(fig, "outputs/week3", "03_zigzag.png")
+#
+# Nothing goes through pyplot, so there is no global "current figure", no GUI
+# backend is ever selected, and a figure is freed as soon as it goes out of
+# scope (no plt.close needed). matplotlib is imported on first use.
+#
+# Long runs are decimated before drawing (utils/decimation.py): Agg's cost
+# grows with the number of vertices and markers, while a 1000-pixel-wide axes
+# cannot show more than a few thousand of them anyway. MAX_POINTS is per line.
+# Trajectories use LTTB (keeps the corners of zig-zags); curves use min/max
+# per bucket (keeps spikes), or log-spaced steps for a log x-axis.
+#
+# Independent figures can be rendered in worker processes with render_many.
+# A FigureJob's draw function is called as draw(fig, *args, **kwargs) in the
+# worker, so it must be a module-level function and its arguments picklable.
+
+DPI = 160
+MAX_POINTS = 4000
+
+FigureJob = namedtuple("FigureJob", ["draw", "outdir", "name", "args", "kwargs", "figsize"])
+FigureJob.__new__.__defaults__ = ((), {}, None)
+
+
+def _agg_figure(figsize=None):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def new_figure(nrows: int = 1, ncols: int = 1, figsize=None, **subplot_kw):
+    """(fig, axes) on an Agg canvas; axes as returned by Figure.subplots."""
+    fig = _agg_figure(figsize)
+    return fig, fig.subplots(nrows, ncols, **subplot_kw)
+
+
+def save(fig, outdir: str, name: str, dpi: int = DPI) -> str:
+    os.makedirs(outdir, exist_ok=True)
+    path = os.path.join(outdir, name)
+    fig.savefig(path, dpi=dpi, bbox_inches="tight")
+    print(f"[saved] {path}")
+    return path
+
+
+def downsample(data, max_points: int = MAX_POINTS) -> np.ndarray:
+    """
+    Indices of at most max_points rows, always including the first and last;
+    arange(n) if there are no more than max_points.
+
+    data is either a row count n (no values to look at: evenly strided rows)
+    or the rows themselves, (n,) or (n, d), decimated with LTTB.
+    """
+    if isinstance(data, (int, np.integer)):
+        n = int(data)
+        if max_points is None or n <= max_points:
+            return np.arange(n)
+        if max_points < 2:
+            raise ValueError("max_points must be >= 2")
+        return np.unique(np.linspace(0, n - 1, max_points).round().astype(int))
+    if max_points is None:
+        return np.arange(len(data))
+    return lttb(data, max_points)
+
+
+def plot_trajectory(ax, traj, max_points: int = MAX_POINTS, dims=(0, 1), **kw):
+    """Plot traj[:, dims[0]] against traj[:, dims[1]], LTTB-decimated to max_points."""
+    xy = np.asarray(traj)[:, list(dims)]
+    xy = xy[downsample(xy, max_points)]
+    return ax.plot(xy[:, 0], xy[:, 1], **kw)
+
+
+def plot_curve(ax, values, max_points: int = MAX_POINTS, method: str = "minmax", **kw):
+    """
+    Plot values against step index, decimated to about max_points:
+    method "minmax" (envelope and spikes), "lttb" (shape) or "log" (log x-axis).
+    """
+    values = np.asarray(values)
+    if max_points is None:
+        idx = np.arange(len(values))
+    elif method == "minmax":
+        idx = minmax(values, max_points)
+    elif method == "lttb":
+        idx = lttb(values, max_points)
+    elif method == "log":
+        idx = log_steps(len(values), max_points)
+    else:
+        raise ValueError(f"unknown method {method!r}")
+    return ax.plot(idx, values[idx], **kw)
+
+
+def render(job: FigureJob) -> str:
+    """Build one figure with job.draw and save it. Returns the saved path."""
+    fig = _agg_figure(job.figsize)
+    job.draw(fig, *job.args, **job.kwargs)
+    return save(fig, job.outdir, job.name)
+
+
+def render_many(jobs, processes: int = None):
+    """
+    Render FigureJobs, in parallel worker processes when there is more than
+    one job and processes != 1. Returns the saved paths in job order.
+    """
+    jobs = list(jobs)
+    if processes == 1 or len(jobs) <= 1:
+        return [render(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(processes or os.cpu_count(), len(jobs))) as pool:
+        return list(pool.map(render, jobs))
@@ -1,6 +1,6 @@
 import numpy as np 
-import pyvista as pv
 # Example: 3D Scatter Plot
+# pyvista is only needed to draw, so it is imported in main(), not here.
 
 original_v = np.array([1,0,0])
 # Example of tensor transformation:
@@ -23,7 +23,14 @@ def plot_arrows(plotter, vector, colors):
     direction = np.array([vector])   # must be 2D
     plotter.add_arrows(origin, direction, color=colors)
 
-plotter = pv.Plotter()
-plot_arrows(plotter, original_v, 'green')
-plotter.show()
+def main():
+    import pyvista as pv
+
+    plotter = pv.Plotter()
+    plot_arrows(plotter, original_v, 'green')
+    plotter.show()
+
+
+if __name__ == "__main__":
+    main()
 
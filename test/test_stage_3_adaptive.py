@@ -0,0 +1,94 @@
+import math
+
+from core.parameter import Parameter
+from core.optim import Nesterov, RMSProp, Adam, AdaGrad
+
+
+def close(a, b, tol=1e-9):
+    return all(abs(x - y) < tol for x, y in zip(a, b))
+
+
+def test_nesterov_two_steps_matches_hand_computation():
+    """
+    w0 = 1, grad = 1, lr = 0.1, beta = 0.9
+    Step 1: v1 = -0.1,   w1 = 1 + 0.9*(-0.1) - 0.1 = 0.81
+    Step 2: v2 = -0.19,  w2 = 0.81 + 0.9*(-0.19) - 0.1 = 0.539
+    """
+    w = Parameter([1.0])
+    opt = Nesterov([w], lr=0.1, beta=0.9)
+
+    w.grad = [1.0]
+    opt.step()
+    assert close(w.data, [0.81])
+
+    w.grad = [1.0]
+    opt.step()
+    assert close(w.data, [0.539])
+
+
+def test_rmsprop_first_step():
+    # s1 = (1-rho)*g^2 => step = lr * g / sqrt((1-rho) g^2) = lr / sqrt(1-rho) * sign(g)
+    w = Parameter([1.0, 1.0])
+    w.grad = [2.0, -0.5]
+    RMSProp([w], lr=0.01, rho=0.9, eps=0.0).step()
+
+    step = 0.01 / math.sqrt(0.1)
+    assert close(w.data, [1.0 - step, 1.0 + step])
+
+
+def test_adam_first_step_is_lr_times_sign():
+    # With bias correction, m_hat = g and v_hat = g^2 on step 1
+    w = Parameter([0.0, 0.0])
+    w.grad = [3.0, -0.2]
+    Adam([w], lr=0.1, eps=0.0).step()
+    assert close(w.data, [-0.1, 0.1])
+
+
+def test_adagrad_accumulates_squared_grads():
+    w = Parameter([0.0])
+    opt = AdaGrad([w], lr=1.0, eps=0.0)
+
+    w.grad = [3.0]
+    opt.step()          # G = 9,  w = -3/3 = -1
+    w.grad = [4.0]
+    opt.step()          # G = 25, w = -1 - 4/5 = -1.8
+
+    assert close(w.data, [-1.8])
+    assert close(list(opt.sum_sq[0]), [25.0])
+
+
+def test_adaptive_optimizers_skip_frozen_params():
+    for make_opt in (
+        lambda ps: Nesterov(ps, lr=0.1),
+        lambda ps: RMSProp(ps, lr=0.1),
+        lambda ps: Adam(ps, lr=0.1),
+        lambda ps: AdaGrad(ps, lr=0.1),
+    ):
+        w1 = Parameter([1.0])
+        w2 = Parameter([2.0])
+        w2.requires_grad = False
+        w1.grad = [1.0]
+        w2.grad = [1.0]
+
+        make_opt([w1, w2]).step()
+
+        assert w1.data[0] < 1.0
+        assert w2.data == [2.0]
+
+
+def test_adaptive_optimizers_minimize_quadratic():
+    # L = 0.5 * (10 x^2 + y^2)
+    a = [10.0, 1.0]
+    for make_opt in (
+        lambda ps: Nesterov(ps, lr=0.05, beta=0.9),
+        lambda ps: RMSProp(ps, lr=0.01),
+        lambda ps: Adam(ps, lr=0.1),
+        lambda ps: AdaGrad(ps, lr=1.0),
+    ):
+        w = Parameter([1.0, 1.0])
+        opt = make_opt([w])
+        for _ in range(300):
+            opt.zero_grad()
+            w.grad = [ai * wi for ai, wi in zip(a, w.data)]
+            opt.step()
+        assert max(abs(x) for x in w.data) < 0.05
@@ -0,0 +1,59 @@
+import tracemalloc
+
+import numpy as np
+
+from core.ops import matvec, mul, sub, sum_pop
+from experiments.adjoint import adjoint_gradients, odeint, unrolled_gradients
+from experiments.gradient_flow_ode import quadratic_flow
+from experiments.utils import make_quadratic_A
+
+
+THETA0 = np.array([3.0, -2.0])
+TARGET = [1.0, -1.0]
+
+
+def final_loss(theta):
+    r = sub(theta, TARGET)
+    return mul(0.5, sum_pop(mul(r, r)))
+
+
+def diag_flow(theta, p):
+    return mul(-1.0, mul(p, theta))
+
+
+def test_adjoint_matches_closed_form_for_diagonal_flow():
+    p, T = np.array([0.5, 2.0]), 1.5
+    J, g_theta0, g_p, theta_T = adjoint_gradients(diag_flow, final_loss, THETA0, p, T, steps=40)
+
+    exact_T = np.exp(-p * T) * THETA0
+    resid = exact_T - TARGET
+    assert np.allclose(theta_T, exact_T, atol=1e-6)
+    assert np.isclose(J, 0.5 * resid @ resid)
+    assert np.allclose(g_theta0, np.exp(-p * T) * resid, atol=1e-6)
+    assert np.allclose(g_p, -T * exact_T * resid, atol=1e-6)
+
+
+def test_adjoint_matches_unrolled_through_gradient_flow():
+    A = make_quadratic_A(l1=3.0, l2=1.0, rot_rad=0.4)
+
+    def flow(theta, p):
+        return mul(p, matvec(-A, theta))    # p scales the flow speed
+
+    p = np.array([1.0])
+    adj = adjoint_gradients(flow, final_loss, THETA0, p, 1.0, steps=30)
+    unr = unrolled_gradients(flow, final_loss, THETA0, p, 1.0, steps=30)
+    for a, u in zip(adj, unr):
+        assert np.allclose(a, u, atol=1e-6)
+
+    assert np.allclose(odeint(flow, THETA0, p, 1.0, 30), quadratic_flow(A, THETA0, [1.0])[0], atol=1e-6)
+
+
+def test_adjoint_memory_does_not_grow_with_steps():
+    p = np.array([0.5, 2.0])
+    peaks = []
+    for steps in [20, 320]:
+        tracemalloc.start()
+        adjoint_gradients(diag_flow, final_loss, THETA0, p, 1.0, steps)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert peaks[1] < 2 * peaks[0]
@@ -0,0 +1,100 @@
+import os
+import numpy as np
+
+from experiments.cache import ResultCache, cache_key
+from experiments.utils import make_quadratic_A, run_gd, run_momentum
+
+
+A = make_quadratic_A(l1=60.0, l2=1.0, rot_rad=np.deg2rad(30))
+
+
+def test_cached_run_matches_and_hits(tmp_path):
+    cache = ResultCache(root=str(tmp_path))
+    cached_gd = cache.wrap(run_gd)
+
+    traj1, loss1 = cached_gd(A, [6.0, 6.0], lr=0.02, steps=30)
+    traj2, loss2 = cached_gd(A, [6.0, 6.0], lr=0.02, steps=30)
+    ref_traj, ref_loss = run_gd(A, [6.0, 6.0], lr=0.02, steps=30)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert np.array_equal(traj2, ref_traj) and np.array_equal(loss2, ref_loss)
+    assert np.array_equal(traj1, traj2)
+
+
+def test_key_depends_on_content_not_spelling():
+    k1 = cache_key(run_gd, (A, [6.0, 6.0]), {"lr": 0.02, "steps": 30})
+    k2 = cache_key(run_gd, (A.copy(), np.array([6, 6])), {"steps": 30, "lr": 0.02})
+    k3 = cache_key(run_gd, (A, [6.0, 6.0]), {"lr": 0.03, "steps": 30})
+    k4 = cache_key(run_gd, (A, [6.0, 6.0]), {"lr": 0.02, "steps": 30}, version="v2")
+    assert k1 == k2
+    assert len({k1, k3, k4}) == 3
+
+
+def test_tuple_results_round_trip(tmp_path):
+    cache = ResultCache(root=str(tmp_path))
+    cached = cache.wrap(run_momentum)
+    first = cached(A, [6.0, 6.0], lr=0.02, beta=0.9, steps=20)
+    second = cached(A, [6.0, 6.0], lr=0.02, beta=0.9, steps=20)
+    assert len(second) == 3
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    cache = ResultCache(root=str(tmp_path), max_bytes=10**9)
+    for i in range(3):
+        cache.put(f"k{i}", np.zeros(1000))
+        os.utime(os.path.join(str(tmp_path), f"k{i}.npz"), ns=(i * 10**9, i * 10**9))
+
+    cache.get("k0")                    # k0 becomes most recently used
+    size = os.path.getsize(os.path.join(str(tmp_path), "k0.npz"))
+    cache.max_bytes = 2 * size
+    cache.evict()
+
+    assert cache.get("k1") is None     # least recently used went first
+    assert cache.get("k0") is not None
+    assert cache.get("k2") is not None
+
+
+def test_evict_and_clear_skip_entries_removed_by_another_process(tmp_path, monkeypatch):
+    cache = ResultCache(root=str(tmp_path), max_bytes=0)
+    cache.put("k0", np.zeros(10))
+    listdir = os.listdir
+    # An entry listed, then deleted by another worker before stat/remove
+    monkeypatch.setattr(os, "listdir", lambda path: listdir(path) + ["gone.npz"])
+
+    cache.evict()
+    assert cache.get("k0") is None
+    cache.put("k1", np.zeros(10))
+    cache.clear()
+    assert cache.get("k1") is None
+
+
+def test_editing_a_dependency_invalidates_the_key(tmp_path, monkeypatch):
+    import importlib
+    import sys
+
+    from experiments import cache as cache_module
+
+    (tmp_path / "dep_mod.py").write_text("SCALE = 2.0\n\ndef scale(x):\n    return SCALE * x\n")
+    (tmp_path / "runner_mod.py").write_text(
+        "import numpy as np\nfrom dep_mod import scale\n\ndef run(x):\n    return np.array([scale(x)])\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(cache_module, "PROJECT_ROOTS", cache_module.PROJECT_ROOTS + [str(tmp_path)])
+    for name in ("dep_mod", "runner_mod"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    runner = importlib.import_module("runner_mod")
+
+    assert str(tmp_path / "dep_mod.py") in cache_module.project_dependencies("runner_mod")
+    k1 = cache_key(runner.run, (1.0,), {})
+    assert cache_key(runner.run, (1.0,), {}) == k1
+    (tmp_path / "dep_mod.py").write_text("SCALE = 3.0\n\ndef scale(x):\n    return SCALE * x\n")
+    assert cache_key(runner.run, (1.0,), {}) != k1
+
+
+def test_runner_keys_cover_core_and_trajectory_sources():
+    from experiments.cache import project_dependencies
+
+    deps = {os.path.relpath(p, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            for p in project_dependencies(run_gd.__module__)}
+    assert {os.path.join("experiments", "trajectory.py"), os.path.join("src", "core", "ops.py")} <= deps
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from experiments.streaming import log_spaced, stream_gd
+from utils.decimation import (
+    LogSpacedSampler, StreamingLTTB, StreamingMinMax, log_steps, lttb, minmax,
+)
+
+
+@pytest.fixture
+def walk():
+    y = np.cumsum(np.random.default_rng(0).standard_normal(100_000))
+    y[31_415] += 1000.0
+    return y
+
+
+def test_lttb_size_endpoints_and_spike(walk):
+    idx = lttb(walk, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == len(walk) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 31_415 in idx
+    assert np.array_equal(lttb(walk[:100], 500), np.arange(100))
+
+
+def test_lttb_keeps_trajectory_corners():
+    # Square path sampled densely: the corners are the only points that matter
+    t = np.linspace(0, 1, 10_001)[:-1]
+    side = np.repeat(np.arange(4), 2500)
+    s = t * 4 - side
+    corners = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=float)
+    path = corners[side] + s[:, None] * (corners[(side + 1) % 4] - corners[side])
+    kept = path[lttb(path, 12)]
+    for c in corners[1:]:
+        assert np.min(np.linalg.norm(kept - c, axis=1)) < 1e-2
+
+
+def test_minmax_keeps_extremes_per_column(walk):
+    idx = minmax(walk, 200)
+    assert len(idx) <= 202
+    assert {0, len(walk) - 1, int(walk.argmin()), int(walk.argmax())} <= set(idx)
+
+    traj = np.column_stack([walk, -walk[::-1]])
+    idx = minmax(traj, 400)
+    assert {int(traj[:, 1].argmin()), int(traj[:, 1].argmax())} <= set(idx)
+
+
+def test_log_steps():
+    idx = log_steps(10**6, 61)
+    assert idx[0] == 0 and idx[-1] == 10**6 - 1
+    assert len(idx) <= 61 and np.all(np.diff(idx) > 0)
+    assert np.array_equal(log_steps(5, 10), np.arange(5))
+
+
+@pytest.mark.parametrize("cls", [StreamingMinMax, StreamingLTTB])
+def test_streaming_result_does_not_depend_on_chunking(cls, walk):
+    results = []
+    for chunk in (len(walk), 1000, 333):
+        dec = cls(bucket_size=250)
+        for start in range(0, len(walk), chunk):
+            dec.update(walk[start: start + chunk])
+        results.append(dec.result())
+    for idx, rows in results[1:]:
+        np.testing.assert_array_equal(idx, results[0][0])
+        np.testing.assert_array_equal(rows, results[0][1])
+
+    idx, rows = results[0]
+    assert idx[0] == 0 and idx[-1] == len(walk) - 1
+    assert 31_415 in idx
+    assert rows[-1, -1] == walk[-1]
+
+
+def test_streaming_minmax_matches_in_memory_buckets(walk):
+    dec = StreamingMinMax(bucket_size=1000)
+    dec.update(walk)
+    idx, rows = dec.result()
+    np.testing.assert_array_equal(idx, minmax(walk, 2 * len(walk) // 1000))
+    np.testing.assert_array_equal(rows[:, 0], walk[idx])
+
+
+def test_log_spaced_stream_filter():
+    sampler = LogSpacedSampler(per_decade=10)
+    kept = [k for k in range(10**5) if sampler.keep(k)]
+    assert kept[:5] == [0, 1, 2, 3, 4]
+    assert 40 <= len(kept) <= 60
+
+    A = np.diag([2.0, 1.0])
+    steps = [rec.step for rec in log_spaced(stream_gd(A, [1.0, 1.0], lr=0.1, steps=1000), per_decade=10)]
+    assert steps[0] == 0 and len(steps) < 50
@@ -0,0 +1,61 @@
+import numpy as np
+
+from core.stopping import StopMonitor
+from experiments.ensemble import run_ensemble, sample_box
+from experiments.utils import make_quadratic_A, run_gd, run_momentum
+from experiments.xor import train_ensemble
+
+
+A = make_quadratic_A(l1=10.0, l2=2.0, rot_rad=np.deg2rad(15))
+
+
+def test_members_follow_run_gd_and_run_momentum():
+    theta0s = sample_box(5, [-6, -6], [6, 6], rng=0)
+    gd = run_ensemble(A, theta0s, lr=0.05, steps=30, record_losses=True)
+    mom = run_ensemble(A, theta0s, lr=0.02, beta=0.9, steps=30, record_losses=True)
+    for k, theta0 in enumerate(theta0s):
+        traj, losses = run_gd(A, theta0.tolist(), lr=0.05, steps=30)
+        assert np.allclose(gd.theta[k], traj[-1])
+        assert np.allclose(gd.losses[:, k], losses)
+        traj, _, losses = run_momentum(A, theta0.tolist(), lr=0.02, beta=0.9, steps=30)
+        assert np.allclose(mom.theta[k], traj[-1])
+        assert np.allclose(mom.losses[:, k], losses)
+    assert np.all(gd.stop_step == -1) and np.all(gd.reason == "")
+
+
+def test_per_member_stopping_matches_stop_monitor():
+    theta0s = np.array([[0.1, 0.1], [5.0, -4.0], [50.0, 50.0]])
+    res = run_ensemble(A, theta0s, lr=0.05, steps=500, loss_tol=1e-4, record_losses=True)
+    assert np.all(res.reason == "converged")
+
+    for k, theta0 in enumerate(theta0s):
+        monitor = StopMonitor(loss_tol=1e-4)
+        traj, losses = run_gd(A, theta0.tolist(), lr=0.05, steps=500, monitor=monitor)
+        assert res.stop_step[k] == monitor.step
+        assert np.allclose(res.theta[k], traj[-1])
+        assert np.all(np.isnan(res.losses[monitor.step + 1:, k]))
+
+    # Members stop at different times, closest start first
+    assert res.stop_step[0] < res.stop_step[1] < res.stop_step[2]
+
+
+def test_divergent_members_stop_without_affecting_others():
+    theta0s = sample_box(100, [-5, -5], [5, 5], rng=1)
+    too_big = run_ensemble(A, theta0s, lr=0.25, steps=200, loss_tol=1e-8)     # 0.25 > 2/lam_max
+    assert np.all(too_big.reason == "diverged")
+
+    mixed = run_ensemble(A, np.vstack([theta0s[:3], [[np.inf, 0.0]]]), lr=0.05, steps=1000, loss_tol=1e-8)
+    assert list(mixed.reason) == ["converged"] * 3 + ["non-finite"]
+    assert mixed.stop_step[3] == 0
+
+
+def test_mlp_seed_ensemble_early_stopping_keeps_escape_times():
+    full, escape_full, _ = train_ensemble((3,), "tanh", n_seeds=4, steps=120)
+    early, escape_early, _ = train_ensemble((3,), "tanh", n_seeds=4, steps=120, stop_tol=1e-2)
+    assert np.array_equal(escape_full, escape_early)
+    stopped = np.flatnonzero(early[-1] <= 1e-2)
+    assert stopped.size > 0
+    for s in stopped:
+        t = np.argmax(early[:, s] <= 1e-2)
+        assert np.all(early[t:, s] == early[t, s])      # frozen from then on
+        assert full[-1, s] < early[-1, s]               # whereas full training kept improving
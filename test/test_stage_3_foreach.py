@@ -0,0 +1,74 @@
+from core.parameter import Parameter
+from core.optim import GD, Momentum
+
+
+def close(a, b, tol=1e-12):
+    return len(a) == len(b) and all(abs(x - y) < tol for x, y in zip(a, b))
+
+
+def make_params():
+    w1 = Parameter([1.0, -2.0, 0.5])
+    w2 = Parameter([3.0])
+    return [w1, w2]
+
+
+def set_grads(params):
+    params[0].grad = [0.3, -1.0, 2.0]
+    params[1].grad = [-0.5]
+
+
+def test_gd_foreach_matches_loop():
+    ref, vec = make_params(), make_params()
+    opt_ref = GD(ref, lr=0.1)
+    opt_vec = GD(vec, lr=0.1, foreach=True)
+
+    for _ in range(3):
+        set_grads(ref)
+        set_grads(vec)
+        opt_ref.step()
+        opt_vec.step()
+
+    for p, q in zip(ref, vec):
+        assert close(p.data, q.data)
+        assert isinstance(q.data, list)
+
+
+def test_momentum_foreach_matches_loop():
+    ref, vec = make_params(), make_params()
+    opt_ref = Momentum(ref, lr=0.1, beta=0.9)
+    opt_vec = Momentum(vec, lr=0.1, beta=0.9, foreach=True)
+
+    for _ in range(4):
+        set_grads(ref)
+        set_grads(vec)
+        opt_ref.step()
+        opt_vec.step()
+
+    for p, q in zip(ref, vec):
+        assert close(p.data, q.data)
+    for v_ref, v_vec in zip(opt_ref.v, opt_vec.v):
+        assert close(v_ref, list(v_vec))
+
+
+def test_foreach_skips_frozen_params():
+    params = make_params()
+    params[1].requires_grad = False
+    set_grads(params)
+
+    opt = Momentum(params, lr=0.1, beta=0.9, foreach=True)
+    opt.step()
+
+    assert params[1].data == [3.0]
+    assert list(opt.v[1]) == [0.0]
+    assert close(params[0].data, [0.97, -1.9, 0.3])
+
+
+def test_foreach_keeps_data_list_identity():
+    w = Parameter([1.0, 2.0])
+    data_ref = w.data
+    w.grad = [1.0, 1.0]
+
+    GD([w], lr=0.5, foreach=True).step()
+
+    assert w.data is data_ref
+    assert w.data == [0.5, 1.5]
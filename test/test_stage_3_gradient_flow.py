@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from experiments.gradient_flow_ode import autodiff_grad, gradient_flow, quadratic_flow, rk45, ros2
+from experiments.utils import make_quadratic_A, quadratic_loss, run_gd
+
+
+A = make_quadratic_A(l1=10.0, l2=1.0, rot_rad=np.deg2rad(35))
+THETA0 = [7.0, 2.0]
+
+
+def test_autodiff_grad_is_A_theta():
+    grad_fn = autodiff_grad(lambda theta: quadratic_loss(A, theta))
+    assert np.allclose(grad_fn(np.array(THETA0)), A @ np.array(THETA0))
+
+
+def test_rk45_dense_output_matches_exact_flow():
+    sol = rk45(lambda y: -A @ y, THETA0, (0.0, 3.0), rtol=1e-8, atol=1e-10)
+    ts = np.linspace(0.0, 3.0, 301)
+    assert np.allclose(sol(ts), quadratic_flow(A, THETA0, ts), atol=1e-6)
+    assert np.allclose(sol.y[-1], quadratic_flow(A, THETA0, [3.0])[0], atol=1e-7)
+    assert sol.t[-1] == 3.0
+    with pytest.raises(ValueError):
+        sol(3.5)
+
+
+def test_empty_span_gives_initial_state():
+    for solve in (rk45, ros2):
+        sol = solve(lambda y: -A @ y, THETA0, (1.0, 1.0))
+        assert sol.n_steps == 0
+        assert np.array_equal(sol(1.0), THETA0)
+        assert sol([1.0, 1.0]).shape == (2, 2)
+        with pytest.raises(ValueError):
+            solve(lambda y: -A @ y, THETA0, (1.0, 0.0))
+
+
+def test_max_steps_counts_rejected_steps():
+    # Every trial step is rejected (non-finite error), so t never advances
+    def f(y):
+        return -A @ y if np.array_equal(y, THETA0) else np.full_like(y, np.nan)
+
+    for solve in (rk45, ros2):
+        with pytest.raises(RuntimeError, match="max_steps=50"):
+            solve(f, THETA0, (0.0, 1.0), max_steps=50)
+
+
+def test_ros2_with_fd_jacobian_matches_exact_flow():
+    sol = ros2(lambda y: -A @ y, THETA0, (0.0, 3.0), rtol=1e-6, atol=1e-9)
+    ts = np.linspace(0.0, 3.0, 101)
+    assert np.allclose(sol(ts), quadratic_flow(A, THETA0, ts), atol=1e-4)
+
+
+def test_gd_approaches_flow_as_lr_shrinks():
+    grad_fn = autodiff_grad(lambda theta: quadratic_loss(A, theta))
+    sol = gradient_flow(grad_fn, THETA0, (0.0, 2.0))
+    errs = []
+    for lr in [0.02, 0.01]:
+        traj, _ = run_gd(A, THETA0, lr=lr, steps=int(round(2.0 / lr)))
+        errs.append(np.abs(traj - sol(lr * np.arange(len(traj)))).max())
+    # forward Euler is first order: halving lr roughly halves the error
+    assert 1.7 < errs[0] / errs[1] < 2.3
+
+
+def test_ros2_takes_far_fewer_steps_on_stiff_flow():
+    S = make_quadratic_A(l1=2e3, l2=1.0, rot_rad=np.deg2rad(35))
+    grad_fn = lambda theta: S @ theta
+    explicit = gradient_flow(grad_fn, THETA0, (0.0, 5.0), method="rk45", rtol=1e-4, atol=1e-7)
+    implicit = gradient_flow(grad_fn, THETA0, (0.0, 5.0), method="ros2", jac=-S, rtol=1e-4, atol=1e-7)
+
+    assert implicit.n_steps * 2 < explicit.n_steps
+    exact = quadratic_flow(S, THETA0, [5.0])[0]
+    assert np.allclose(implicit.y[-1], exact, atol=1e-3)
+    assert np.allclose(explicit.y[-1], exact, atol=1e-3)
@@ -0,0 +1,14 @@
+import pytest
+
+from experiments.import_time import BUDGET_US, HEAVY_PACKAGES, LIGHT_MODULES, import_times
+
+
+@pytest.mark.parametrize("module", LIGHT_MODULES)
+def test_module_imports_without_plotting_and_within_budget(module):
+    rows = import_times(module)
+    names = {name for name, _, _ in rows}
+    assert rows[-1][0] == module
+
+    heavy = sorted(n for n in names if n.split(".")[0] in HEAVY_PACKAGES)
+    assert not heavy, f"{module} imports {heavy[:3]} at import time"
+    assert rows[-1][2] < BUDGET_US, f"{module} took {rows[-1][2] / 1000:.0f} ms to import"
@@ -0,0 +1,83 @@
+import numpy as np
+
+from core.parameter import Parameter
+from core.optim import LBFGS
+from core.ops import add, matvec, mul, sum_pop
+
+
+def quadratic_closure(A, theta):
+    """L = 1/2 theta^T A theta through the autodiff engine."""
+    def closure():
+        loss = mul(0.5, sum_pop(mul(theta, matvec(A, theta))))
+        loss.backprop()
+        return loss
+    return closure
+
+
+def test_lbfgs_solves_ill_conditioned_quadratic_in_few_steps():
+    A = np.array([[50.0, 3.0], [3.0, 1.0]])
+    theta = Parameter([6.0, 6.0])
+    opt = LBFGS([theta], history_size=5)
+    closure = quadratic_closure(A, theta)
+
+    for _ in range(8):
+        opt.step(closure)
+
+    assert max(abs(x) for x in theta.data) < 1e-6
+
+
+def test_lbfgs_history_is_bounded_ring_buffer():
+    rng = np.random.default_rng(0)
+    Q, _ = np.linalg.qr(rng.normal(size=(6, 6)))
+    A = Q @ np.diag([1.0, 2.0, 5.0, 10.0, 20.0, 40.0]) @ Q.T
+    theta = Parameter(rng.normal(size=6).tolist())
+    opt = LBFGS([theta], history_size=2)
+    closure = quadratic_closure(A, theta)
+
+    losses = [opt.step(closure) for _ in range(60)]
+
+    assert opt._S.shape == (2, 6)
+    assert opt._len == 2
+    assert losses[-1] < 1e-8 * losses[0]
+
+
+def test_two_loop_satisfies_secant_condition():
+    # With one stored pair, H y = s holds exactly for the BFGS update
+    theta = Parameter([0.0, 0.0, 0.0])
+    opt = LBFGS([theta], history_size=3)
+    s = np.array([1.0, -2.0, 0.5])
+    y = np.array([2.0, -1.0, 1.0])
+    opt._push(s, y)
+
+    assert np.allclose(-opt._direction(y), s)
+
+
+def test_lbfgs_skips_pairs_without_positive_curvature():
+    theta = Parameter([0.0, 0.0])
+    opt = LBFGS([theta], history_size=3)
+    opt._push(np.array([1.0, 0.0]), np.array([-1.0, 0.0]))
+    assert opt._len == 0
+
+
+def test_lbfgs_resizes_history_when_trainable_params_change():
+    A = np.array([[4.0, 1.0], [1.0, 3.0]])
+    a = Parameter([1.0, -2.0])
+    b = Parameter([3.0])
+    b.requires_grad = False
+    opt = LBFGS([a, b], history_size=3)
+
+    def closure():
+        loss = add(mul(0.5, sum_pop(mul(a, matvec(A, a)))), sum_pop(mul(b, b)))
+        loss.backprop()
+        return loss
+
+    for _ in range(3):
+        opt.step(closure)
+    assert opt._S.shape == (3, 2) and opt._len > 0
+
+    b.requires_grad = True
+    for _ in range(10):
+        opt.step(closure)
+
+    assert opt._S.shape == (3, 3)
+    assert max(abs(x) for x in a.data + b.data) < 1e-6
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from core import line_search
+from core.parameter import Parameter
+from core.optim import GD, Adam, Momentum, LineSearch
+from core.ops import matvec, mul, sum_pop
+
+
+def parabola_phi(a=4.0, t_star=0.5):
+    """phi(t) = a/2 (t - t*)^2, minimized at t*."""
+    def phi(t):
+        return 0.5 * a * (t - t_star) ** 2, a * (t - t_star)
+    return phi
+
+
+def quadratic_closure(A, theta):
+    def closure():
+        loss = mul(0.5, sum_pop(mul(theta, matvec(A, theta))))
+        loss.backprop()
+        return loss
+    return closure
+
+
+def test_armijo_shrinks_until_sufficient_decrease():
+    phi = parabola_phi()
+    f0, s0 = phi(0.0)
+    t, f, n = line_search.armijo(phi, f0, s0, t0=8.0, c1=1e-4)
+    assert t == 0.5          # 8 -> 4 -> 2 -> 1 -> 0.5
+    assert n == 5
+    assert f <= f0 + 1e-4 * t * s0
+
+
+def test_wolfe_satisfies_both_conditions_and_can_grow():
+    phi = parabola_phi(t_star=10.0)
+    f0, s0 = phi(0.0)
+    t, f, n = line_search.wolfe(phi, f0, s0, t0=0.1, c1=1e-4, c2=0.5)
+    _, s = phi(t)
+    assert t > 0.1
+    assert f <= f0 + 1e-4 * t * s0
+    assert abs(s) <= 0.5 * abs(s0)
+    assert n <= 20
+
+
+def test_exact_quadratic_step():
+    A = np.array([[50.0, 3.0], [3.0, 1.0]])
+    x = np.array([6.0, 6.0])
+    g = A @ x
+    t = line_search.exact_quadratic(A, x, -g)
+    assert np.isclose(t, (g @ g) / (g @ A @ g))
+
+
+def test_line_search_gd_converges_from_unstable_lr():
+    # lr = 1.0 is far above 2/lambda_max = 0.04; plain GD would diverge
+    A = np.array([[50.0, 3.0], [3.0, 1.0]])
+    for method in ("armijo", "wolfe", "exact"):
+        theta = Parameter([6.0, 6.0])
+        opt = LineSearch(GD([theta], lr=1.0), method=method, A=A, max_evals=10)
+        closure = quadratic_closure(A, theta)
+        losses = [opt.step(closure) for _ in range(300)]
+
+        assert all(np.isfinite(losses))
+        assert losses[-1] < 1e-8
+        assert opt.n_evals <= 300 * (1 + 10)
+
+
+def test_line_search_exact_uses_no_extra_evaluations():
+    A = np.diag([10.0, 1.0])
+    theta = Parameter([1.0, 1.0])
+    opt = LineSearch(Momentum([theta], lr=0.5, beta=0.5), method="exact", A=A)
+    for _ in range(5):
+        opt.step(quadratic_closure(A, theta))
+    assert opt.n_evals == 5
+
+
+def test_failed_search_backs_off_once():
+    A = np.diag([10.0, 1.0])
+    theta = Parameter([1.0, 1.0])
+    # One trial at lr * grow = 200 overshoots far past the minimum: no decrease
+    opt = LineSearch(GD([theta], lr=100.0), method="armijo", max_evals=1)
+    opt.step(quadratic_closure(A, theta))
+    assert theta.data == [1.0, 1.0]
+    assert opt.lr == 50.0
+
+
+@pytest.mark.parametrize("lr", [1e3, 1e6])
+def test_failed_search_restarts_below_smallest_trial(lr):
+    # Far above 2/lambda_max: the first searches find no decrease at all, and
+    # must not be repeated from (almost) the same trial step
+    rng = np.random.default_rng(0)
+    Q, _ = np.linalg.qr(rng.normal(size=(4, 4)))
+    A = Q @ np.diag([60.0, 20.0, 5.0, 1.0]) @ Q.T
+    theta = Parameter([6.0, -4.0, 3.0, 2.0])
+    opt = LineSearch(GD([theta], lr=lr), method="armijo", max_evals=10)
+    closure = quadratic_closure(A, theta)
+
+    losses = [opt.step(closure) for _ in range(4)]
+    assert losses[-1] < 0.5 * losses[0]
+
+
+@pytest.mark.parametrize("foreach", [False, True])
+def test_momentum_search_follows_its_velocity(foreach):
+    A = np.array([[50.0, 3.0], [3.0, 1.0]])
+    theta = Parameter([6.0, 6.0])
+    mom = Momentum([theta], lr=1.0, beta=0.9, foreach=foreach)
+    opt = LineSearch(mom, method="armijo", max_evals=10)
+    closure = quadratic_closure(A, theta)
+
+    losses = []
+    for _ in range(200):
+        before = np.array(theta.data)
+        losses.append(opt.step(closure))
+        # The applied update is the stored velocity, as in a plain Momentum step
+        v = np.array(mom._v if foreach else mom.v[0])
+        assert np.allclose(np.array(theta.data) - before, v)
+
+    assert np.all(np.diff(losses) <= 1e-12)
+    assert losses[-1] < 1e-8
+
+
+def test_stateful_optimizers_are_rejected():
+    with pytest.raises(TypeError):
+        LineSearch(Adam([Parameter([1.0])], lr=0.1))
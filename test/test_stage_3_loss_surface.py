@@ -0,0 +1,72 @@
+import numpy as np
+
+from experiments.loss_surface import graph_fns, quadratic_fns, random_directions, surface, surface_2d
+from experiments.utils import make_quadratic_A, quadratic_loss
+
+
+A = make_quadratic_A(l1=10.0, l2=2.0, rot_rad=np.deg2rad(15))
+
+
+def test_surface_2d_matches_meshgrid():
+    xs = np.linspace(-3, 3, 7)
+    ys = np.linspace(-2, 2, 5)
+    loss_fn, _ = quadratic_fns(A)
+    Z = surface_2d(loss_fn, xs, ys)
+
+    X, Y = np.meshgrid(xs, ys)
+    P = np.stack([X, Y], axis=-1)
+    assert Z.shape == (5, 7)
+    assert np.allclose(Z, 0.5 * np.einsum("...i,ij,...j->...", P, A, P))
+
+
+def test_batched_fns_match_autodiff_graph():
+    pts = np.random.default_rng(1).standard_normal((6, 2))
+    loss_fn, grad_fn = quadratic_fns(A)
+    g_loss, g_grad = graph_fns(lambda theta: quadratic_loss(A, theta))
+    assert np.allclose(loss_fn(pts), g_loss(pts))
+    assert np.allclose(grad_fn(pts), g_grad(pts))
+
+
+def test_chunking_does_not_change_result():
+    n = 30
+    M = np.random.default_rng(2).standard_normal((n, n))
+    loss_fn, grad_fn = quadratic_fns(M @ M.T)
+    d1, d2 = random_directions(n, rng=3)
+    center = np.ones(n)
+    ab = np.linspace(-1, 1, 21)
+
+    full = surface(loss_fn, center, d1, d2, ab, ab, grad_fn=grad_fn, chunk=10**6)
+    small = surface(loss_fn, center, d1, d2, ab, ab, grad_fn=grad_fn, chunk=17)
+    for x, y in zip(full, small):
+        assert np.allclose(x, y)
+
+
+def test_projected_gradient_is_slope_along_directions():
+    n = 10
+    loss_fn, grad_fn = quadratic_fns(np.diag(np.arange(1.0, n + 1)))
+    d1, d2 = random_directions(n, rng=4)
+    assert np.isclose(d1 @ d2, 0.0) and np.isclose(d1 @ d1, 1.0)
+
+    ab = np.linspace(-1, 1, 201)
+    Z, G1, G2 = surface(loss_fn, np.ones(n), d1, d2, ab, ab, grad_fn=grad_fn)
+    h = ab[1] - ab[0]
+    assert np.allclose(np.gradient(Z, h, axis=1)[1:-1, 1:-1], G1[1:-1, 1:-1], atol=1e-6)
+    assert np.allclose(np.gradient(Z, h, axis=0)[1:-1, 1:-1], G2[1:-1, 1:-1], atol=1e-6)
+
+
+def test_graph_fns_build_each_graph_once_per_point():
+    calls = []
+
+    def build(theta):
+        calls.append(1)
+        return quadratic_loss(A, theta)
+
+    loss_fn, grad_fn = graph_fns(build)
+    ab = np.linspace(-1, 1, 4)
+    Z, G1, G2 = surface(loss_fn, np.zeros(2), [1.0, 0.0], [0.0, 1.0], ab, ab, grad_fn=grad_fn, chunk=5)
+    assert len(calls) == 16
+
+    q_loss, q_grad = quadratic_fns(A)
+    ref = surface(q_loss, np.zeros(2), [1.0, 0.0], [0.0, 1.0], ab, ab, grad_fn=q_grad)
+    for x, y in zip((Z, G1, G2), ref):
+        assert np.allclose(x, y)
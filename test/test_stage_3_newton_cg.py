@@ -0,0 +1,54 @@
+import numpy as np
+
+from core.parameter import Parameter
+from core.optim import NewtonCG, hvp
+from core.ops import matvec, mul, sum_pop
+
+
+def quadratic_closure(A, theta):
+    """L = 1/2 theta^T A theta through the autodiff engine."""
+    def closure():
+        loss = mul(0.5, sum_pop(mul(theta, matvec(A, theta))))
+        loss.backprop()
+        return loss
+    return closure
+
+
+def spd(n, kappa, seed=0):
+    rng = np.random.default_rng(seed)
+    Q, _ = np.linalg.qr(rng.normal(size=(n, n)))
+    return Q @ np.diag(np.geomspace(1.0, kappa, n)) @ Q.T
+
+
+def test_hvp_matches_matrix_product_and_restores_state():
+    A = spd(4, 50.0)
+    theta = Parameter([1.0, -2.0, 0.5, 3.0])
+    theta.grad = [9.0, 9.0, 9.0, 9.0]
+    v = np.array([0.3, -1.0, 2.0, 0.1])
+
+    Hv = hvp([theta], quadratic_closure(A, theta), v)
+
+    assert np.allclose(Hv, A @ v, atol=1e-5)
+    assert theta.data == [1.0, -2.0, 0.5, 3.0]
+    assert theta.grad == [9.0, 9.0, 9.0, 9.0]
+
+
+def test_newton_cg_reaches_tight_tolerance_on_high_kappa():
+    A = spd(10, 1e4)
+    theta = Parameter(np.ones(10).tolist())
+    opt = NewtonCG([theta])
+    closure = quadratic_closure(A, theta)
+
+    for _ in range(10):
+        opt.step(closure)
+
+    assert max(abs(x) for x in theta.data) < 1e-8
+
+
+def test_newton_cg_exact_solve_takes_one_step():
+    # With a tight fixed forcing term, one step lands on the minimum
+    A = np.array([[50.0, 3.0], [3.0, 1.0]])
+    theta = Parameter([6.0, 6.0])
+    opt = NewtonCG([theta], cg_tol=1e-12)
+    opt.step(quadratic_closure(A, theta))
+    assert max(abs(x) for x in theta.data) < 1e-8
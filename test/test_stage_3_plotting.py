@@ -0,0 +1,45 @@
+import sys
+
+import numpy as np
+
+from utils.plotting import FigureJob, downsample, new_figure, plot_curve, plot_trajectory, render_many
+
+
+def draw_line(fig, n):
+    ax = fig.subplots()
+    ax.plot(np.arange(n), np.arange(n) ** 2)
+
+
+def test_downsample_keeps_endpoints_and_caps_points():
+    assert np.array_equal(downsample(10, 100), np.arange(10))
+    idx = downsample(10**6, 1000)
+    assert len(idx) <= 1000
+    assert idx[0] == 0 and idx[-1] == 10**6 - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_plot_trajectory_draws_at_most_max_points():
+    traj = np.cumsum(np.random.default_rng(0).standard_normal((200_000, 2)), axis=0)
+    fig, ax = new_figure()
+    (line,) = plot_trajectory(ax, traj, max_points=500)
+    x, y = line.get_data()
+    assert len(x) <= 500
+    assert (x[0], y[-1]) == (traj[0, 0], traj[-1, 1])
+
+
+def test_plot_curve_keeps_spikes():
+    losses = np.exp(-np.linspace(0, 10, 100_000))
+    losses[54_321] = 5.0
+    fig, ax = new_figure()
+    (line,) = plot_curve(ax, losses, max_points=200)
+    x, y = line.get_data()
+    assert len(x) <= 202
+    assert 54_321 in x and y.max() == 5.0
+
+
+def test_render_many_in_workers_without_pyplot(tmp_path):
+    jobs = [FigureJob(draw_line, str(tmp_path), f"fig_{i}.png", (10 * (i + 1),)) for i in range(3)]
+    paths = render_many(jobs, processes=2)
+    assert paths == [str(tmp_path / f"fig_{i}.png") for i in range(3)]
+    assert all((tmp_path / f"fig_{i}.png").stat().st_size > 0 for i in range(3))
+    assert "matplotlib.pyplot" not in sys.modules
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from core.optim import GD
+from experiments.regression import batch_loss, make_dataset, predict, train
+from experiments.utils import ArrayLoader
+from models.mlp import MLP
+
+
+def test_loader_visits_every_sample_once_per_epoch():
+    X = np.arange(20.0).reshape(10, 2)
+    y = np.arange(10.0)
+    loader = ArrayLoader(X, y, batch_size=4, seed=0)
+    assert len(loader) == 3
+
+    seen = []
+    for xb, yb in loader:
+        assert xb.flags.c_contiguous
+        assert np.array_equal(xb[:, 0], 2 * yb)     # rows stay paired with targets
+        seen.extend(yb.tolist())
+    assert sorted(seen) == list(range(10))
+    assert [len(b[1]) for b in loader] == [4, 4, 2]
+
+
+def test_loader_reuses_buffers_and_reshuffles():
+    X = np.arange(100.0).reshape(100, 1)
+    loader = ArrayLoader(X, np.zeros(100), batch_size=10, seed=1)
+    first = [xb.copy() for xb, _ in loader]
+    second = [xb.copy() for xb, _ in loader]
+    assert not all(np.array_equal(a, b) for a, b in zip(first, second))
+
+    batches = iter(loader)
+    xb1, _ = next(batches)
+    xb2, _ = next(batches)
+    assert xb1 is not xb2 and np.shares_memory(xb1, xb2)
+
+
+def test_loader_without_shuffle_yields_views_and_drop_last():
+    X = np.arange(10.0).reshape(10, 1)
+    loader = ArrayLoader(X, X[:, 0], batch_size=3, shuffle=False, drop_last=True)
+    batches = [xb for xb, _ in loader]
+    assert len(batches) == len(loader) == 3
+    assert all(np.shares_memory(b, X) for b in batches)
+    assert len(list(loader.batches(7))) == 7
+
+
+def test_loader_rejects_settings_that_yield_no_batches():
+    X = np.arange(10.0).reshape(5, 2)
+    with pytest.raises(ValueError):
+        ArrayLoader(X, X[:, 0], batch_size=0)
+
+    for loader in (ArrayLoader(X, X[:, 0], batch_size=8, drop_last=True),
+                   ArrayLoader(X[:0], X[:0, 0], batch_size=8)):
+        assert list(loader) == []
+        with pytest.raises(ValueError):
+            next(loader.batches(3))
+
+
+def test_minibatch_sgd_reduces_test_error():
+    X, y = make_dataset(2000)
+    X_test, y_test = make_dataset(200, noise=0.0, seed=1)
+    model = MLP(2, [8, 1], seed=0)
+    before = np.mean((predict(model, X_test) - y_test) ** 2)
+
+    loader = ArrayLoader(X, y, batch_size=16, seed=0)
+    losses, rate = train(model, loader, GD(model.parameters(), lr=0.1), steps=60, log_every=0)
+
+    assert losses.shape == (60,) and rate > 0
+    assert np.mean((predict(model, X_test) - y_test) ** 2) < 0.5 * before
+    assert np.isclose(batch_loss(model, X_test, y_test).data[0],
+                      np.mean((predict(model, X_test) - y_test) ** 2))
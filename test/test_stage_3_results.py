@@ -0,0 +1,89 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from experiments.results import MANIFEST_FILE, ResultsWriter, load_results, save_results
+
+
+def test_roundtrip_nested_results(tmp_path):
+    traj = np.random.default_rng(0).standard_normal((1000, 2))
+    results = {
+        "experiment_1": {"experiment": 1, "inputs": [-6, -0.5, 0, 3.0], "gradients": [0.1, 0.7, 1.0, 0.01]},
+        "experiment_2": {"depth_gradients": {0.5: [0.27], 4.5: [1e-9]}},
+        "labels": ["gd", "momentum"],
+        "traj": traj,
+        "kappa": np.float64(80.0),
+    }
+    root = save_results(str(tmp_path / "run"), results, attrs={"lr": 0.02})
+
+    res = load_results(root)
+    assert res.attrs == {"lr": 0.02}
+    assert set(res.arrays) == {"experiment_1/inputs", "experiment_1/gradients",
+                               "experiment_2/depth_gradients/0.5", "experiment_2/depth_gradients/4.5", "traj"}
+    assert res.arrays["traj"]["shape"] == [1000, 2]
+    np.testing.assert_array_equal(res["traj"], traj)
+    assert isinstance(res["traj"], np.memmap)
+    np.testing.assert_array_equal(res["experiment_1/inputs"], [-6.0, -0.5, 0.0, 3.0])
+    assert res["experiment_1/experiment"] == 1
+    assert res["labels"] == ["gd", "momentum"]
+    assert res["kappa"] == 80.0
+
+    tree = res.tree()
+    np.testing.assert_array_equal(tree["experiment_2"]["depth_gradients"]["0.5"], [0.27])
+    assert "experiment_2/depth_gradients/4.5" in res and "nope" not in res
+
+
+def test_arrays_are_loaded_lazily(tmp_path):
+    root = save_results(str(tmp_path / "run"), {"a": np.arange(10.0), "b": np.ones(3)})
+    res = load_results(root)
+    os.remove(os.path.join(root, res.arrays["b"]["file"]))
+    assert res["a"][3] == 3.0           # only a's file is opened
+    with pytest.raises(FileNotFoundError):
+        res["b"]
+
+
+def test_overwrite_and_existing(tmp_path):
+    root = str(tmp_path / "run")
+    save_results(root, {"a": np.zeros(5), "b": np.zeros(5)})
+    with pytest.raises(FileExistsError):
+        save_results(root, {"a": np.ones(5)})
+    save_results(root, {"a": np.ones(5)}, overwrite=True)
+    res = load_results(root)
+    assert list(res.arrays) == ["a"] and res["a"].sum() == 5.0
+    assert sorted(os.listdir(root)) == sorted([MANIFEST_FILE, res.arrays["a"]["file"]])
+
+
+def test_writer_without_close_is_not_readable(tmp_path):
+    w = ResultsWriter(str(tmp_path / "run"))
+    w.add("x", np.arange(3))
+    with pytest.raises(FileNotFoundError):
+        load_results(str(tmp_path / "run"))
+    w.close()
+    assert load_results(str(tmp_path / "run"))["x"].tolist() == [0, 1, 2]
+
+
+def test_smaller_than_indented_json(tmp_path):
+    x = np.random.default_rng(0).standard_normal(100_000)
+    root = save_results(str(tmp_path / "run"), {"x": x})
+    binary = sum(os.path.getsize(os.path.join(root, f)) for f in os.listdir(root))
+    assert binary < 0.5 * len(json.dumps({"x": x.tolist()}, indent=4))
+
+
+def test_exception_inside_writer_leaves_no_manifest(tmp_path):
+    root = str(tmp_path / "run")
+    with pytest.raises(RuntimeError):
+        with ResultsWriter(root) as w:
+            w.add("x", np.arange(3))
+            raise RuntimeError("interrupted")
+    assert not os.path.exists(os.path.join(root, MANIFEST_FILE))
+    with pytest.raises(FileNotFoundError):
+        load_results(root)
+
+
+def test_keys_with_slash_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        save_results(str(tmp_path / "a"), {"a": {"x/y": [1.0, 2.0]}})
+    with pytest.raises(ValueError):
+        save_results(str(tmp_path / "b"), {"x/y": [1.0, 2.0]})
@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pytest
+
+from experiments.results import save_results
+from experiments.results_index import ResultsIndex, runs_from_sweep
+from experiments.utils import make_quadratic_A, sweep_gd
+
+
+@pytest.fixture
+def index(tmp_path):
+    with ResultsIndex(str(tmp_path / "index.sqlite")) as idx:
+        yield idx
+
+
+def test_sweep_runs_are_indexed_and_queryable(index, tmp_path):
+    A = make_quadratic_A(l1=60.0, l2=1.0)
+    lrs = [0.001, 0.02, 0.03, 0.034]            # 2/lmax = 0.0333: the last one diverges
+    trajs, losses = sweep_gd(A, [1.0, 1.0], lrs, steps=400)
+    root = save_results(str(tmp_path / "sweep"), {"trajs": trajs})
+
+    runs = runs_from_sweep("sweep", losses, lrs, kappa=60.0, loss_tol=1e-6, results=root, array="trajs")
+    assert index.add_many(runs) == 4
+
+    fast = index.query("kappa > ? AND converged AND stop_step < ?", (50, 400), order_by="lr")
+    assert [r["lr"] for r in fast] == [0.02, 0.03]
+    assert all(r["loss_tol"] == 1e-6 for r in fast)    # extra keys come back from params
+
+    diverged = index.query(lr=0.034)[0]
+    assert diverged["converged"] == 0 and diverged["stop_step"] is None and diverged["reason"] == ""
+    assert {r["reason"] for r in fast} == {"converged"}
+    np.testing.assert_array_equal(index.load(diverged), trajs[3])
+
+
+def test_bulk_insert_is_one_transaction(index):
+    index.add_many([{"experiment": "a", "lr": 0.1}] * 1000)
+    with pytest.raises(Exception):
+        index.add_many([{"experiment": "b"}, {"experiment": None}])    # NOT NULL fails on the second
+    assert len(index) == 1000
+    assert index.query(experiment="b") == []
+
+
+def test_replace_drops_stale_runs_of_same_results(index):
+    index.add_many([{"experiment": "e", "results": "r1", "row": k} for k in range(5)])
+    index.add_many([{"experiment": "e", "results": "r2"}])
+    index.add_many([{"experiment": "e", "results": "r1", "row": k} for k in range(3)], replace=True)
+    assert len(index.query(results="r1")) == 3
+    assert len(index.query(results="r2")) == 1
+
+
+def test_queries_use_indexes(index):
+    assert "runs_kappa" in index.explain("kappa > 50")
+    assert "runs_converged" in index.explain("converged = 1 AND stop_step < 100")
+    with pytest.raises(KeyError):
+        index.query(not_a_column=1)
+
+
+def test_results_paths_are_relative_to_the_index(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root = save_results(os.path.join("outputs", "run"), {"x": np.arange(4.0)})
+    path = str(tmp_path / "outputs" / "index.sqlite")
+    with ResultsIndex(path) as index:
+        index.add(experiment="e", results=root, array="x")
+        assert index.query()[0]["results"] == "run"
+
+    monkeypatch.chdir(tmp_path / "outputs")
+    with ResultsIndex("index.sqlite") as index:
+        run = index.query(results="run")[0]
+        np.testing.assert_array_equal(index.load(run), np.arange(4.0))
+        index.add_many([dict(experiment="e", results="run", array="x")], replace=True)
+        assert len(index) == 1
+
+
+def test_ensemble_stop_step_is_only_set_for_converged_members(tmp_path, monkeypatch):
+    from experiments import ensemble
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ensemble, "sample_box", lambda n, lo, hi, rng=None: np.array([[1.0, 1.0], [1e200, 1e200]]))
+    ensemble.main(n_points=2, steps=300)
+    with ResultsIndex(os.path.join("outputs", "results.sqlite")) as index:
+        runs = index.query(experiment="ensemble")
+    assert {r["reason"] for r in runs} == {"converged", "non-finite"}
+    for r in runs:
+        assert (r["stop_step"] is not None) == (r["reason"] == "converged")
@@ -0,0 +1,48 @@
+from experiments.run_all import discover, experiment_seed, run_all, run_one
+
+
+def test_discover_finds_scripts_with_main_only():
+    names = discover()
+    assert "hessian_spectrum" in names
+    assert "momentum_vs_gd" in names
+    assert "utils" not in names        # library module, no main()
+    assert "run_all" not in names
+    assert names == sorted(names)
+
+
+def test_seeds_are_deterministic_and_distinct():
+    assert experiment_seed(0, "xor") == experiment_seed(0, "xor")
+    assert experiment_seed(0, "xor") != experiment_seed(0, "regression")
+    assert experiment_seed(0, "xor") != experiment_seed(1, "xor")
+
+
+def test_failures_are_isolated_and_recorded(tmp_path):
+    rec = run_one("does_not_exist", 0, str(tmp_path))
+    assert rec["ok"] is False
+    assert "ModuleNotFoundError" in rec["error"]
+    assert "Traceback" in open(rec["log"]).read()
+
+    records = run_all(["does_not_exist"], jobs=1, logdir=str(tmp_path))
+    assert [r["name"] for r in records] == ["does_not_exist"]
+    assert records[0]["ok"] is False
+
+
+def test_run_one_restores_caller_state(tmp_path, monkeypatch):
+    import os
+    import random
+    import sys
+
+    import numpy as np
+
+    monkeypatch.chdir(tmp_path)
+    path_before = list(sys.path)
+    random.seed(123)
+    np.random.seed(123)
+    expected = (random.random(), np.random.rand())
+    random.seed(123)
+    np.random.seed(123)
+
+    run_one("does_not_exist", 0, str(tmp_path))
+    assert os.getcwd() == str(tmp_path)
+    assert sys.path == path_before
+    assert (random.random(), np.random.rand()) == expected
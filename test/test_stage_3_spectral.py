@@ -0,0 +1,57 @@
+import numpy as np
+
+from experiments.spectral import SpectralQuadratic
+from experiments.utils import make_quadratic_A, run_gd, run_momentum
+
+
+A = make_quadratic_A(l1=60.0, l2=1.0, rot_rad=np.deg2rad(30))
+THETA0 = [6.0, 6.0]
+
+
+def test_gd_matches_autodiff_run():
+    traj, losses = run_gd(A, THETA0, lr=0.02, steps=80)
+    s_traj, s_losses = SpectralQuadratic(A).gd(THETA0, lr=0.02, steps=80)
+
+    assert s_traj.shape == traj.shape
+    assert s_losses.shape == losses.shape
+    assert np.allclose(s_traj, traj, atol=1e-9)
+    assert np.allclose(s_losses, losses, rtol=1e-9, atol=1e-12)
+
+
+def test_momentum_matches_autodiff_run():
+    for beta in (0.0, 0.5, 0.9):
+        traj, v, losses = run_momentum(A, THETA0, lr=0.02, beta=beta, steps=80)
+        s_traj, s_v, s_losses = SpectralQuadratic(A).momentum(THETA0, lr=0.02, beta=beta, steps=80)
+
+        assert np.allclose(s_traj, traj, atol=1e-9)
+        assert np.allclose(s_v, v, atol=1e-9)
+        assert np.allclose(s_losses, losses, rtol=1e-9, atol=1e-12)
+
+
+def test_momentum_repeated_root_is_handled():
+    # Critical damping: (1 + beta - lr*lam)^2 = 4 beta, with lam = 1, beta = 0.25 -> lr = 0.25
+    A1 = np.array([[1.0]])
+    traj, v, losses = run_momentum(A1, [1.0], lr=0.25, beta=0.25, steps=30)
+    s_traj, s_v, _ = SpectralQuadratic(A1).momentum([1.0], lr=0.25, beta=0.25, steps=30)
+    assert np.allclose(s_traj, traj, atol=1e-12)
+    assert np.allclose(s_v, v, atol=1e-12)
+
+
+def test_single_step_queries_match_full_trajectory():
+    sq = SpectralQuadratic(A)
+    traj, losses = sq.gd(THETA0, lr=0.02, steps=50)
+    theta_t, loss_t = sq.gd_at(THETA0, lr=0.02, t=37)
+    assert np.allclose(theta_t, traj[37])
+    assert np.isclose(loss_t, losses[37])
+
+    traj, v, losses = sq.momentum(THETA0, lr=0.02, beta=0.9, steps=50)
+    theta_t, v_t, loss_t = sq.momentum_at(THETA0, lr=0.02, beta=0.9, t=50)
+    assert np.allclose(theta_t, traj[50])
+    assert np.allclose(v_t, v[50])
+
+
+def test_far_future_step_without_simulation():
+    # Step 10^6 of a convergent run is at the minimum; no stepping required
+    theta_t, loss_t = SpectralQuadratic(A).gd_at(THETA0, lr=0.02, t=10**6)
+    assert np.allclose(theta_t, 0.0)
+    assert loss_t < 1e-12
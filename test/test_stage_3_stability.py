@@ -0,0 +1,66 @@
+import numpy as np
+
+from core.stopping import BatchStopMonitor
+from experiments.stability import (
+    gd_spectral_radius, momentum_lr_max, momentum_spectral_radius, scan, simulate_rates,
+)
+from experiments.utils import make_quadratic_A, eigs, sweep_gd
+
+
+A = make_quadratic_A(l1=10.0, l2=2.0, rot_rad=np.deg2rad(15))
+
+
+def test_gd_boundary_is_eta_crit():
+    _, _, lmax, _ = eigs(A)
+    rho = gd_spectral_radius(A, [0.99 * 2 / lmax, 1.01 * 2 / lmax])
+    assert rho[0] < 1.0 < rho[1]
+
+
+def test_gd_radius_matches_batched_runs():
+    lrs = np.linspace(0.01, 0.25, 7)
+    # Divergent rows too: measuring their growth needs them to keep running
+    _, losses = sweep_gd(A, [5.0, -4.0], lrs, steps=400, monitor=BatchStopMonitor(max_growth=None))
+    # loss ~ rho^(2t) asymptotically
+    empirical = (losses[:, -1] / losses[:, -101]) ** (1 / 200)
+    assert np.allclose(empirical, gd_spectral_radius(A, lrs), rtol=1e-3)
+
+
+def test_beta_zero_row_is_gd():
+    lrs = np.linspace(0.0, 0.3, 50)
+    rho, _ = scan(A, lrs, betas=[0.0])
+    assert np.allclose(rho[0], gd_spectral_radius(A, lrs))
+
+
+def test_momentum_complex_regime_has_radius_sqrt_beta():
+    # Optimal heavy-ball tuning puts every mode in the complex regime
+    lmin, lmax = 2.0, 10.0
+    beta = ((np.sqrt(lmax) - np.sqrt(lmin)) / (np.sqrt(lmax) + np.sqrt(lmin))) ** 2
+    lr = 4.0 / (np.sqrt(lmax) + np.sqrt(lmin)) ** 2
+    assert np.isclose(momentum_spectral_radius(A, lr, beta), np.sqrt(beta))
+
+
+def test_scan_boundary_and_simulation_agree():
+    lrs = np.linspace(0.01, 0.5, 40)
+    betas = np.linspace(0.0, 0.95, 30)
+    rho, stable = scan(A, lrs, betas)
+    assert rho.shape == stable.shape == (30, 40)
+
+    for i, beta in enumerate(betas):
+        assert np.array_equal(stable[i], lrs < momentum_lr_max(A, beta))
+
+    lr_grid, beta_grid = np.meshgrid(lrs, betas)
+    est = simulate_rates(A, lr_grid, beta_grid, steps=600, chunk=500)
+    far = np.abs(rho - 1.0) > 0.02
+    assert np.array_equal((est < 1.0)[far], stable[far])
+    assert np.allclose(est, rho, rtol=0.05)
+
+
+def test_momentum_radius_is_max_over_whole_spectrum():
+    # Only lam_min and lam_max are evaluated; interior eigenvalues never dominate
+    lam = np.random.default_rng(0).uniform(0.5, 20.0, size=200)
+    lr_grid, beta_grid = np.meshgrid(np.linspace(0.0, 0.3, 60), np.linspace(-0.2, 0.99, 50))
+
+    T = 1.0 + beta_grid[..., None] - lr_grid[..., None] * lam
+    roots = np.abs(np.stack([(T + np.sqrt(T * T - 4.0 * beta_grid[..., None] + 0j)) / 2,
+                             (T - np.sqrt(T * T - 4.0 * beta_grid[..., None] + 0j)) / 2]))
+    assert np.allclose(momentum_spectral_radius(lam, lr_grid, beta_grid), roots.max(axis=(0, -1)))
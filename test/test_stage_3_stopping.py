@@ -0,0 +1,94 @@
+import math
+import numpy as np
+
+from core.optim import GD, LBFGS, LineSearch, Momentum, NewtonCG
+from core.stopping import StopMonitor
+from experiments.utils import make_quadratic_A, eigs, run_gd, run_momentum, run_optimizer
+
+
+def test_monitor_flags_non_finite():
+    m = StopMonitor()
+    assert not m.check(1.0, [0.5])
+    assert m.check(math.inf, [0.5])
+    assert m.reason == "non-finite"
+    assert m.step == 1
+
+
+def test_monitor_flags_growth_relative_to_initial_loss():
+    m = StopMonitor(max_growth=100.0)
+    assert not m.check(2.0)
+    assert not m.check(150.0)
+    assert m.check(250.0)
+    assert m.reason == "diverged"
+
+
+def test_monitor_flags_convergence_on_grad_norm():
+    m = StopMonitor(grad_tol=1e-3)
+    assert not m.check(1.0, [3.0, 4.0])
+    assert m.check(1e-8, [3e-4, 4e-4])
+    assert m.reason == "converged"
+    assert math.isclose(m.grad_norm, 5e-4)
+
+
+def test_check_norm_matches_check_on_the_gradient():
+    by_grad, by_norm = StopMonitor(grad_tol=1e-3), StopMonitor(grad_tol=1e-3)
+    for loss, grad in [(1.0, [3.0, 4.0]), (0.5, [0.3, 0.4]), (1e-8, [3e-4, 4e-4])]:
+        assert by_grad.check(loss, grad) == by_norm.check_norm(loss, math.hypot(*grad))
+    assert (by_norm.reason, by_norm.step) == (by_grad.reason, by_grad.step) == ("converged", 2)
+
+    m = StopMonitor()
+    assert m.check_norm(1.0, math.nan)
+    assert m.reason == "non-finite"
+
+
+def test_run_gd_stops_early_above_stability_boundary():
+    A = make_quadratic_A(l1=10.0, l2=2.0, rot_rad=np.deg2rad(15))
+    _, _, lmax, _ = eigs(A)
+    monitor = StopMonitor(max_growth=1e3)
+
+    traj, losses = run_gd(A, [5.0, -4.0], lr=1.10 * 2.0 / lmax, steps=1000, monitor=monitor)
+
+    assert monitor.reason == "diverged"
+    assert len(losses) == monitor.step + 1 < 1000
+    assert len(traj) == len(losses)
+
+
+def test_run_gd_without_monitor_keeps_full_length():
+    A = np.diag([2.0, 1.0])
+    traj, losses = run_gd(A, [1.0, 1.0], lr=0.1, steps=7)
+    assert traj.shape == (8, 2)
+    assert losses.shape == (7,)
+
+
+def test_run_momentum_and_optimizer_stop_on_convergence():
+    A = np.diag([10.0, 1.0])
+
+    monitor = StopMonitor(grad_tol=1e-6)
+    traj, v, losses = run_momentum(A, [1.0, 1.0], lr=0.05, beta=0.5, steps=5000, monitor=monitor)
+    assert monitor.reason == "converged"
+    assert len(losses) < 5000
+
+    monitor = StopMonitor(grad_tol=1e-6)
+    traj, losses = run_optimizer(A, [1.0, 1.0], lambda ps: Momentum(ps, lr=0.05, beta=0.5), 5000, monitor)
+    assert monitor.reason == "converged"
+    assert len(losses) < 5000
+
+
+def test_run_optimizer_stops_closure_optimizers_on_grad_norm():
+    A = np.array([[50.0, 3.0], [3.0, 1.0]])
+    for make_opt in (lambda ps: LBFGS(ps, history_size=5),
+                     lambda ps: NewtonCG(ps),
+                     lambda ps: LineSearch(GD(ps, lr=1.0))):
+        monitor = StopMonitor(grad_tol=1e-6)
+        traj, losses = run_optimizer(A, [6.0, 6.0], make_opt, 500, monitor)
+        assert monitor.reason == "converged"
+        assert monitor.grad_norm <= 1e-6
+        assert len(losses) < 500
+        # traj ends at the theta the monitor fired on, like run_gd
+        assert len(traj) == len(losses)
+        assert np.isclose(0.5 * traj[-1] @ A @ traj[-1], losses[-1])
+
+    monitor = StopMonitor(loss_tol=1e-10)
+    traj, losses = run_optimizer(A, [6.0, 6.0], lambda ps: LBFGS(ps), 500, monitor)
+    assert monitor.reason == "converged"
+    assert len(traj) == len(losses)
@@ -0,0 +1,42 @@
+import itertools
+
+import numpy as np
+
+from core.stopping import StopMonitor
+from experiments.streaming import collect, every, stream_gd, stream_momentum, until
+from experiments.utils import make_quadratic_A, run_gd, run_momentum
+
+
+A = make_quadratic_A(l1=10.0, l2=2.0, rot_rad=np.deg2rad(15))
+THETA0 = [5.0, -4.0]
+
+
+def test_stream_gd_matches_run_gd():
+    traj, losses = run_gd(A, THETA0, lr=0.05, steps=25)
+    steps, thetas, stream_losses, grad_norms = collect(stream_gd(A, THETA0, lr=0.05, steps=25))
+
+    assert list(steps) == list(range(25))
+    assert np.allclose(thetas, traj[:-1])
+    assert np.allclose(stream_losses, losses)
+    assert np.allclose(grad_norms, np.linalg.norm(traj[:-1] @ A, axis=1))
+
+
+def test_stream_momentum_matches_run_momentum():
+    traj, _, losses = run_momentum(A, THETA0, lr=0.02, beta=0.9, steps=20)
+    _, thetas, stream_losses, _ = collect(stream_momentum(A, THETA0, lr=0.02, beta=0.9, steps=20))
+    assert np.allclose(thetas, traj[:-1])
+    assert np.allclose(stream_losses, losses)
+
+
+def test_unbounded_stream_is_lazy():
+    first = list(itertools.islice(stream_gd(A, THETA0, lr=0.05), 3))
+    assert [rec.step for rec in first] == [0, 1, 2]
+
+
+def test_filters_compose():
+    monitor = StopMonitor(grad_tol=1e-6)
+    records = list(every(until(stream_gd(A, THETA0, lr=0.05), monitor), 10))
+
+    assert monitor.reason == "converged"
+    assert all(rec.step % 10 == 0 for rec in records)
+    assert records[-1].step <= monitor.step < records[-1].step + 10
@@ -0,0 +1,91 @@
+import warnings
+
+import numpy as np
+
+from core.stopping import BatchStopMonitor, StopMonitor
+from experiments.utils import make_quadratic_A, eigs, run_gd, run_momentum, sweep_gd, sweep_momentum
+
+
+A = make_quadratic_A(l1=10.0, l2=2.0, rot_rad=np.deg2rad(15))
+THETA0 = [5.0, -4.0]
+
+
+def test_sweep_gd_matches_sequential_runs():
+    _, _, lmax, _ = eigs(A)
+    lrs = [0.5 * 2 / lmax, 0.99 * 2 / lmax, 1.10 * 2 / lmax]
+    trajs, losses = sweep_gd(A, THETA0, lrs, steps=40)
+
+    assert trajs.shape == (3, 41, 2)
+    assert losses.shape == (3, 40)
+    for k, lr in enumerate(lrs):
+        traj, loss = run_gd(A, THETA0, lr=lr, steps=40)
+        assert np.allclose(trajs[k], traj)
+        assert np.allclose(losses[k], loss)
+
+
+def test_sweep_momentum_broadcasts_beta():
+    lrs = [0.01, 0.05]
+    trajs, v_trajs, losses = sweep_momentum(A, THETA0, lrs, 0.9, steps=30)
+
+    assert trajs.shape == v_trajs.shape == (2, 31, 2)
+    for k, lr in enumerate(lrs):
+        traj, v, loss = run_momentum(A, THETA0, lr=lr, beta=0.9, steps=30)
+        assert np.allclose(trajs[k], traj)
+        assert np.allclose(v_trajs[k], v)
+        assert np.allclose(losses[k], loss)
+
+
+def test_sweep_gd_large_sweep_flags_divergence_at_boundary():
+    _, _, lmax, _ = eigs(A)
+    lrs = np.linspace(0.01, 1.5 * 2 / lmax, 1000)
+    _, losses = sweep_gd(A, THETA0, lrs, steps=200)
+
+    diverged = ~(losses[:, -1] < losses[:, 0])
+    assert np.all(diverged == (lrs > 2 / lmax))
+
+
+def test_divergent_rows_are_frozen_with_stop_monitor_steps():
+    _, _, lmax, _ = eigs(A)
+    lrs = [0.5 * 2 / lmax, 1.5 * 2 / lmax, 3.0 * 2 / lmax]
+    monitor = BatchStopMonitor(max_growth=1e6)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        trajs, losses = sweep_gd(A, THETA0, lrs, steps=300, monitor=monitor)
+
+    assert list(monitor.reason) == ["", "diverged", "diverged"]
+    assert monitor.step[1] > monitor.step[2] > 0
+    for k in (1, 2):
+        single = StopMonitor(max_growth=1e6)
+        traj, loss = run_gd(A, THETA0, lr=lrs[k], steps=300, monitor=single)
+        t = monitor.step[k]
+        assert t == single.step
+        assert np.allclose(losses[k, : t + 1], loss)
+        assert np.all(np.isnan(losses[k, t + 1:]))
+        assert np.all(trajs[k, t:] == trajs[k, t])        # frozen where it was checked
+        assert np.allclose(trajs[k, t], traj[-1])
+    assert np.all(np.isfinite(trajs))
+
+
+def test_sweep_momentum_stops_converged_rows():
+    monitor = BatchStopMonitor(grad_tol=1e-6)
+    trajs, v_trajs, losses = sweep_momentum(A, THETA0, [0.01, 0.05], 0.5, steps=2000, monitor=monitor)
+    for k, lr in enumerate([0.01, 0.05]):
+        single = StopMonitor(grad_tol=1e-6)
+        traj, v, loss = run_momentum(A, THETA0, lr=lr, beta=0.5, steps=2000, monitor=single)
+        assert monitor.reason[k] == single.reason == "converged"
+        assert monitor.step[k] == single.step
+        assert np.allclose(trajs[k, -1], traj[-1]) and np.allclose(v_trajs[k, -1], v[-1])
+
+
+def test_sweep_momentum_takes_per_row_starts_and_skips_recording():
+    theta0s = np.array([[5.0, -4.0], [1.0, 2.0], [-3.0, 0.5]])
+    lrs, betas = [0.01, 0.05, 0.02], [0.9, 0.5, 0.0]
+    trajs, v_trajs, losses = sweep_momentum(A, theta0s, lrs, betas, steps=30)
+    final, v_final, none = sweep_momentum(A, theta0s, lrs, betas, steps=30, record_trajs=False,
+                                          record_losses=False)
+
+    assert final.shape == v_final.shape == (3, 1, 2) and none is None
+    for k in range(3):
+        traj, v, loss = run_momentum(A, theta0s[k].tolist(), lr=lrs[k], beta=betas[k], steps=30)
+        assert np.allclose(trajs[k], traj) and np.allclose(losses[k], loss)
+        assert np.array_equal(final[k, -1], trajs[k, -1]) and np.array_equal(v_final[k, -1], v_trajs[k, -1])
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from core.stopping import StopMonitor
+from experiments.trajectory import TrajectoryRecorder
+from experiments.utils import make_quadratic_A, run_gd, run_momentum
+
+
+A = make_quadratic_A(l1=10.0, l2=2.0, rot_rad=np.deg2rad(15))
+THETA0 = [5.0, -4.0]
+
+
+def test_run_gd_fills_preallocated_buffer():
+    traj, losses = run_gd(A, THETA0, lr=0.05, steps=30)
+    assert traj.shape == (31, 2)
+    assert losses.shape == (30,)
+
+    # Same states as stepping by hand
+    theta = np.array(THETA0)
+    for k in range(31):
+        assert np.allclose(traj[k], theta)
+        theta = theta - 0.05 * (A @ theta)
+
+
+def test_recorder_stride_keeps_every_kth_state():
+    full, _ = run_gd(A, THETA0, lr=0.05, steps=30)
+    rec = TrajectoryRecorder(30, 2, stride=7)
+    traj, losses = run_gd(A, THETA0, lr=0.05, steps=30, recorder=rec)
+
+    assert list(rec.steps) == [0, 7, 14, 21, 28]
+    assert np.allclose(traj, full[::7])
+    assert losses.shape == (30,)
+
+
+def test_momentum_velocity_recorder_follows_stride():
+    full, v_full, _ = run_momentum(A, THETA0, lr=0.02, beta=0.9, steps=20)
+    traj, v, _ = run_momentum(A, THETA0, lr=0.02, beta=0.9, steps=20,
+                              recorder=TrajectoryRecorder(20, 2, stride=5))
+    assert np.allclose(traj, full[::5])
+    assert np.allclose(v, v_full[::5])
+
+
+def test_recorder_memmap_is_loadable(tmp_path):
+    path = str(tmp_path / "traj.npy")
+    rec = TrajectoryRecorder(50, 2, path=path)
+    traj, _ = run_gd(A, THETA0, lr=0.05, steps=50, recorder=rec)
+    rec.flush()
+
+    assert np.array_equal(np.load(path), traj)
+
+
+def test_early_stop_truncates_views():
+    monitor = StopMonitor(loss_tol=1e-3)
+    traj, losses = run_gd(A, THETA0, lr=0.05, steps=500, monitor=monitor)
+    assert len(traj) == len(losses) == monitor.step + 1
+    assert losses[-1] <= 1e-3
+
+
+def test_recorder_raises_when_full():
+    rec = TrajectoryRecorder(1, 2)
+    rec.record([0.0, 0.0])
+    rec.record([1.0, 1.0])
+    with pytest.raises(IndexError):
+        rec.record([2.0, 2.0])
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from core.stopping import StopMonitor
+from experiments.trajectory_store import TrajectoryStore, TrajectoryWriter
+from experiments.utils import make_quadratic_A, run_gd
+
+
+A = make_quadratic_A(l1=10.0, l2=2.0, rot_rad=np.deg2rad(15))
+THETA0 = [5.0, -4.0]
+
+
+def test_store_round_trip_across_chunks(tmp_path):
+    rows = np.arange(50 * 3, dtype=float).reshape(50, 3)
+    with TrajectoryWriter(str(tmp_path / "run"), n=3, chunk_rows=16) as w:
+        w.append(rows[:7])
+        for r in rows[7:]:
+            w.record(r)
+
+    store = TrajectoryStore(str(tmp_path / "run"))
+    assert store.shape == (50, 3)
+    assert np.array_equal(store[:], rows)
+    assert np.array_equal(store[10:40:3], rows[10:40:3])
+    assert np.array_equal(store[-1], rows[-1])
+    assert np.array_equal(np.asarray(store), rows)
+
+
+def test_range_inside_one_chunk_is_a_view(tmp_path):
+    with TrajectoryWriter(str(tmp_path / "run"), n=2, chunk_rows=16) as w:
+        w.append(np.ones((40, 2)))
+
+    store = TrajectoryStore(str(tmp_path / "run"))
+    window = store[18:30]
+    assert np.shares_memory(window, store[16:32])
+    assert not window.flags.writeable
+    assert [len(v) for _, v in store.iter_chunks(10, 40)] == [6, 16, 8]
+
+
+def test_runner_appends_with_stride(tmp_path):
+    full, _ = run_gd(A, THETA0, lr=0.05, steps=100)
+
+    w = TrajectoryWriter(str(tmp_path / "gd"), n=2, chunk_rows=8, stride=5, attrs={"lr": 0.05})
+    traj, losses = run_gd(A, THETA0, lr=0.05, steps=100, recorder=w)
+
+    assert isinstance(traj, TrajectoryStore)
+    assert traj.attrs == {"lr": 0.05}
+    assert np.allclose(traj[:], full[::5])
+    assert np.array_equal(traj.steps, np.arange(0, 101, 5))
+    # step range [20, 47) -> steps 20, 25, ..., 45
+    assert np.allclose(traj.read(20, 47), full[20:47:5])
+
+
+def test_readers_see_flushed_length_during_run(tmp_path):
+    w = TrajectoryWriter(str(tmp_path / "gd"), n=2)
+    monitor = StopMonitor(loss_tol=1e-3)
+    traj, losses = run_gd(A, THETA0, lr=0.05, steps=10**4, monitor=monitor, recorder=w)
+    assert len(traj) == len(losses) == monitor.step + 1
+
+    w.record([0.0, 0.0])
+    assert len(TrajectoryStore(str(tmp_path / "gd"))) == len(traj)
+    w.flush()
+    assert len(TrajectoryStore(str(tmp_path / "gd"))) == len(traj) + 1
+
+
+def test_writer_refuses_to_overwrite(tmp_path):
+    TrajectoryWriter(str(tmp_path / "run"), n=2).close()
+    with pytest.raises(FileExistsError):
+        TrajectoryWriter(str(tmp_path / "run"), n=2)
+
+
+def test_chunks_sized_by_bytes_and_last_chunk_truncated_on_close(tmp_path):
+    import os
+    from experiments.trajectory_store import CHUNK_BYTES
+
+    w = TrajectoryWriter(str(tmp_path / "wide"), n=1000)
+    assert w.chunk_rows * 1000 * 8 <= CHUNK_BYTES
+    w.append(np.ones((5, 1000)))
+    w.close()
+
+    assert np.load(str(tmp_path / "wide" / "chunk_000000.npy"), mmap_mode="r").shape == (5, 1000)
+    assert os.path.getsize(str(tmp_path / "wide" / "chunk_000000.npy")) < 5 * 1000 * 8 + 1024
+    store = TrajectoryStore(str(tmp_path / "wide"))
+    assert store.shape == (5, 1000) and store[:].sum() == 5000
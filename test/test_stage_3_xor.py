@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+import pytest
+
+from core.ops import sum_pop
+from core.populationNode import PopulationNode
+from experiments.xor import LINEAR_MSE, train_ensemble
+from models.activations import relu, sigmoid
+from models.neuron import Neuron
+
+
+def test_sigmoid_forward_backward_and_no_overflow():
+    x = PopulationNode([-1000.0, 0.0, 2.0])
+    y = sigmoid(x)
+    sum_pop(y).backprop()
+    s = 1 / (1 + math.exp(-2.0))
+    assert y.data == pytest.approx([0.0, 0.5, s])
+    assert x.grad == pytest.approx([0.0, 0.25, s * (1 - s)])
+
+
+def test_relu_backward_is_step_function():
+    x = PopulationNode([-1.0, 0.5, 3.0])
+    y = relu(x)
+    sum_pop(y).backprop()
+    assert y.data == [0.0, 0.5, 3.0]
+    assert x.grad == [0.0, 1.0, 1.0]
+
+
+def test_neuron_uses_requested_activation():
+    x = PopulationNode([1.0, -2.0], requires_grad=False)
+    z = Neuron(2, activation="linear", seed=0)(x).data[0]
+    assert Neuron(2, activation="relu", seed=0)(x).data[0] == max(z, 0.0)
+    assert Neuron(2, activation="sigmoid", seed=0)(x).data[0] == pytest.approx(1 / (1 + math.exp(-z)))
+    with pytest.raises(ValueError):
+        Neuron(2, activation="softplus")
+
+
+def test_ensemble_members_train_as_if_alone():
+    losses, escape, _ = train_ensemble((3,), "tanh", n_seeds=3, steps=40)
+    for s in range(3):
+        alone, escape_alone, _ = train_ensemble((3,), "tanh", n_seeds=1, steps=40, seed0=s)
+        assert np.allclose(losses[:, s], alone[:, 0])
+        assert escape[s] == escape_alone[0]
+
+
+def test_linear_models_stall_at_linear_mse():
+    losses, escape, _ = train_ensemble((), "linear", n_seeds=8, steps=150)
+    assert np.all(escape == -1)
+    assert np.allclose(losses[-1], LINEAR_MSE, atol=1e-3)